@@ -1,33 +1,63 @@
 import os
-from flask import Flask, jsonify, request
+from datetime import date
+import click
+from time import perf_counter
+from flask import Flask, jsonify, request, g
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 from database.db import db,migrate
 from config import Config
 from controllers import api_bp
+from models import OrderEvent
 from utils.exceptions import AppException
 from utils.response import error_response
 from utils.logging import configure_logging
+from utils.cache import user_access_cache, login_failures
+from utils.events import order_events, LocalBroker, OutboxBroker
+from utils.passwords import password_hasher
+from utils.metrics import request_metrics, start_request_timer, install_sql_hooks
+from utils.serialization import FastJSONProvider
 
 
-def create_app():
+def create_app(config_object=Config):
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     configure_logging(app)
-    app.config.from_object(Config)
+    app.config.from_object(config_object)
     CORS(app, supports_credentials=True)
     JWTManager(app)
     db.init_app(app)
     migrate.init_app(app, db)
+    user_access_cache.maxsize = app.config.get("USER_CACHE_SIZE", user_access_cache.maxsize)
+    login_failures.ttl = app.config.get("LOGIN_FAILURE_WINDOW", login_failures.ttl)
+    password_hasher.configure(
+        app.config.get("PASSWORD_HASH_METHOD", "scrypt"),
+        app.config.get("PASSWORD_HASH_POOL", "thread"),
+        app.config.get("PASSWORD_HASH_WORKERS")
+    )
+    configure_order_events(app)
 
 
     register_blueprints(app)
     register_middlewares(app)
     register_error_handlers(app)
     register_health_check(app)
+    register_commands(app)
 
     return app
 
 
+def configure_order_events(app):
+    backend = app.config.get("ORDER_EVENTS_BACKEND", "outbox")
+    if backend == "outbox":
+        order_events.use(OutboxBroker(db, OrderEvent, app.config.get("ORDER_EVENTS_POLL_INTERVAL", 1.0)))
+    elif backend == "local":
+        order_events.use(LocalBroker(app.config.get("ORDER_EVENTS_BUFFER", 1000), session=db.session))
+    else:
+        raise RuntimeError(f"ORDER_EVENTS_BACKEND must be 'outbox' or 'local', not {backend!r}")
+
 def register_blueprints(app):
     app.register_blueprint(api_bp)
 
@@ -36,6 +66,30 @@ def register_middlewares(app):
     def log_request():
         app.logger.info(f"{request.method} {request.path}")
 
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+
+    request_metrics.window = app.config.get("METRICS_WINDOW", request_metrics.window)
+    install_sql_hooks()
+
+    @app.before_request
+    def start_timer():
+        start_request_timer()
+
+    @app.after_request
+    def record_timing(response):
+        if "request_started" not in g:
+            return response
+        duration = perf_counter() - g.request_started
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        request_metrics.observe(request.method, endpoint, duration, g.sql_count, g.sql_time)
+        if app.config.get("METRICS_SERVER_TIMING"):
+            response.headers.add(
+                "Server-Timing",
+                f'app;dur={duration * 1000:.1f}, db;dur={g.sql_time * 1000:.1f};desc="{g.sql_count} queries"'
+            )
+        return response
+
 def register_error_handlers(app):
     @app.errorhandler(AppException)
     def handle_app_exception(e):
@@ -69,6 +123,113 @@ def register_health_check(app):
         })
 
 
+def warm_up(app):
+    """Open a pooled database connection and fill the catalog caches.
+
+    Called by server startup hooks (see gunicorn.conf.py) so the first
+    requests a fresh worker takes do not pay for connecting and loading.
+    A database that is not reachable yet only logs a warning; the worker
+    still starts and connects on its first request.
+    """
+    from services import MenuService, MenuCategoryService
+
+    with app.app_context():
+        try:
+            db.session.execute(text("SELECT 1"))
+            MenuService.get_all_menus_cached()
+            MenuCategoryService.get_all_categories_cached()
+        except SQLAlchemyError as e:
+            app.logger.warning(f"Warm-up skipped: {e}")
+
+
+def register_commands(app):
+    @app.cli.command("refresh-sales-reports")
+    @click.option("--from", "date_from", default=None, help="First day to rebuild (YYYY-MM-DD).")
+    @click.option("--to", "date_to", default=None, help="Day after the last one to rebuild (YYYY-MM-DD).")
+    def refresh_sales_reports(date_from, date_to):
+        """Rebuild daily sales reports; without a range only days with changed orders."""
+        from services import SalesReportService
+
+        result, error = SalesReportService.refresh_daily_reports(
+            date.fromisoformat(date_from) if date_from else None,
+            date.fromisoformat(date_to) if date_to else None
+        )
+        if error:
+            raise click.ClickException(error[0].get_json()["error"])
+        click.echo(f"Refreshed {result['days_refreshed']} daily sales report(s)")
+
+    @app.cli.command("repair-order-totals")
+    def repair_order_totals():
+        """Recompute order subtotals and totals from their lines in bulk."""
+        from services import OrderService
+
+        result, error = OrderService.repair_totals()
+        if error:
+            raise click.ClickException(error[0].get_json()["error"])
+        click.echo(f"Repaired totals on {result['orders_repaired']} order(s)")
+
+    @app.cli.command("import-menu")
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--format", "fmt", type=click.Choice(["csv", "ndjson"]), default=None,
+                  help="File format; defaults to the file extension.")
+    @click.option("--chunk-size", default=1000, show_default=True, help="Rows validated and upserted per batch.")
+    def import_menu(path, fmt, chunk_size):
+        """Upsert categories and menu items from a CSV or NDJSON file."""
+        from services import MenuImportService
+        from utils.streaming import read_rows
+
+        fmt = fmt or ("ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv")
+        with open(path, encoding="utf-8-sig", newline="") as stream:
+            summary, error = MenuImportService.import_rows(read_rows(stream, fmt), chunk_size)
+        if error:
+            raise click.ClickException(error[0].get_json()["error"])
+        for failure in summary["errors"]:
+            click.echo(f"line {failure['line']}: {failure['errors']}", err=True)
+        click.echo(f"Imported {summary['imported']} of {summary['processed']} row(s), {summary['failed']} failed")
+
+    @app.cli.command("import-payments")
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--format", "fmt", type=click.Choice(["csv", "ndjson"]), default=None,
+                  help="File format; defaults to the file extension.")
+    @click.option("--chunk-size", default=1000, show_default=True, help="Lines validated and inserted per batch.")
+    def import_payments(path, fmt, chunk_size):
+        """Import a card settlement file; lines already imported are skipped."""
+        from services import PaymentImportService
+        from utils.streaming import read_rows
+
+        fmt = fmt or ("ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv")
+        with open(path, encoding="utf-8-sig", newline="") as stream:
+            summary, error = PaymentImportService.import_rows(read_rows(stream, fmt), chunk_size)
+        if error:
+            raise click.ClickException(error[0].get_json()["error"])
+        for failure in summary["errors"]:
+            click.echo(f"line {failure['line']}: {failure['errors']}", err=True)
+        click.echo(f"Imported {summary['imported']} of {summary['processed']} line(s), "
+                   f"{summary['already_imported']} already imported, {summary['failed']} failed")
+
+    @app.cli.command("prune-order-events")
+    @click.option("--keep", default=None, type=int, help="Newest events to keep (default ORDER_EVENTS_BUFFER).")
+    def prune_order_events(keep):
+        """Delete kitchen feed events older than the newest ``keep``."""
+        if not isinstance(order_events.broker, OutboxBroker):
+            raise click.ClickException("Only the outbox event backend stores events to prune")
+        keep = app.config.get("ORDER_EVENTS_BUFFER", 1000) if keep is None else keep
+        click.echo(f"Pruned {order_events.prune(keep)} order event(s)")
+
+    @app.cli.command("export-menu")
+    @click.option("--format", "fmt", type=click.Choice(["csv", "ndjson"]), default="csv", show_default=True)
+    @click.option("--output", type=click.File("w"), default="-", help="Destination file (default stdout).")
+    def export_menu(fmt, output):
+        """Stream active categories and menu items as CSV or NDJSON."""
+        from services import MenuImportService
+        from utils.streaming import iter_csv, iter_ndjson
+
+        rows = MenuImportService.export_rows()
+        chunks = iter_csv(rows, MenuImportService.FIELDS) if fmt == "csv" else iter_ndjson(rows)
+        for chunk in chunks:
+            output.write(chunk)
+
+
 if __name__ == "__main__":
     app = create_app()
     app.run(host="0.0.0.0", port=5000, debug=app.config["DEBUG"])
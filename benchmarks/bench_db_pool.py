@@ -0,0 +1,142 @@
+"""Request latency under concurrent workers for different pool / replica settings.
+
+Every case runs in its own process so ``Config.engine_options`` and
+``SQLALCHEMY_BINDS`` are built from that case's environment, exactly as
+in production. Workers mimic requests: each operation pushes an app
+context, calls a service method and tears the session down again. Most
+operations are reads (menu, low stock, recent orders); every
+``--write-every``-th one adjusts a stock level on the primary.
+
+By default the primary is a SQLite file and the replica a copy of it.
+SQLite serializes writers on a file lock, so there a larger pool mostly
+adds queueing; point ``BENCH_DATABASE_URI`` / ``BENCH_REPLICA_URI`` at
+real servers (already migrated and seeded) for meaningful MySQL numbers.
+
+Usage: python -m benchmarks.bench_db_pool [--workers 16] [--ops 200] [--write-every 5]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+CASES = [
+    ("small pool", {"DB_POOL_SIZE": "2", "DB_MAX_OVERFLOW": "0", "DB_POOL_PRE_PING": "false"}),
+    ("tuned pool", {}),
+    ("tuned + replica", {"replica": True}),
+]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run_case(workers, ops, write_every):
+    from benchmarks.common import make_app
+    from database.db import db
+    from models import Inventory
+    from services import MenuService, InventoryService, OrderService
+
+    app = make_app()
+    with app.app_context():
+        item_id = db.session.query(Inventory.id).order_by(Inventory.id).limit(1).scalar()
+
+    reads = [MenuService.get_all_menus, InventoryService.low_stock_items, OrderService.get_all_orders]
+    latencies = [[] for _ in range(workers)]
+    errors = [0] * workers
+
+    def worker(index):
+        for op in range(ops):
+            started = time.perf_counter()
+            with app.app_context():
+                if write_every and op % write_every == write_every - 1:
+                    _, error = InventoryService.adjust_stock(item_id, 1, "bench")
+                    errors[index] += error is not None
+                else:
+                    reads[op % len(reads)]()
+            latencies[index].append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(workers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    flat = [value for values in latencies for value in values]
+    print(json.dumps({
+        "p50_ms": percentile(flat, 50) * 1000,
+        "p95_ms": percentile(flat, 95) * 1000,
+        "ops_per_s": len(flat) / elapsed,
+        "errors": sum(errors),
+    }))
+
+
+def seed(uri):
+    os.environ["SQLALCHEMY_DATABASE_URI"] = uri
+    from benchmarks.common import make_app, seed_menu
+    from database.db import db
+    from models import Inventory
+
+    app = make_app()
+    with app.app_context():
+        seed_menu()
+        db.session.add_all(
+            Inventory(item_name=f"Ingredient {i}", stock_quantity=10_000, unit="kg", threshold=20 * (i % 2))
+            for i in range(50)
+        )
+        db.session.commit()
+        db.session.remove()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--ops", type=int, default=200)
+    parser.add_argument("--write-every", type=int, default=5)
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        run_case(args.workers, args.ops, args.write_every)
+        return
+
+    primary = os.getenv("BENCH_DATABASE_URI")
+    replica = os.getenv("BENCH_REPLICA_URI")
+    if not primary:
+        tmp = tempfile.mkdtemp()
+        primary_file = os.path.join(tmp, "primary.sqlite")
+        replica_file = os.path.join(tmp, "replica.sqlite")
+        primary, replica = f"sqlite:///{primary_file}", f"sqlite:///{replica_file}"
+        seed(primary)
+        shutil.copyfile(primary_file, replica_file)
+
+    print(f"{args.workers} workers x {args.ops} ops, one write every {args.write_every} ops")
+    print(f"{'case':<16} {'p50 ms':>8} {'p95 ms':>8} {'ops/s':>8} {'errors':>7}")
+    for name, overrides in CASES:
+        env = dict(os.environ, SQLALCHEMY_DATABASE_URI=primary)
+        env.pop("DATABASE_REPLICA_URI", None)
+        if overrides.get("replica"):
+            if not replica:
+                print(f"{name:<16} skipped (no BENCH_REPLICA_URI)")
+                continue
+            env["DATABASE_REPLICA_URI"] = replica
+        env.update({key: value for key, value in overrides.items() if key != "replica"})
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_db_pool", "--case", name,
+             "--workers", str(args.workers), "--ops", str(args.ops), "--write-every", str(args.write_every)],
+            env=env, capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{name:<16} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+              f"{result['ops_per_s']:>8.0f} {result['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Multi-threaded throughput benchmark for InventoryService stock mutations.
+
+Several workers hammer the same inventory row with decrease/increase
+calls. With conditional UPDATEs the final stock must equal the starting
+stock plus the sum of successful deltas, and every success must have
+exactly one InventoryLog row; tests/test_inventory_contention.py asserts
+that, and this script reports throughput alongside the same totals.
+
+Usage: python -m benchmarks.bench_inventory_contention [--workers 8] [--ops 200]
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+_db_file = os.path.join(tempfile.mkdtemp(), "inventory_contention.sqlite")
+os.environ.setdefault("SQLALCHEMY_DATABASE_URI", f"sqlite:///{_db_file}")
+
+from benchmarks.common import make_app
+from database.db import db
+from models import Inventory, InventoryLog
+from services import InventoryService
+
+START_STOCK = 1000
+
+
+def worker(app, item_id, ops, results, index):
+    applied = 0
+    failed = 0
+    with app.app_context():
+        for op in range(ops):
+            if op % 3 == 2:
+                _, error = InventoryService.increase_stock(item_id, 2, "restock")
+                delta = 2
+            else:
+                _, error = InventoryService.decrease_stock(item_id, 1, "sale")
+                delta = -1
+            if error:
+                failed += 1
+            else:
+                applied += delta
+        db.session.remove()
+    results[index] = (applied, failed)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=200)
+    args = parser.parse_args()
+
+    app = make_app()
+    with app.app_context():
+        item = Inventory(item_name="Contended Item", stock_quantity=START_STOCK, threshold=0)
+        db.session.add(item)
+        db.session.commit()
+        item_id = item.id
+
+    results = [None] * args.workers
+    threads = [
+        threading.Thread(target=worker, args=(app, item_id, args.ops, results, i))
+        for i in range(args.workers)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    applied = sum(r[0] for r in results)
+    failed = sum(r[1] for r in results)
+    total_ops = args.workers * args.ops
+    with app.app_context():
+        final_stock = db.session.get(Inventory, item_id).stock_quantity
+        log_total = db.session.query(db.func.coalesce(db.func.sum(InventoryLog.quantity_changed), 0)).filter(
+            InventoryLog.inventory_id == item_id
+        ).scalar()
+
+    expected = START_STOCK + applied
+    print(f"workers={args.workers} ops={total_ops} failed={failed} elapsed={elapsed:.2f}s "
+          f"throughput={total_ops / elapsed:.0f} ops/s")
+    print(f"final stock={final_stock} expected={expected} logged delta={log_total}")
+
+
+if __name__ == "__main__":
+    main()
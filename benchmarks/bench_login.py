@@ -0,0 +1,88 @@
+"""Login throughput per core for different hash parameters and hashing pools.
+
+Each case stores the benchmark user's password with the case's method,
+then ``--threads`` request threads call AuthService.authenticate_user
+(lookup, verify, token) for ``--logins`` successful logins in total.
+"per core" divides by the cores the hashing can actually use. The last
+line shows how fast a throttled attacker is turned away once the failed
+attempt counter has tripped, without hashing at all.
+
+Usage: python -m benchmarks.bench_login [--threads 8] [--logins 64]
+"""
+import argparse
+import os
+import threading
+import time
+
+from benchmarks.common import make_app
+from database.db import db
+from models import User
+from services import AuthService
+from utils.cache import login_failures
+from utils.passwords import password_hasher
+
+EMAIL = "login_bench@example.com"
+PASSWORD = "bench-password"
+
+CASES = [
+    ("scrypt (default)", "scrypt", "none"),
+    ("scrypt (default)", "scrypt", "thread"),
+    ("scrypt n=16384", "scrypt:16384:8:1", "thread"),
+    ("pbkdf2 600k", "pbkdf2:sha256:600000", "thread"),
+    ("pbkdf2 600k", "pbkdf2:sha256:600000", "process"),
+]
+
+
+def run(app, threads, logins, email, password):
+    per_thread = max(1, logins // threads)
+    statuses = []
+
+    def worker():
+        with app.app_context():
+            for _ in range(per_thread):
+                _, error = AuthService.authenticate_user(email, password)
+                statuses.append(error[1] if error else 200)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return len(statuses) / (time.perf_counter() - started), statuses
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--logins", type=int, default=64)
+    args = parser.parse_args()
+
+    app = make_app()
+    app.config["LOGIN_MAX_FAILURES"] = 5
+    cores = os.cpu_count() or 1
+    with app.app_context():
+        user = User(username="login_bench", email=EMAIL, role="user", is_active=True, password_hash="")
+        db.session.add(user)
+        db.session.commit()
+
+        print(f"{args.threads} request threads, {cores} cores")
+        print(f"{'method':<18} {'pool':<8} {'logins/s':>9} {'per core':>9}")
+        for name, method, pool in CASES:
+            password_hasher.configure(method, pool)
+            user.password_hash = password_hasher.hash(PASSWORD)
+            db.session.commit()
+            rate, statuses = run(app, args.threads, args.logins, EMAIL, PASSWORD)
+            assert set(statuses) == {200}, statuses
+            used = 1 if pool == "none" else min(cores, password_hasher.workers)
+            print(f"{name:<18} {pool:<8} {rate:>9.1f} {rate / used:>9.1f}")
+
+        password_hasher.configure("scrypt", "thread")
+        login_failures.clear()
+        rate, statuses = run(app, args.threads, args.logins * 20, EMAIL, "wrong-password")
+        print(f"{'bad password':<18} {'thread':<8} {rate:>9.1f} {'':>9}  "
+              f"({statuses.count(429)} of {len(statuses)} throttled with 429)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Count SQL statements issued by OrderService.create_order / update_order per order size.
+
+Usage: python -m benchmarks.bench_order_queries
+"""
+import time
+from benchmarks.common import make_app, seed_menu, count_queries
+from database.db import db
+from services import OrderService
+
+ORDER_SIZES = [1, 5, 10, 30, 100]
+
+
+def order_payload(user_id, menu_item_ids, size):
+    return {
+        "user_id": user_id,
+        "items": [
+            {"menu_item_id": menu_item_ids[i % len(menu_item_ids)], "quantity": 1 + i % 3}
+            for i in range(size)
+        ]
+    }
+
+
+def main():
+    app = make_app()
+    with app.app_context():
+        admin, menu_items = seed_menu()
+        user_id = admin.id
+        menu_item_ids = [menu_item.id for menu_item in menu_items]
+        print(f"{'lines':>6} {'create queries':>15} {'update queries':>15} {'create ms':>10}")
+        for size in ORDER_SIZES:
+            payload = order_payload(user_id, menu_item_ids, size)
+            db.session.expire_all()
+            with count_queries() as create_counter:
+                started = time.perf_counter()
+                order, error = OrderService.create_order(payload)
+                elapsed = (time.perf_counter() - started) * 1000
+            if error:
+                raise RuntimeError(error[0].get_json())
+
+            order_id = order.id
+            update_payload = order_payload(user_id, menu_item_ids[::-1], size)
+            db.session.expire_all()
+            with count_queries() as update_counter:
+                _, error = OrderService.update_order(order_id, update_payload)
+            if error:
+                raise RuntimeError(error[0].get_json())
+
+            print(f"{size:>6} {create_counter.count:>15} {update_counter.count:>15} {elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
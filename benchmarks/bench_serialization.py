@@ -0,0 +1,76 @@
+"""Compare response serialization: marshmallow + Flask's default JSON vs compiled dumpers + FastJSONProvider.
+
+Rows are loaded once; each case times only turning the list into the
+response body, the way GET /menu, /orders and /inventory do.
+
+Usage: python -m benchmarks.bench_serialization [rows]
+"""
+import sys
+import timeit
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import insert
+
+from benchmarks.common import make_app, seed_menu
+from database.db import db
+from models import MenuItem, Order, Inventory
+from schemas import menu_items_schema, orders_schema, inventories_schema
+from utils.serialization import dumps_bytes, orjson
+
+DEFAULT_ROWS = 2000
+REPEAT = 5
+
+
+def seed(rows, user_id, category_id):
+    now = datetime.utcnow()
+    db.session.execute(insert(MenuItem), [
+        {"name": f"Bulk dish {i}", "description": "Benchmark dish", "price": Decimal("9.50") + i % 40,
+         "category_id": category_id, "created_at": now}
+        for i in range(rows)
+    ])
+    db.session.execute(insert(Order), [
+        {"user_id": user_id, "order_number": f"BENCH-{i:06d}", "subtotal": Decimal("40.00"),
+         "discount": Decimal("0.00"), "total_price": Decimal("40.00"), "created_at": now - timedelta(minutes=i)}
+        for i in range(rows)
+    ])
+    db.session.execute(insert(Inventory), [
+        {"item_name": f"Ingredient {i}", "stock_quantity": 100 + i, "unit": "kg", "threshold": 10,
+         "supplier": "Bench Supplies"}
+        for i in range(rows)
+    ])
+    db.session.commit()
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    app = make_app()
+    with app.app_context():
+        admin, menu_items = seed_menu(categories=1, items_per_category=1)
+        seed(rows, admin.id, menu_items[0].category_id)
+        cases = [
+            ("menu", MenuItem.query.limit(rows).all(), menu_items_schema),
+            ("orders", Order.query.limit(rows).all(), orders_schema),
+            ("inventory", Inventory.query.limit(rows).all(), inventories_schema),
+        ]
+        default_json = DefaultJSONProvider(app)
+
+        def marshmallow_body(schema, objects):
+            return default_json.dumps({"message": "ok", "data": schema.dump(objects)}, separators=(",", ":"))
+
+        def fast_body(objects):
+            return dumps_bytes({"message": "ok", "data": objects})
+
+        encoder = "orjson" if orjson else "stdlib json"
+        print(f"{rows} rows per list, encoder: {encoder}")
+        print(f"{'list':<10} {'marshmallow ms':>15} {'compiled ms':>12} {'speedup':>8}")
+        for name, objects, schema in cases:
+            number = 5
+            slow = min(timeit.repeat(lambda: marshmallow_body(schema, objects), number=number, repeat=REPEAT)) / number
+            fast = min(timeit.repeat(lambda: fast_body(objects), number=number, repeat=REPEAT)) / number
+            print(f"{name:<10} {slow * 1000:>15.2f} {fast * 1000:>12.2f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Load-test the threaded Werkzeug server against gunicorn + gevent.
+
+Seeds a SQLite file, starts each server as a subprocess on a free port
+and drives it for ``--seconds`` with ``--clients`` concurrent keep-alive
+clients cycling through the read-heavy endpoints: GET /api/menu,
+GET /api/categories and GET /api/orders/<id> (authenticated). Reports
+requests/sec and p50/p95/p99 latency per server.
+
+SQLite calls do not yield to other greenlets, so against SQLite gevent
+mostly shows its lower per-request overhead; set BENCH_DATABASE_URI to a
+migrated MySQL database to measure the I/O-wait win.
+
+Usage: python -m benchmarks.bench_serving [--clients 64] [--seconds 10] [--workers 2]
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_commands(port, workers):
+    return [
+        ("werkzeug threaded", [
+            sys.executable, "-c",
+            f"from app import create_app; create_app().run(host='127.0.0.1', port={port}, threaded=True)"
+        ]),
+        ("gunicorn gevent", [
+            sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+            "--bind", f"127.0.0.1:{port}", "--workers", str(workers), "--log-level", "warning"
+        ]),
+    ]
+
+
+def seed(uri):
+    os.environ["SQLALCHEMY_DATABASE_URI"] = uri
+    from benchmarks.common import make_app, seed_menu
+    from database.db import db
+    from services import OrderService
+
+    app = make_app()
+    with app.app_context():
+        admin, menu_items = seed_menu()
+        order, error = OrderService.create_order({
+            "user_id": admin.id,
+            "items": [{"menu_item_id": item.id, "quantity": 2} for item in menu_items[:5]]
+        })
+        if error:
+            raise RuntimeError("Could not seed the benchmark order")
+        order_id = order.id
+        db.session.remove()
+    return order_id
+
+
+def wait_until_up(port, process, deadline=30):
+    started = time.monotonic()
+    while time.monotonic() - started < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Server exited during startup")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/api/health")
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("Server did not start")
+
+
+def login(port):
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    body = json.dumps({"email": "bench_admin@example.com", "password": "bench123"})
+    connection.request("POST", "/api/auth/login", body, {"Content-Type": "application/json"})
+    return json.loads(connection.getresponse().read())["data"]["access_token"]
+
+
+def drive(port, paths, headers, clients, seconds):
+    latencies = [[] for _ in range(clients)]
+    errors = [0] * clients
+    stop_at = time.monotonic() + seconds
+
+    def client(index):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        request = index
+        while time.monotonic() < stop_at:
+            path = paths[request % len(paths)]
+            request += 1
+            started = time.perf_counter()
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors[index] += 1
+                if response.will_close:
+                    connection.close()
+            except (OSError, http.client.HTTPException):
+                errors[index] += 1
+                connection.close()
+                continue
+            latencies[index].append(time.perf_counter() - started)
+        connection.close()
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return sorted(value for values in latencies for value in values), sum(errors), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn worker processes")
+    args = parser.parse_args()
+
+    uri = os.getenv("BENCH_DATABASE_URI") or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'serving.sqlite')}"
+    order_id = seed(uri)
+    paths = ["/api/menu", "/api/categories", f"/api/orders/{order_id}"]
+    env = dict(os.environ, SQLALCHEMY_DATABASE_URI=uri, FLASK_ENV="production", METRICS_ENABLED="false")
+
+    print(f"{args.clients} clients for {args.seconds:.0f}s, gunicorn workers: {args.workers}")
+    print(f"{'server':<18} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    port = free_port()
+    for name, command in server_commands(port, args.workers):
+        process = subprocess.Popen(command, cwd=ROOT_DIR, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_until_up(port, process)
+            headers = {"Authorization": f"Bearer {login(port)}"}
+            latencies, errors, elapsed = drive(port, paths, headers, args.clients, args.seconds)
+        except RuntimeError as e:
+            print(f"{name:<18} skipped ({e})")
+            continue
+        finally:
+            process.terminate()
+            process.wait()
+        if not latencies:
+            print(f"{name:<18} no successful requests ({errors} errors)")
+            continue
+
+        def pct(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1000
+
+        print(f"{name:<18} {len(latencies) / elapsed:>8.0f} {pct(50):>8.2f} {pct(95):>8.2f} "
+              f"{pct(99):>8.2f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Concurrent signups: duplicate safety and SQL statements per registration.
+
+``--workers`` threads register overlapping accounts at the same time
+(every account is attempted by several threads). Afterwards each email
+and username must exist exactly once, and every losing attempt must get
+a 400, not a 500. The legacy two-SELECT implementation is kept below as
+the baseline: it issues three statements per signup and, under the race,
+its losers hit the unique constraint unhandled. The duplicate-safety
+guarantee itself is asserted by tests/test_signup.py.
+
+Usage: python -m benchmarks.bench_signup [--workers 8] [--accounts 50]
+"""
+import argparse
+import os
+import tempfile
+import threading
+from collections import Counter
+
+_db_file = os.path.join(tempfile.mkdtemp(), "signup.sqlite")
+os.environ.setdefault("SQLALCHEMY_DATABASE_URI", f"sqlite:///{_db_file}")
+
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+
+from benchmarks.common import make_app, count_queries
+from database.db import db
+from models import User
+from services import AuthService
+from utils.passwords import password_hasher
+from utils.response import error_response
+
+
+def legacy_register_user(username, email, password, role="user"):
+    if User.query.filter_by(email=email).first():
+        return None, error_response("Email already exists", 400)
+    if User.query.filter_by(username=username).first():
+        return None, error_response("Username already exists", 400)
+    new_user = User(username=username, email=email, role=role, is_active=True)
+    new_user.set_password(password)
+    try:
+        db.session.add(new_user)
+        db.session.commit()
+        return new_user, None
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return None, error_response(f"Database error: {str(e)}", 500)
+
+
+def race(app, register, prefix, workers, accounts):
+    statuses = Counter()
+    lock = threading.Lock()
+    barrier = threading.Barrier(workers)
+
+    def worker(index):
+        barrier.wait()
+        with app.app_context():
+            for i in range(accounts):
+                account = (i + index) % accounts
+                _, error = register(f"{prefix}{account}", f"{prefix}{account}@example.com", "secret123")
+                with lock:
+                    statuses[error[1] if error else 201] += 1
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with app.app_context():
+        duplicates = db.session.query(User.email).filter(User.email.like(f"{prefix}%")).group_by(
+            User.email
+        ).having(func.count() > 1).count()
+        created = User.query.filter(User.email.like(f"{prefix}%")).count()
+    return statuses, created, duplicates
+
+
+def queries_per_signup(app, register, prefix, runs=20):
+    with app.app_context(), count_queries() as counter:
+        for i in range(runs):
+            register(f"{prefix}{i}", f"{prefix}{i}@example.com", "secret123")
+    return counter.count / runs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--accounts", type=int, default=50)
+    args = parser.parse_args()
+
+    app = make_app()
+    # Cheap hashes keep the run about the database round trips, not the KDF.
+    password_hasher.configure("pbkdf2:sha256:1000", "none")
+
+    print(f"{'implementation':<22} {'sql/signup':>10} {'created':>8} {'dupes':>6}  statuses")
+    cases = [("legacy (2 SELECTs)", legacy_register_user, False),
+             ("insert + IntegrityError", AuthService.register_user, False),
+             ("OR pre-check", AuthService.register_user, True)]
+    for index, (name, register, precheck) in enumerate(cases):
+        app.config["REGISTER_PRECHECK"] = precheck
+        queries = queries_per_signup(app, register, f"seq{index}_")
+        statuses, created, duplicates = race(app, register, f"race{index}_", args.workers, args.accounts)
+        print(f"{name:<22} {queries:>10.1f} {created:>8} {duplicates:>6}  {dict(sorted(statuses.items()))}")
+
+
+if __name__ == "__main__":
+    main()
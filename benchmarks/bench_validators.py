@@ -0,0 +1,196 @@
+"""Compare the compiled payload validators with the previous helper-based ones.
+
+The legacy functions below are the pre-compiler implementations of the
+register, menu, order and reservation validators,
+kept here only as the baseline. Each case validates a fresh copy of the
+same payload, as a request would, and then does the conversion the
+service layer used to do on top of it.
+
+Timings are the best of REPEAT interleaved runs, in microseconds per call.
+
+Usage: python -m benchmarks.bench_validators [iterations]
+"""
+import re
+import sys
+import timeit
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+
+from benchmarks.common import make_app
+from utils.response import error_response
+from validations import (
+    validate_menu_create, validate_order_data, validate_reservation_data, validate_register_data,
+    EMAIL_REGEX, ORDER_STATUS, PAYMENT_STATUS, SERVICE_TYPES, RESERVATION_STATUS
+)
+
+DEFAULT_ITERATIONS = 100_000
+REPEAT = 7
+
+
+def _add_error(errors, field, message):
+    if field not in errors:
+        errors[field] = message
+
+
+def _validate_string(value, field, errors, required=False, max_length=None):
+    if value is None:
+        if required:
+            _add_error(errors, field, f"{field.replace('_',' ').title()} is required")
+        return
+    value = str(value).strip()
+    if not value:
+        _add_error(errors, field, f"{field.replace('_',' ').title()} cannot be empty")
+        return
+    if max_length and len(value) > max_length:
+        _add_error(errors, field, f"{field.replace('_',' ').title()} must not exceed {max_length} characters")
+
+
+def _validate_integer(value, field, errors, required=False, min_value=None):
+    if value is None:
+        if required:
+            _add_error(errors, field, f"{field.replace('_',' ').title()} is required")
+        return
+    try:
+        value = int(value)
+        if min_value is not None and value < min_value:
+            _add_error(errors, field, f"{field.replace('_',' ').title()} must be >= {min_value}")
+    except (ValueError, TypeError):
+        _add_error(errors, field, f"{field.replace('_',' ').title()} must be an integer")
+
+
+def _validate_boolean(value, field, errors):
+    if value is not None and not isinstance(value, bool):
+        _add_error(errors, field, f"{field.replace('_',' ').title()} must be true or false")
+
+
+def _validate_price(value, field, errors, required=False):
+    if value is None:
+        if required:
+            _add_error(errors, field, f"{field.replace('_',' ').title()} is required")
+        return
+    try:
+        price = Decimal(value)
+        if price < 0:
+            _add_error(errors, field, f"{field.replace('_',' ').title()} must be >= 0")
+    except (InvalidOperation, TypeError):
+        _add_error(errors, field, f"{field.replace('_',' ').title()} must be a valid number")
+
+
+def legacy_register(data):
+    errors = {}
+    _validate_string(data.get("username"), "username", errors, required=True, max_length=50)
+    _validate_string(data.get("email"), "email", errors, required=True)
+    _validate_string(data.get("password"), "password", errors, required=True, max_length=100)
+    if "email" in data and not re.match(EMAIL_REGEX, str(data["email"])):
+        _add_error(errors, "email", "Invalid email format")
+    if "password" in data and len(str(data["password"])) < 6:
+        _add_error(errors, "password", "Password must be at least 6 characters")
+    if errors:
+        return None, error_response(next(iter(errors.values())), 400)
+    return {"username": data["username"].strip(), "email": data["email"].strip(), "password": data["password"]}, None
+
+
+def legacy_menu_create(data):
+    errors = {}
+    _validate_string(data.get("name"), "name", errors, required=True, max_length=100)
+    _validate_string(data.get("description"), "description", errors, max_length=250)
+    _validate_price(data.get("price"), "price", errors, required=True)
+    _validate_integer(data.get("category_id"), "category_id", errors, required=True, min_value=1)
+    _validate_boolean(data.get("is_available"), "is_available", errors)
+    if errors:
+        return None, error_response(next(iter(errors.values())), 400)
+    data["name"].strip()
+    Decimal(data["price"])
+    return data, None
+
+
+def legacy_order(data):
+    errors = {}
+    _validate_integer(data.get("user_id"), "user_id", errors, required=True, min_value=1)
+    items = data.get("items")
+    if not isinstance(items, list) or not items:
+        _add_error(errors, "items", "Items must be a non-empty list")
+        items = []
+    for index, item in enumerate(items):
+        field = f"items[{index}]"
+        if not isinstance(item, dict):
+            _add_error(errors, field, "Each item must be an object")
+            continue
+        _validate_integer(item.get("menu_item_id"), f"{field}.menu_item_id", errors, required=True, min_value=1)
+        _validate_integer(item.get("quantity"), f"{field}.quantity", errors, min_value=1)
+        _validate_price(item.get("price"), f"{field}.price", errors)
+    if "status" in data and data["status"] not in ORDER_STATUS:
+        _add_error(errors, "status", f"Status must be one of {ORDER_STATUS}")
+    if "payment_status" in data and data["payment_status"] not in PAYMENT_STATUS:
+        _add_error(errors, "payment_status", f"Payment status must be one of {PAYMENT_STATUS}")
+    if "service_type" in data and data["service_type"] not in SERVICE_TYPES:
+        _add_error(errors, "service_type", f"Service type must be one of {SERVICE_TYPES}")
+    if "discount" in data:
+        try:
+            if float(data["discount"]) < 0:
+                _add_error(errors, "discount", "Discount must be >= 0")
+        except (ValueError, TypeError):
+            _add_error(errors, "discount", "Discount must be a number")
+    if errors:
+        return None, error_response(next(iter(errors.values())), 400)
+    Decimal(str(data.get("discount", 0)))
+    for item in items:
+        int(item["menu_item_id"]), int(item.get("quantity", 1))
+        if "price" in item:
+            Decimal(str(item["price"]))
+    return data, None
+
+
+def legacy_reservation(data):
+    errors = {}
+    _validate_integer(data.get("user_id"), "user_id", errors, required=True, min_value=1)
+    _validate_integer(data.get("table_number"), "table_number", errors, required=True, min_value=1)
+    if "reservation_time" not in data:
+        _add_error(errors, "reservation_time", "Reservation time is required")
+    else:
+        try:
+            reservation_time = datetime.fromisoformat(data["reservation_time"])
+            if reservation_time < datetime.utcnow():
+                _add_error(errors, "reservation_time", "Reservation time cannot be in the past")
+        except (ValueError, TypeError):
+            _add_error(errors, "reservation_time", "Invalid datetime format")
+    if "status" in data and data["status"] not in RESERVATION_STATUS:
+        _add_error(errors, "status", f"Status must be one of {RESERVATION_STATUS}")
+    if errors:
+        return None, error_response(next(iter(errors.values())), 400)
+    datetime.fromisoformat(data["reservation_time"])
+    return data, None
+
+
+CASES = [
+    ("register", legacy_register, validate_register_data,
+     {"username": " alice ", "email": "alice@example.com", "password": "secret123"}),
+    ("menu_create", legacy_menu_create, validate_menu_create,
+     {"name": "Burger", "description": "Beef", "price": "12.50", "category_id": 3, "is_available": True}),
+    ("order", legacy_order, validate_order_data,
+     {"user_id": 1, "items": [{"menu_item_id": 1, "quantity": 2}], "status": "pending",
+      "payment_status": "unpaid", "service_type": "dine_in", "discount": 1.5}),
+    ("reservation", legacy_reservation, validate_reservation_data,
+     {"user_id": 1, "table_number": 7,
+      "reservation_time": (datetime.utcnow() + timedelta(days=1)).isoformat(), "status": "pending"}),
+    ("order_invalid", legacy_order, validate_order_data,
+     {"user_id": "x", "items": [], "status": "bogus", "discount": -1}),
+]
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITERATIONS
+    print(f"{'case':<14} {'legacy us':>10} {'compiled us':>12} {'speedup':>8}")
+    with make_app().app_context():
+        for name, legacy, compiled, payload in CASES:
+            # Alternate the two so drift in machine load hits both sides alike.
+            legacy_time = compiled_time = float("inf")
+            for _ in range(REPEAT):
+                legacy_time = min(legacy_time, timeit.timeit(lambda: legacy(dict(payload)), number=iterations))
+                compiled_time = min(compiled_time, timeit.timeit(lambda: compiled(dict(payload)), number=iterations))
+            print(f"{name:<14} {legacy_time / iterations * 1e6:>10.2f} "
+                  f"{compiled_time / iterations * 1e6:>12.2f} {legacy_time / compiled_time:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
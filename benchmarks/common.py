@@ -0,0 +1,66 @@
+import os
+import sys
+import logging
+from contextlib import contextmanager
+from decimal import Decimal
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+os.environ.setdefault("SQLALCHEMY_DATABASE_URI", "sqlite://")
+
+from sqlalchemy import event
+from app import create_app
+from database.db import db
+from models import User, MenuCategory, MenuItem
+
+
+def make_app():
+    app = create_app()
+    app.config["TESTING"] = True
+    app.logger.setLevel(logging.WARNING)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def seed_menu(categories=5, items_per_category=20):
+    admin = User(username="bench_admin", email="bench_admin@example.com", role="admin", is_active=True)
+    admin.set_password("bench123")
+    db.session.add(admin)
+    menu_items = []
+    for c in range(categories):
+        category = MenuCategory(name=f"Category {c}", description=f"Benchmark category {c}")
+        db.session.add(category)
+        db.session.flush()
+        for i in range(items_per_category):
+            menu_item = MenuItem(
+                name=f"Dish {c}-{i}",
+                price=Decimal("100.00") + i,
+                category_id=category.id
+            )
+            db.session.add(menu_item)
+            menu_items.append(menu_item)
+    db.session.commit()
+    return admin, menu_items
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries():
+    counter = QueryCounter()
+    event.listen(db.engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(db.engine, "before_cursor_execute", counter)
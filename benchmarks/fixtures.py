@@ -0,0 +1,135 @@
+"""Seed realistic data volumes for the benchmark suite.
+
+Category names and inventory follow database/seed.py; SCALES sets how
+many users, dishes, orders and reservations sit next to them. Each table
+is filled with a single executemany INSERT and every user shares one
+password hash, so even the large scale seeds in seconds. Generation is
+seeded, so two runs at the same scale produce the same data.
+"""
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import insert, select
+from werkzeug.security import generate_password_hash
+
+from database.db import db
+from models import User, MenuCategory, MenuItem, Order, OrderItem, Payment, Reservation, Inventory
+
+PASSWORD = "bench123"
+ADMIN_EMAIL = "bench_admin@example.com"
+TABLES = 20
+
+SCALES = {
+    "small": {"users": 50, "menu_items": 100, "inventory": 50, "orders": 1_000, "reservations": 200},
+    "medium": {"users": 1_000, "menu_items": 400, "inventory": 200, "orders": 20_000, "reservations": 2_000},
+    "large": {"users": 10_000, "menu_items": 1_000, "inventory": 500, "orders": 200_000, "reservations": 20_000},
+}
+
+CATEGORIES = [
+    ("Burgers", "Delicious gourmet burgers"),
+    ("Pizzas", "Hand-tossed pizzas with fresh toppings"),
+    ("Pastas", "Italian pasta dishes"),
+    ("Drinks", "Soft drinks, juices, and cocktails"),
+    ("Desserts", "Cakes, ice creams, and sweets"),
+    ("Salads", "Fresh and healthy salads"),
+    ("Breakfast", "Morning specials and coffee"),
+    ("Seafood", "Fresh seafood dishes"),
+    ("Vegan", "Plant-based options"),
+    ("Snacks", "Quick bites and appetizers"),
+    ("Ethiopian Main Dishes", "Traditional Ethiopian meals"),
+    ("Ethiopian Breakfast", "Traditional Ethiopian breakfast items"),
+    ("Ethiopian Drinks", "Traditional Ethiopian beverages"),
+]
+
+INGREDIENTS = [
+    ("Beef Patty", "pcs", "Local Farm"), ("Burger Bun", "pcs", "Bakery Co."), ("Tomato", "pcs", "Fresh Farms"),
+    ("Cheese Slice", "pcs", "Dairy Co."), ("Spaghetti", "kg", "Italian Foods"), ("Salmon Fillet", "kg", "Seafood Co."),
+    ("Injera", "pcs", "Local Injera House"), ("Berbere Spice", "kg", "Spice Market"), ("Lentils", "kg", "Grain Supplier"),
+]
+
+
+def _bulk(model, rows):
+    if rows:
+        db.session.execute(insert(model), rows)
+
+
+def seed_volume(scale="small"):
+    """Create an admin, catalog, users, order history, payments and reservations.
+
+    Returns the ids and credentials the scenarios need.
+    """
+    counts = SCALES[scale]
+    rng = random.Random(42)
+    now = datetime.utcnow().replace(microsecond=0)
+    password_hash = generate_password_hash(PASSWORD)
+
+    _bulk(User, [{"username": "bench_admin", "email": ADMIN_EMAIL, "password_hash": password_hash,
+                  "role": "admin", "is_active": True}] + [
+        {"username": f"guest_{i}", "email": f"guest_{i}@example.com", "password_hash": password_hash,
+         "role": "user", "is_active": True}
+        for i in range(counts["users"])
+    ])
+    _bulk(MenuCategory, [{"name": name, "description": description} for name, description in CATEGORIES])
+    category_ids = db.session.scalars(select(MenuCategory.id).order_by(MenuCategory.id)).all()
+    _bulk(MenuItem, [
+        {"name": f"{CATEGORIES[i % len(CATEGORIES)][0]} special {i}", "description": "Chef's choice",
+         "price": Decimal(rng.randrange(3000, 90000, 500)) / 100, "category_id": category_ids[i % len(category_ids)]}
+        for i in range(counts["menu_items"])
+    ])
+    _bulk(Inventory, [
+        {"item_name": f"{INGREDIENTS[i % len(INGREDIENTS)][0]} {i}", "unit": INGREDIENTS[i % len(INGREDIENTS)][1],
+         "supplier": INGREDIENTS[i % len(INGREDIENTS)][2], "stock_quantity": rng.randint(50, 5000),
+         "threshold": rng.randint(5, 60)}
+        for i in range(counts["inventory"])
+    ])
+
+    user_ids = db.session.scalars(select(User.id).order_by(User.id)).all()
+    menu = db.session.execute(select(MenuItem.id, MenuItem.price).order_by(MenuItem.id)).all()
+    orders, lines = [], []
+    for i in range(counts["orders"]):
+        picked = [(rng.choice(menu), rng.randint(1, 3)) for _ in range(rng.randint(1, 5))]
+        subtotal = sum(price * quantity for (_, price), quantity in picked)
+        orders.append({
+            "user_id": rng.choice(user_ids), "order_number": f"SEED-{i:08d}",
+            "status": rng.choice(["completed", "completed", "completed", "cancelled", "pending"]),
+            "payment_status": "paid", "payment_method": rng.choice(["cash", "card"]),
+            "service_type": rng.choice(["dine_in", "take_away", "delivery"]),
+            "subtotal": subtotal, "discount": Decimal("0.00"), "total_price": subtotal,
+            "created_at": now - timedelta(minutes=rng.randint(1, 90 * 24 * 60)),
+        })
+        lines.append(picked)
+    _bulk(Order, orders)
+
+    order_ids = db.session.scalars(
+        select(Order.id).where(Order.order_number.like("SEED-%")).order_by(Order.order_number)
+    ).all()
+    _bulk(OrderItem, [
+        {"order_id": order_id, "menu_item_id": menu_item_id, "quantity": quantity, "price": price}
+        for order_id, picked in zip(order_ids, lines)
+        for (menu_item_id, price), quantity in picked
+    ])
+    _bulk(Payment, [
+        {"order_id": order_id, "user_id": order["user_id"], "amount": order["total_price"],
+         "payment_method": order["payment_method"], "status": "paid", "created_at": order["created_at"]}
+        for order_id, order in zip(order_ids, orders)
+    ])
+
+    # Two-hour slots per table from 30 days ago onwards, so seeded bookings never overlap.
+    first_slot = now.replace(hour=10, minute=0, second=0) - timedelta(days=30)
+    _bulk(Reservation, [
+        {"user_id": rng.choice(user_ids), "table_number": i % TABLES + 1,
+         "reservation_time": first_slot + timedelta(days=i // (TABLES * 6), hours=2 * (i // TABLES % 6)),
+         "status": rng.choice(["confirmed", "confirmed", "pending"])}
+        for i in range(counts["reservations"])
+    ])
+    db.session.commit()
+
+    return {
+        "admin_email": ADMIN_EMAIL,
+        "user_email": "guest_0@example.com",
+        "password": PASSWORD,
+        "menu_item_ids": [menu_item_id for menu_item_id, _ in menu],
+        "inventory_ids": db.session.scalars(select(Inventory.id)).all(),
+        "order_ids": order_ids[-100:],
+    }
@@ -0,0 +1,349 @@
+"""Benchmark suite for the main API flows, with diffable JSON results.
+
+Scenarios (each one is a short user flow of one or more requests):
+browse_menu, register_login, place_order, pay, reserve and stock.
+
+    micro    runs every scenario sequentially through the in-process Flask
+             test client and reports latency percentiles and SQL
+             statements per run.
+    load     is a locust-style runner: --users virtual users pick weighted
+             scenarios back to back for --duration seconds, either
+             in-process or against a running server (--base-url).
+    compare  prints the change between two result files.
+
+The database is SQLALCHEMY_DATABASE_URI, a fresh SQLite file by default.
+It is created and seeded through benchmarks.fixtures at --scale unless
+--no-seed is given. For MySQL, start a local container, export
+SQLALCHEMY_DATABASE_URI and seed once. When load-testing a separate
+server, point it at the same database.
+
+Usage:
+    python -m benchmarks.suite micro [--scale small] [--iterations 100] [--order-items 5]
+    python -m benchmarks.suite load [--users 20] [--duration 30] [--base-url http://127.0.0.1:5000]
+    python -m benchmarks.suite compare before.json after.json
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+os.environ.setdefault(
+    "SQLALCHEMY_DATABASE_URI", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'suite.sqlite')}"
+)
+
+SUITE_VERSION = 1
+WEIGHTS = {"browse_menu": 50, "place_order": 15, "pay": 10, "reserve": 10, "stock": 10, "register_login": 5}
+
+
+class ScenarioFailed(Exception):
+    pass
+
+
+class TestClientTransport:
+    """Requests through the in-process Flask test client."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None, token=None):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        response = self.client.open(path, method=method, json=body, headers=headers)
+        return response.status_code, response.get_json(silent=True)
+
+
+class HTTPTransport:
+    """Requests over one keep-alive connection to a running server."""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.connection = None
+
+    def request(self, method, path, body=None, token=None):
+        headers = {"Content-Type": "application/json"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        if self.connection is None:
+            self.connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        try:
+            self.connection.request(method, path, json.dumps(body) if body is not None else None, headers)
+            response = self.connection.getresponse()
+            payload = response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            self.connection = None
+            raise
+        if response.will_close:
+            self.connection.close()
+            self.connection = None
+        return response.status, json.loads(payload) if payload else None
+
+
+def expect(result, *statuses):
+    status, body = result
+    if status not in statuses:
+        raise ScenarioFailed(f"HTTP {status}: {body}")
+    return body
+
+
+def login(transport, email, password):
+    body = expect(transport.request("POST", "/api/auth/login", {"email": email, "password": password}), 200)
+    return body["data"]["access_token"], body["data"]["user"]["id"]
+
+
+def browse_menu(transport, ctx, rng):
+    expect(transport.request("GET", "/api/menu"), 200)
+    expect(transport.request("GET", "/api/categories"), 200)
+    expect(transport.request("GET", f"/api/menu/{rng.choice(ctx['menu_item_ids'])}"), 200)
+
+
+def register_login(transport, ctx, rng):
+    name = f"bench_{uuid.uuid4().hex[:12]}"
+    credentials = {"email": f"{name}@example.com", "password": "bench123"}
+    expect(transport.request("POST", "/api/auth/register", dict(credentials, username=name)), 201)
+    expect(transport.request("POST", "/api/auth/login", credentials), 200)
+
+
+def _order(transport, ctx, rng, size):
+    items = [{"menu_item_id": menu_item_id, "quantity": rng.randint(1, 3)}
+             for menu_item_id in rng.sample(ctx["menu_item_ids"], size)]
+    payload = {"user_id": ctx["user_id"], "items": items, "service_type": "dine_in"}
+    return expect(transport.request("POST", "/api/orders", payload, ctx["user_token"]), 201)["data"]
+
+
+def place_order(transport, ctx, rng):
+    _order(transport, ctx, rng, ctx["order_items"])
+
+
+def pay(transport, ctx, rng):
+    order = _order(transport, ctx, rng, 2)
+    payload = {"order_id": order["id"], "user_id": ctx["user_id"], "amount": order["total_price"],
+               "payment_method": "card", "status": "paid"}
+    expect(transport.request("POST", "/api/payments", payload, ctx["user_token"]), 201)
+
+
+def reserve(transport, ctx, rng):
+    # Far-future slots; an occasional overlap with another virtual user's booking is a valid 409.
+    when = datetime.utcnow().replace(second=0, microsecond=0) + timedelta(
+        days=rng.randint(90, 3650), minutes=15 * rng.randint(0, 95)
+    )
+    payload = {"user_id": ctx["user_id"], "table_number": rng.randint(1, 20),
+               "reservation_time": when.isoformat(), "status": "pending"}
+    expect(transport.request("POST", "/api/reservations", payload, ctx["admin_token"]), 201, 409)
+
+
+def stock(transport, ctx, rng):
+    item_id = rng.choice(ctx["inventory_ids"])
+    expect(transport.request("PATCH", f"/api/inventory/{item_id}/increase",
+                             {"quantity": 5, "note": "bench delivery"}, ctx["admin_token"]), 200)
+    expect(transport.request("PATCH", f"/api/inventory/{item_id}/decrease",
+                             {"quantity": 5, "note": "bench usage"}, ctx["admin_token"]), 200)
+
+
+SCENARIOS = {
+    "browse_menu": browse_menu,
+    "register_login": register_login,
+    "place_order": place_order,
+    "pay": pay,
+    "reserve": reserve,
+    "stock": stock,
+}
+
+
+def summarize(latencies, errors, elapsed, queries=None):
+    latencies = sorted(latencies)
+    result = {"runs": len(latencies), "errors": errors, "ops_per_s": round(len(latencies) / elapsed, 1)}
+    if latencies:
+        def pct(p):
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1000, 3)
+
+        result.update(mean_ms=round(sum(latencies) / len(latencies) * 1000, 3),
+                      p50_ms=pct(50), p95_ms=pct(95), p99_ms=pct(99))
+    if queries is not None and latencies:
+        result["queries_per_run"] = round(queries / len(latencies), 2)
+    return result
+
+
+def prepare(args):
+    from benchmarks.common import make_app
+    from benchmarks.fixtures import seed_volume, ADMIN_EMAIL, PASSWORD
+    from database.db import db
+    from models import MenuItem, Inventory
+
+    app = make_app()
+    with app.app_context():
+        if args.no_seed:
+            ctx = {"admin_email": ADMIN_EMAIL, "user_email": "guest_0@example.com", "password": PASSWORD,
+                   "menu_item_ids": db.session.scalars(db.select(MenuItem.id).filter_by(is_deleted=False)).all(),
+                   "inventory_ids": db.session.scalars(db.select(Inventory.id)).all()}
+        else:
+            ctx = seed_volume(args.scale)
+        db.session.remove()
+    ctx["order_items"] = min(args.order_items, len(ctx["menu_item_ids"]))
+    return app, ctx
+
+
+def authenticate(transport, ctx):
+    ctx["admin_token"], _ = login(transport, ctx["admin_email"], ctx["password"])
+    ctx["user_token"], ctx["user_id"] = login(transport, ctx["user_email"], ctx["password"])
+
+
+def run_micro(args, app, ctx):
+    from benchmarks.common import count_queries
+
+    transport = TestClientTransport(app)
+    authenticate(transport, ctx)
+    rng = random.Random(1)
+    results = {}
+    for name, scenario in SCENARIOS.items():
+        for _ in range(args.warmup):
+            scenario(transport, ctx, rng)
+        latencies, errors = [], 0
+        with app.app_context(), count_queries() as counter:
+            started = time.perf_counter()
+            for _ in range(args.iterations):
+                began = time.perf_counter()
+                try:
+                    scenario(transport, ctx, rng)
+                except ScenarioFailed:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - began)
+            elapsed = time.perf_counter() - started
+        results[name] = summarize(latencies, errors, elapsed, counter.count)
+    return results
+
+
+def run_load(args, app, ctx):
+    def transport_factory():
+        return HTTPTransport(args.base_url) if args.base_url else TestClientTransport(app)
+
+    authenticate(transport_factory(), ctx)
+    names = list(WEIGHTS)
+    weights = [WEIGHTS[name] for name in names]
+    latencies = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    lock = threading.Lock()
+    stop_at = time.monotonic() + args.duration
+
+    def virtual_user(index):
+        transport = transport_factory()
+        rng = random.Random(index)
+        while time.monotonic() < stop_at:
+            name = rng.choices(names, weights)[0]
+            began = time.perf_counter()
+            try:
+                SCENARIOS[name](transport, ctx, rng)
+            except (ScenarioFailed, OSError, http.client.HTTPException):
+                with lock:
+                    errors[name] += 1
+                continue
+            elapsed = time.perf_counter() - began
+            with lock:
+                latencies[name].append(elapsed)
+
+    threads = [threading.Thread(target=virtual_user, args=(i,)) for i in range(args.users)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    results = {name: summarize(latencies[name], errors[name], elapsed) for name in names}
+    results["total"] = summarize(
+        [value for values in latencies.values() for value in values], sum(errors.values()), elapsed
+    )
+    return results
+
+
+def metadata(args):
+    from database.db import db
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "suite_version": SUITE_VERSION,
+        "mode": args.mode,
+        "git_commit": commit,
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "python": platform.python_version(),
+        "database": os.environ["SQLALCHEMY_DATABASE_URI"].split(":", 1)[0],
+        "target": args.base_url or "in-process",
+        "params": {key: value for key, value in vars(args).items() if key not in ("mode", "output")},
+    }
+
+
+def print_table(results):
+    print(f"{'scenario':<16} {'runs':>6} {'err':>4} {'ops/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'sql':>6}")
+    for name, row in results.items():
+        print(f"{name:<16} {row['runs']:>6} {row['errors']:>4} {row['ops_per_s']:>8.1f} "
+              f"{row.get('p50_ms', 0):>8.2f} {row.get('p95_ms', 0):>8.2f} {row.get('p99_ms', 0):>8.2f} "
+              f"{row.get('queries_per_run', ''):>6}")
+
+
+def compare(before_path, after_path):
+    with open(before_path) as before_file, open(after_path) as after_file:
+        before, after = json.load(before_file), json.load(after_file)
+    print(f"{before['meta'].get('git_commit')} -> {after['meta'].get('git_commit')} ({after['meta']['mode']})")
+    print(f"{'scenario':<16} {'metric':<16} {'before':>10} {'after':>10} {'change':>8}")
+    for name, row in after["results"].items():
+        old = before["results"].get(name)
+        if old is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "ops_per_s", "queries_per_run"):
+            if metric in row and metric in old and old[metric]:
+                change = (row[metric] - old[metric]) / old[metric] * 100
+                print(f"{name:<16} {metric:<16} {old[metric]:>10} {row[metric]:>10} {change:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API benchmark suite")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+    for mode in ("micro", "load"):
+        sub = subparsers.add_parser(mode)
+        sub.add_argument("--scale", choices=["small", "medium", "large"], default="small")
+        sub.add_argument("--no-seed", action="store_true", help="Use the data already in the database.")
+        sub.add_argument("--order-items", type=int, default=5, help="Lines per order in place_order.")
+        sub.add_argument("--output", default=f"benchmark_{mode}.json", help="Where to write the JSON results.")
+        sub.add_argument("--base-url", default=None)
+    subparsers.choices["micro"].add_argument("--iterations", type=int, default=100)
+    subparsers.choices["micro"].add_argument("--warmup", type=int, default=5)
+    subparsers.choices["load"].add_argument("--users", type=int, default=20)
+    subparsers.choices["load"].add_argument("--duration", type=float, default=30)
+    compare_parser = subparsers.add_parser("compare")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+    args = parser.parse_args()
+
+    if args.mode == "compare":
+        compare(args.before, args.after)
+        return
+    if args.mode == "micro" and args.base_url:
+        parser.error("micro always runs in-process; use load for --base-url")
+
+    app, ctx = prepare(args)
+    results = run_micro(args, app, ctx) if args.mode == "micro" else run_load(args, app, ctx)
+    print_table(results)
+    with open(args.output, "w") as output:
+        json.dump({"meta": metadata(args), "results": results}, output, indent=2)
+    print(f"Results written to {args.output}")
+    if any(row["errors"] for row in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,50 @@ from datetime import timedelta
 from dotenv import load_dotenv
 load_dotenv()
 
+
+def engine_options(uri):
+    """Pool and timeout settings for ``SQLALCHEMY_ENGINE_OPTIONS``, from the environment.
+
+    In-memory SQLite keeps SQLAlchemy's single-connection pool, so the
+    QueuePool sizes are only applied to server databases and SQLite files.
+    """
+    if not uri:
+        return {}
+    options = {
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    }
+    if uri.startswith("sqlite") and (uri.rstrip("/") in ("sqlite:", "sqlite://") or ":memory:" in uri):
+        return options
+    options.update(
+        pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+    )
+    timeout_ms = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    if timeout_ms and uri.startswith("mysql"):
+        options["connect_args"] = {"init_command": f"SET SESSION max_execution_time={timeout_ms}"}
+    elif timeout_ms and uri.startswith("postgresql"):
+        options["connect_args"] = {"options": f"-c statement_timeout={timeout_ms}"}
+    return options
+
+
+def parse_tables(spec):
+    """Parse ``RESTAURANT_TABLES`` ("table:seats,...") into ``{table_number: seats}``."""
+    tables = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        try:
+            table_number, seats = (int(part) for part in entry.split(":"))
+        except ValueError:
+            table_number = seats = 0
+        if table_number <= 0 or seats <= 0:
+            raise RuntimeError(f"RESTAURANT_TABLES entry {entry.strip()!r} must be table:seats with positive integers")
+        tables[table_number] = seats
+    return tables
+
+
 class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "default_secret_key")
     FLASK_ENV = os.getenv("FLASK_ENV", "development")
@@ -12,6 +56,9 @@ class Config:
         raise RuntimeError("SQLALCHEMY_DATABASE_URI is not set")
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    DATABASE_REPLICA_URI = os.getenv("DATABASE_REPLICA_URI")
+    SQLALCHEMY_BINDS = {"replica": DATABASE_REPLICA_URI} if DATABASE_REPLICA_URI else {}
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "default_jwt_secret")
     JWT_TOKEN_LOCATION = ["headers"]
     JWT_HEADER_NAME = "Authorization"
@@ -20,6 +67,28 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=2)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
     JSON_SORT_KEYS = False
+    CATALOG_CACHE_TTL = int(os.getenv("CATALOG_CACHE_TTL", "60"))
+    RESERVATION_SEATING_MINUTES = int(os.getenv("RESERVATION_SEATING_MINUTES", "90"))
+    RESERVATION_SLOT_MINUTES = int(os.getenv("RESERVATION_SLOT_MINUTES", "30"))
+    RESTAURANT_TABLES = parse_tables(os.getenv("RESTAURANT_TABLES", ",".join(f"{n}:4" for n in range(1, 21))))
+    ORDER_NUMBER_BLOCK_SIZE = int(os.getenv("ORDER_NUMBER_BLOCK_SIZE", "20"))
+    DASHBOARD_CACHE_TTL = int(os.getenv("DASHBOARD_CACHE_TTL", "10"))
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "30"))
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt")
+    PASSWORD_HASH_POOL = os.getenv("PASSWORD_HASH_POOL", "thread")
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "0")) or None
+    REGISTER_PRECHECK = os.getenv("REGISTER_PRECHECK", "false").lower() == "true"
+    LOGIN_MAX_FAILURES = int(os.getenv("LOGIN_MAX_FAILURES", "5"))
+    LOGIN_FAILURE_WINDOW = int(os.getenv("LOGIN_FAILURE_WINDOW", "300"))
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_WINDOW = int(os.getenv("METRICS_WINDOW", "1024"))
+    METRICS_SERVER_TIMING = os.getenv("METRICS_SERVER_TIMING", "false").lower() == "true"
+    ORDER_EVENTS_BACKEND = os.getenv("ORDER_EVENTS_BACKEND", "outbox")
+    ORDER_EVENTS_BUFFER = int(os.getenv("ORDER_EVENTS_BUFFER", "1000"))
+    ORDER_EVENTS_POLL_INTERVAL = float(os.getenv("ORDER_EVENTS_POLL_INTERVAL", "1"))
+    ORDER_EVENTS_HEARTBEAT = int(os.getenv("ORDER_EVENTS_HEARTBEAT", "15"))
+    ORDER_EVENTS_STREAM_SECONDS = int(os.getenv("ORDER_EVENTS_STREAM_SECONDS", "300"))
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -1,20 +1,32 @@
-from flask import Blueprint, request
+import io
+from flask import Blueprint, request, Response, current_app, stream_with_context
 from flask_jwt_extended import get_jwt_identity
 from services import (
     AuthService, MenuCategoryService, MenuService,
     OrderService, PaymentService, ReservationService,
-    SalesReportService, InventoryService
+    SalesReportService, InventoryService, MenuImportService, RecipeService,
+    PaymentImportService, DashboardService
 )
-from schemas import user_schema
-from utils.response import success_response, error_response
+from schemas import order_detail_dumper
+from utils.response import (
+    success_response, error_response, not_modified, with_validators,
+    row_validators, collection_validators
+)
+from utils.metrics import request_metrics
+from utils.streaming import STREAM_FORMATS, read_rows, streaming_response, iter_sse
+from utils.events import order_events
 from middleware import jwt_required_custom, admin_required
+from database.db import db
 from validations import (
     validate_register_data, validate_login_data,
     validate_category_create, validate_category_update,
     validate_menu_create, validate_menu_update,
-    validate_order_data, validate_payment_data,
-    validate_reservation_data, validate_sales_report_data,
-    validate_inventory_data
+    validate_order_data, validate_order_update, validate_payment_data,
+    validate_reservation_data, validate_reservation_update, validate_sales_report_data,
+    validate_inventory_data, validate_list_args, validate_sales_refresh_data,
+    validate_recipe_data, validate_availability_args,
+    ORDER_LIST_FILTERS, PAYMENT_LIST_FILTERS, RESERVATION_LIST_FILTERS,
+    SALES_REPORT_LIST_FILTERS, INVENTORY_LIST_FILTERS
 )
 
 api_bp = Blueprint("api_bp", __name__, url_prefix="/api")
@@ -28,7 +40,7 @@ def register():
     if error:
         return error
 
-    return success_response("User registered successfully",user_schema.dump(user),201)
+    return success_response("User registered successfully",user,201)
 
 
 @api_bp.route("/auth/login", methods=["POST"])
@@ -41,7 +53,6 @@ def login():
     if error:
         return error
 
-    auth_data["user"] = user_schema.dump(auth_data["user"])
     return success_response("Login successful", auth_data, 200)
 
 
@@ -53,7 +64,7 @@ def get_me():
     if error:
         return error
 
-    return success_response("User retrieved", user_schema.dump(user), 200)
+    return success_response("User retrieved", user, 200)
 
 
 @api_bp.route("/auth/change-password", methods=["PUT"])
@@ -70,7 +81,7 @@ def change_password():
     if error:
         return error
 
-    return success_response("Password updated", user_schema.dump(user), 200)
+    return success_response("Password updated", user, 200)
 
 
 @api_bp.route("/auth/change-role/<int:user_id>", methods=["PUT"])
@@ -87,7 +98,7 @@ def change_role(user_id):
     if error:
         return error
 
-    return success_response("Role updated", user_schema.dump(user), 200)
+    return success_response("Role updated", user, 200)
 
 
 @api_bp.route("/categories", methods=["POST"])
@@ -107,8 +118,12 @@ def create_category():
 
 @api_bp.route("/categories", methods=["GET"])
 def get_categories():
-    categories = MenuCategoryService.get_all_categories()
-    return success_response("Categories retrieved", categories, 200)
+    categories, etag, last_modified = MenuCategoryService.get_all_categories_cached()
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
+    return with_validators(success_response("Categories retrieved", categories, 200), etag, last_modified)
 
 
 @api_bp.route("/categories/<int:category_id>", methods=["PUT"])
@@ -154,8 +169,42 @@ def create_menu():
 
 @api_bp.route("/menu", methods=["GET"])
 def get_all_menu():
-    menus = MenuService.get_all_menus()
-    return success_response("Menus retrieved", menus, 200)
+    menus, etag, last_modified = MenuService.get_all_menus_cached()
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
+    return with_validators(success_response("Menus retrieved", menus, 200), etag, last_modified)
+
+
+@api_bp.route("/menu/import", methods=["POST"])
+@jwt_required_custom
+@admin_required
+def import_menu():
+    fmt = request.args.get("format", "csv")
+    if fmt not in STREAM_FORMATS:
+        return error_response(f"Format must be one of {list(STREAM_FORMATS)}", 400)
+
+    upload = request.files.get("file")
+    raw = upload.stream if upload else io.BufferedReader(request.stream)
+    stream = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+
+    summary, error = MenuImportService.import_rows(read_rows(stream, fmt))
+    if error:
+        return error
+
+    return success_response("Menu imported", summary, 200)
+
+
+@api_bp.route("/menu/export", methods=["GET"])
+@jwt_required_custom
+@admin_required
+def export_menu():
+    fmt = request.args.get("format", "csv")
+    if fmt not in STREAM_FORMATS:
+        return error_response(f"Format must be one of {list(STREAM_FORMATS)}", 400)
+
+    return streaming_response(MenuImportService.export_rows(), fmt, MenuImportService.FIELDS, "menu")
 
 
 @api_bp.route("/menu/<int:menu_id>", methods=["GET"])
@@ -164,7 +213,12 @@ def get_menu(menu_id):
     if not menu:
         return error_response("Menu not found", 404)
 
-    return success_response("Menu retrieved", menu, 200)
+    etag, last_modified = row_validators(menu)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
+    return with_validators(success_response("Menu retrieved", menu, 200), etag, last_modified)
 
 
 @api_bp.route("/menu/<int:menu_id>", methods=["PUT"])
@@ -193,6 +247,29 @@ def delete_menu(menu_id):
     return success_response("Menu deleted", menu, 200)
 
 
+@api_bp.route("/menu/<int:menu_id>/recipe", methods=["GET"])
+@jwt_required_custom
+@admin_required
+def get_recipe(menu_id):
+    recipe = RecipeService.get_recipe(menu_id)
+    return success_response("Recipe retrieved", recipe, 200)
+
+
+@api_bp.route("/menu/<int:menu_id>/recipe", methods=["PUT"])
+@jwt_required_custom
+@admin_required
+def set_recipe(menu_id):
+    items, error = validate_recipe_data(request.get_json() or {})
+    if error:
+        return error
+
+    recipe, error = RecipeService.set_recipe(menu_id, items)
+    if error:
+        return error
+
+    return success_response("Recipe updated", recipe, 200)
+
+
 @api_bp.route("/orders", methods=["POST"])
 @jwt_required_custom
 def create_order():
@@ -209,29 +286,103 @@ def create_order():
     return success_response("Order created", order, 201)
 
 
+@api_bp.route("/orders/stream", methods=["GET"])
+@jwt_required_custom
+@admin_required
+def stream_orders():
+    last_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    try:
+        last_id = int(last_id) if last_id else None
+        stations = {int(s) for s in request.args.get("station", "").split(",") if s.strip()}
+    except ValueError:
+        return error_response("Last-Event-ID and station must be integers", 400)
+
+    body = iter_sse(
+        order_events, last_id, stations,
+        heartbeat=current_app.config.get("ORDER_EVENTS_HEARTBEAT", 15),
+        max_seconds=current_app.config.get("ORDER_EVENTS_STREAM_SECONDS", 300)
+    )
+    # The stream outlives the request; hand the session's connection back
+    # now instead of holding it until the stream closes.
+    db.session.close()
+    response = Response(stream_with_context(body), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
 @api_bp.route("/orders/<int:order_id>", methods=["GET"])
 @jwt_required_custom
 def get_order(order_id):
-    order = OrderService.get_order_by_id(order_id)
+    order = OrderService.get_order_detail(order_id)
     if not order:
         return error_response("Order not found", 404)
 
-    return success_response("Order retrieved", order, 200)
+    etag, last_modified = row_validators(
+        order, *order.items, *(item.menu_item for item in order.items if item.menu_item), *order.payments
+    )
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
+    return with_validators(success_response("Order retrieved", order_detail_dumper(order), 200), etag, last_modified)
 
 
 @api_bp.route("/orders", methods=["GET"])
 @jwt_required_custom
 @admin_required
 def get_all_orders():
-    orders = OrderService.get_all_orders()
-    return success_response("Orders retrieved", orders, 200)
+    params, error = validate_list_args(request.args, ORDER_LIST_FILTERS)
+    if error:
+        return error
+
+    if request.args.get("expand") == "items":
+        orders, next_cursor = OrderService.list_order_details(params)
+        orders = [order_detail_dumper(order) for order in orders]
+    else:
+        orders, next_cursor = OrderService.list_orders(params)
+    return success_response("Orders retrieved", {
+        "items": orders,
+        "next_cursor": next_cursor
+    }, 200)
+
+
+@api_bp.route("/orders/export", methods=["GET"])
+@jwt_required_custom
+@admin_required
+def export_orders():
+    fmt = request.args.get("format", "csv")
+    if fmt not in STREAM_FORMATS:
+        return error_response(f"Format must be one of {list(STREAM_FORMATS)}", 400)
+
+    params, error = validate_list_args(request.args, ORDER_LIST_FILTERS)
+    if error:
+        return error
+
+    rows = OrderService.export_rows(params)
+    return streaming_response(rows, fmt, OrderService.EXPORT_FIELDS, "orders")
+
+
+@api_bp.route("/orders/repair-totals", methods=["POST"])
+@jwt_required_custom
+@admin_required
+def repair_order_totals():
+    result, error = OrderService.repair_totals()
+    if error:
+        return error
+
+    return success_response("Order totals repaired", result, 200)
 
 
 @api_bp.route("/orders/<int:order_id>", methods=["PUT"])
 @jwt_required_custom
 @admin_required
 def update_order(order_id):
-    order, error = OrderService.update_order(order_id, request.get_json() or {})
+    data, error = validate_order_update(request.get_json() or {})
+    if error:
+        return error
+
+    order, error = OrderService.update_order(order_id, data)
     if error:
         return error
 
@@ -265,12 +416,54 @@ def create_payment():
     return success_response("Payment created", payment, 201)
 
 
+@api_bp.route("/payments/import", methods=["POST"])
+@jwt_required_custom
+@admin_required
+def import_payments():
+    fmt = request.args.get("format", "csv")
+    if fmt not in STREAM_FORMATS:
+        return error_response(f"Format must be one of {list(STREAM_FORMATS)}", 400)
+
+    upload = request.files.get("file")
+    raw = upload.stream if upload else io.BufferedReader(request.stream)
+    stream = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+
+    summary, error = PaymentImportService.import_rows(read_rows(stream, fmt))
+    if error:
+        return error
+
+    return success_response("Payments imported", summary, 200)
+
+
 @api_bp.route("/payments", methods=["GET"])
 @jwt_required_custom
 @admin_required
 def get_all_payments():
-    payments = PaymentService.get_all_payments()
-    return success_response("Payments retrieved", payments, 200)
+    params, error = validate_list_args(request.args, PAYMENT_LIST_FILTERS)
+    if error:
+        return error
+
+    payments, next_cursor = PaymentService.list_payments(params)
+    return success_response("Payments retrieved", {
+        "items": payments,
+        "next_cursor": next_cursor
+    }, 200)
+
+
+@api_bp.route("/payments/export", methods=["GET"])
+@jwt_required_custom
+@admin_required
+def export_payments():
+    fmt = request.args.get("format", "csv")
+    if fmt not in STREAM_FORMATS:
+        return error_response(f"Format must be one of {list(STREAM_FORMATS)}", 400)
+
+    params, error = validate_list_args(request.args, PAYMENT_LIST_FILTERS)
+    if error:
+        return error
+
+    rows = PaymentService.export_rows(params)
+    return streaming_response(rows, fmt, PaymentService.EXPORT_FIELDS, "payments")
 
 
 @api_bp.route("/payments/<int:payment_id>", methods=["GET"])
@@ -280,7 +473,12 @@ def get_payment(payment_id):
     if not payment:
         return error_response("Payment not found", 404)
 
-    return success_response("Payment retrieved", payment, 200)
+    etag, last_modified = row_validators(payment)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
+    return with_validators(success_response("Payment retrieved", payment, 200), etag, last_modified)
 
 
 @api_bp.route("/payments/<int:payment_id>", methods=["PUT"])
@@ -326,8 +524,33 @@ def create_reservation():
 @api_bp.route("/reservations", methods=["GET"])
 @jwt_required_custom
 def get_reservations():
-    reservations = ReservationService.get_all_reservations()
-    return success_response("Reservations retrieved", reservations, 200)
+    params, error = validate_list_args(request.args, RESERVATION_LIST_FILTERS)
+    if error:
+        return error
+
+    reservations, next_cursor = ReservationService.list_reservations(params)
+    return success_response("Reservations retrieved", {
+        "items": reservations,
+        "next_cursor": next_cursor
+    }, 200)
+
+
+@api_bp.route("/reservations/availability", methods=["GET"])
+@jwt_required_custom
+def get_reservation_availability():
+    params, error = validate_availability_args(request.args)
+    if error:
+        return error
+
+    slots = ReservationService.find_availability(**params)
+    return success_response("Availability retrieved", [
+        {
+            "start": slot["start"].isoformat(),
+            "end": slot["end"].isoformat(),
+            "free_tables": slot["free_tables"]
+        }
+        for slot in slots
+    ], 200)
 
 
 @api_bp.route("/reservations/<int:reservation_id>", methods=["GET"])
@@ -337,17 +560,23 @@ def get_reservation(reservation_id):
     if not reservation:
         return error_response("Reservation not found", 404)
 
-    return success_response("Reservation retrieved", reservation, 200)
+    etag, last_modified = row_validators(reservation)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
+    return with_validators(success_response("Reservation retrieved", reservation, 200), etag, last_modified)
 
 
 @api_bp.route("/reservations/<int:reservation_id>", methods=["PUT"])
 @jwt_required_custom
 @admin_required
 def update_reservation(reservation_id):
-    reservation, error = ReservationService.update_reservation(
-        reservation_id,
-        request.get_json() or {}
-    )
+    data, error = validate_reservation_update(request.get_json() or {})
+    if error:
+        return error
+
+    reservation, error = ReservationService.update_reservation(reservation_id, data)
     if error:
         return error
 
@@ -380,12 +609,40 @@ def create_sales_report():
     return success_response("Sales report created", report, 201)
 
 
+@api_bp.route("/sales-reports/refresh", methods=["POST"])
+@jwt_required_custom
+@admin_required
+def refresh_sales_reports():
+    data, error = validate_sales_refresh_data(request.get_json(silent=True) or {})
+    if error:
+        return error
+
+    if data["generated_by"] is None:
+        data["generated_by"] = int(get_jwt_identity())
+
+    result, error = SalesReportService.refresh_daily_reports(**data)
+    if error:
+        return error
+
+    return success_response("Sales reports refreshed", {
+        "days_refreshed": result["days_refreshed"],
+        "reports": result["reports"]
+    }, 200)
+
+
 @api_bp.route("/sales-reports", methods=["GET"])
 @jwt_required_custom
 @admin_required
 def get_sales_reports():
-    reports = SalesReportService.get_all_reports()
-    return success_response("Sales reports retrieved", reports, 200)
+    params, error = validate_list_args(request.args, SALES_REPORT_LIST_FILTERS)
+    if error:
+        return error
+
+    reports, next_cursor = SalesReportService.list_reports(params)
+    return success_response("Sales reports retrieved", {
+        "items": reports,
+        "next_cursor": next_cursor
+    }, 200)
 
 
 @api_bp.route("/sales-reports/<int:report_id>", methods=["GET"])
@@ -396,7 +653,12 @@ def get_sales_report(report_id):
     if not report:
         return error_response("Sales report not found", 404)
 
-    return success_response("Sales report retrieved", report, 200)
+    etag, last_modified = row_validators(report)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
+    return with_validators(success_response("Sales report retrieved", report, 200), etag, last_modified)
 
 
 @api_bp.route("/sales-reports/<int:report_id>", methods=["PUT"])
@@ -442,8 +704,20 @@ def create_inventory_item():
 @api_bp.route("/inventory", methods=["GET"])
 @jwt_required_custom
 def get_inventory():
-    items = InventoryService.get_all_items()
-    return success_response("Inventory retrieved", items, 200)
+    params, error = validate_list_args(request.args, INVENTORY_LIST_FILTERS)
+    if error:
+        return error
+
+    etag, last_modified = collection_validators(
+        f"inventory?{request.query_string.decode()}", *InventoryService.get_items_version(params)
+    )
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
+    items, next_cursor = InventoryService.list_items(params)
+    data = {"items": items, "next_cursor": next_cursor}
+    return with_validators(success_response("Inventory retrieved", data, 200), etag, last_modified)
 
 
 @api_bp.route("/inventory/<int:item_id>", methods=["GET"])
@@ -453,7 +727,12 @@ def get_inventory_item(item_id):
     if not item:
         return error_response("Inventory item not found", 404)
 
-    return success_response("Inventory item retrieved", item, 200)
+    etag, last_modified = row_validators(item)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
+    return with_validators(success_response("Inventory item retrieved", item, 200), etag, last_modified)
 
 
 @api_bp.route("/inventory/<int:item_id>/increase", methods=["PATCH"])
@@ -502,3 +781,22 @@ def adjust_stock(item_id):
         return error
 
     return success_response("Stock adjusted", item, 200)
+
+
+@api_bp.route("/dashboard/summary", methods=["GET"])
+@jwt_required_custom
+@admin_required
+def get_dashboard_summary():
+    summary, etag = DashboardService.summary()
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    return with_validators(success_response("Dashboard summary retrieved", summary, 200), etag)
+
+
+@api_bp.route("/metrics", methods=["GET"])
+@jwt_required_custom
+@admin_required
+def get_metrics():
+    return Response(request_metrics.render_prometheus(), mimetype="text/plain; version=0.0.4")
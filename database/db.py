@@ -1,11 +1,99 @@
+from contextvars import ContextVar
+from functools import wraps
+
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from flask_migrate import Migrate
 from flask_marshmallow import Marshmallow
+from sqlalchemy import event
+from sqlalchemy.sql.dml import UpdateBase
+
+REPLICA_BIND = "replica"
+_read_replica = ContextVar("read_replica", default=False)
+
+
+def read_only(func):
+    """Run ``func`` with its queries routed to the read replica, if one is configured.
+
+    Only for plain reads whose result goes straight to the client; cache
+    loaders stay on the primary so a lagging replica cannot pin stale rows
+    in a cache until its next invalidation.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _read_replica.set(True)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _read_replica.reset(token)
+    return wrapper
+
+
+class RoutingSession(Session):
+    """Session that sends reads inside ``read_only`` calls to the ``replica`` bind.
+
+    Everything else goes to the primary: flushes, DML, ``FOR UPDATE``
+    selects, and every statement after the session has written anything,
+    so a request reads its own writes instead of a lagging replica.
+    Without a ``replica`` bind this behaves like the stock session.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and _read_replica.get()
+            and not self._flushing
+            and not self.info.get("wrote")
+            and not isinstance(clause, UpdateBase)
+            and getattr(clause, "_for_update_arg", None) is None
+        ):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
 
-db = SQLAlchemy()
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_dml(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
 ma = Marshmallow()
 
 def init_db(app):
     db.init_app(app)
     ma.init_app(app)
+
+
+def upsert(model, rows, conflict_columns, update_columns, extra_set=None):
+    """Build a multi-row INSERT that updates ``update_columns`` on conflict.
+
+    MySQL resolves the conflict through whichever unique key matches
+    (ON DUPLICATE KEY UPDATE); SQLite and PostgreSQL need the
+    ``conflict_columns`` of that key spelled out. ``extra_set`` maps more
+    columns to SQL expressions applied on conflict (e.g. ``updated_at``).
+    """
+    dialect = db.engine.dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(model).values(rows)
+        updates = {col: stmt.inserted[col] for col in update_columns}
+        updates.update(extra_set or {})
+        return stmt.on_duplicate_key_update(updates)
+
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    stmt = insert(model).values(rows)
+    updates = {col: stmt.excluded[col] for col in update_columns}
+    updates.update(extra_set or {})
+    return stmt.on_conflict_do_update(index_elements=conflict_columns, set_=updates)
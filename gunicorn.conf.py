@@ -0,0 +1,38 @@
+"""Gunicorn settings for the high-concurrency serving mode.
+
+gevent workers patch the standard library before the app is imported,
+so PyMySQL (pure Python) yields to other greenlets while it waits on
+MySQL and one worker process serves many requests at once, including
+long-lived /api/orders/stream connections. Each worker builds its own
+engine (no preload), so no pooled connection is shared across a fork.
+Size DB_POOL_SIZE + DB_MAX_OVERFLOW to the greenlets expected to query
+at the same time, not to worker_connections.
+
+    gunicorn -c gunicorn.conf.py
+"""
+import multiprocessing
+import os
+
+wsgi_app = "wsgi:app"
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("GUNICORN_WORKERS", str(multiprocessing.cpu_count())))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gevent")
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+preload_app = False
+
+
+def post_worker_init(worker):
+    from app import warm_up
+
+    warm_up(worker.wsgi)
+
+
+def worker_exit(server, worker):
+    from database.db import db
+
+    with worker.wsgi.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
@@ -23,15 +23,16 @@ def admin_required(fn):
             return error_response("Authentication required", 401)
 
         user_id = int(get_jwt_identity())
-        user, error = AuthService.get_user_by_id(user_id)
+        access = AuthService.get_user_access(user_id)
 
-        if error or not user:
+        if access is None:
             return error_response("User not found", 404)
 
-        if not user.is_active:
+        role, is_active = access
+        if not is_active:
             return error_response("User disabled", 403)
 
-        if user.role != "admin":
+        if role != "admin":
             return error_response("Admin access required", 403)
 
         return fn(*args, **kwargs)
@@ -0,0 +1,41 @@
+"""recipe items
+
+Revision ID: 2f6a9d4c8b15
+Revises: 8c1d5e3f7a21
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2f6a9d4c8b15'
+down_revision = '8c1d5e3f7a21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('recipe_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('menu_item_id', sa.Integer(), nullable=False),
+        sa.Column('inventory_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.CheckConstraint('quantity > 0', name='check_recipeitem_quantity_positive'),
+        sa.ForeignKeyConstraint(['inventory_id'], ['inventory.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['menu_item_id'], ['menu_items.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('menu_item_id', 'inventory_id', name='uq_recipeitem_menu_inventory')
+    )
+    with op.batch_alter_table('recipe_items', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_recipe_items_inventory_id'), ['inventory_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('recipe_items', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_recipe_items_inventory_id'))
+
+    op.drop_table('recipe_items')
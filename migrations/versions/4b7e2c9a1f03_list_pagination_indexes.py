@@ -0,0 +1,64 @@
+"""list pagination indexes
+
+Revision ID: 4b7e2c9a1f03
+Revises: d56cf0d20563
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7e2c9a1f03'
+down_revision = 'd56cf0d20563'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.create_index('ix_orders_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_orders_status_created_at', ['status', 'created_at'], unique=False)
+        batch_op.create_index('ix_orders_payment_status_created_at', ['payment_status', 'created_at'], unique=False)
+        batch_op.create_index('ix_orders_service_type_created_at', ['service_type', 'created_at'], unique=False)
+        batch_op.create_index('ix_orders_user_id_created_at', ['user_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.create_index('ix_payments_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_payments_status_created_at', ['status', 'created_at'], unique=False)
+        batch_op.create_index('ix_payments_user_id_created_at', ['user_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('reservations', schema=None) as batch_op:
+        batch_op.create_index('ix_reservations_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_reservations_status_created_at', ['status', 'created_at'], unique=False)
+
+    with op.batch_alter_table('sales_reports', schema=None) as batch_op:
+        batch_op.create_index('ix_sales_reports_report_date_id', ['report_date', 'id'], unique=False)
+
+    with op.batch_alter_table('inventory', schema=None) as batch_op:
+        batch_op.create_index('ix_inventory_created_at_id', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('inventory', schema=None) as batch_op:
+        batch_op.drop_index('ix_inventory_created_at_id')
+
+    with op.batch_alter_table('sales_reports', schema=None) as batch_op:
+        batch_op.drop_index('ix_sales_reports_report_date_id')
+
+    with op.batch_alter_table('reservations', schema=None) as batch_op:
+        batch_op.drop_index('ix_reservations_status_created_at')
+        batch_op.drop_index('ix_reservations_created_at_id')
+
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.drop_index('ix_payments_user_id_created_at')
+        batch_op.drop_index('ix_payments_status_created_at')
+        batch_op.drop_index('ix_payments_created_at_id')
+
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.drop_index('ix_orders_user_id_created_at')
+        batch_op.drop_index('ix_orders_service_type_created_at')
+        batch_op.drop_index('ix_orders_payment_status_created_at')
+        batch_op.drop_index('ix_orders_status_created_at')
+        batch_op.drop_index('ix_orders_created_at_id')
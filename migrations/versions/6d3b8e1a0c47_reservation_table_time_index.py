@@ -0,0 +1,26 @@
+"""reservation table/time index
+
+Revision ID: 6d3b8e1a0c47
+Revises: 2f6a9d4c8b15
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6d3b8e1a0c47'
+down_revision = '2f6a9d4c8b15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('reservations', schema=None) as batch_op:
+        batch_op.create_index('ix_reservations_table_time', ['table_number', 'reservation_time'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('reservations', schema=None) as batch_op:
+        batch_op.drop_index('ix_reservations_table_time')
@@ -0,0 +1,32 @@
+"""sales report refresh watermark
+
+Revision ID: 8c1d5e3f7a21
+Revises: 4b7e2c9a1f03
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c1d5e3f7a21'
+down_revision = '4b7e2c9a1f03'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('sales_reports', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=True))
+
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.create_index('ix_orders_updated_at', ['updated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.drop_index('ix_orders_updated_at')
+
+    with op.batch_alter_table('sales_reports', schema=None) as batch_op:
+        batch_op.drop_column('refreshed_at')
@@ -0,0 +1,28 @@
+"""order number sequences
+
+Revision ID: 9a4f2c7e1b36
+Revises: 6d3b8e1a0c47
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4f2c7e1b36'
+down_revision = '6d3b8e1a0c47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('order_number_sequences',
+        sa.Column('seq_date', sa.Date(), nullable=False),
+        sa.Column('last_value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('seq_date')
+    )
+
+
+def downgrade():
+    op.drop_table('order_number_sequences')
@@ -0,0 +1,31 @@
+"""row versions
+
+Revision ID: a9d3f6c1e284
+Revises: f4a8c2e6b913
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d3f6c1e284'
+down_revision = 'f4a8c2e6b913'
+branch_labels = None
+depends_on = None
+
+TABLES = [
+    'categories', 'menu_items', 'order_items', 'orders', 'payments',
+    'reservations', 'sales_reports', 'inventory',
+]
+
+
+def upgrade():
+    for table in TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        op.drop_column(table, 'version')
@@ -0,0 +1,28 @@
+"""payment external reference
+
+Revision ID: c3e8a1f5d2b9
+Revises: 9a4f2c7e1b36
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e8a1f5d2b9'
+down_revision = '9a4f2c7e1b36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('external_reference', sa.String(length=100), nullable=True))
+        batch_op.create_unique_constraint('uq_payments_external_reference', ['external_reference'])
+
+
+def downgrade():
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_payments_external_reference', type_='unique')
+        batch_op.drop_column('external_reference')
@@ -0,0 +1,28 @@
+"""reservation table locks
+
+Revision ID: e7b2d4a9c610
+Revises: c3e8a1f5d2b9
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b2d4a9c610'
+down_revision = 'c3e8a1f5d2b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('reservation_table_locks',
+        sa.Column('table_number', sa.Integer(), nullable=False),
+        sa.Column('locked_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('table_number')
+    )
+
+
+def downgrade():
+    op.drop_table('reservation_table_locks')
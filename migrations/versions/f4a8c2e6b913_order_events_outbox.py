@@ -0,0 +1,31 @@
+"""order events outbox
+
+Revision ID: f4a8c2e6b913
+Revises: e7b2d4a9c610
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4a8c2e6b913'
+down_revision = 'e7b2d4a9c610'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('order_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('event_type', sa.String(length=50), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('stations', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('order_events')
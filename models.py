@@ -1,18 +1,25 @@
 from datetime import datetime
 from decimal import Decimal
-from werkzeug.security import generate_password_hash, check_password_hash
 from sqlalchemy import (
-    Column, Integer, String, Boolean, DateTime, Text, Float, Numeric, Enum, ForeignKey, CheckConstraint, event
+    Column, Integer, String, Boolean, Date, DateTime, Text, Float, Numeric, Enum, ForeignKey, CheckConstraint, event, inspect
 )
-from sqlalchemy.orm import relationship, validates
-from sqlalchemy.sql import func
+from sqlalchemy.orm import Session, relationship, validates
+from sqlalchemy.sql import func, literal_column
 from database.db import db
+from utils.passwords import password_hasher
 
 ALLOWED_PAYMENT_STATUSES = ["unpaid", "paid", "failed", "refunded"]
 ALLOWED_ORDER_STATUSES = ["pending", "processing", "completed", "cancelled"]
 ALLOWED_RESERVATION_STATUSES = ["pending", "confirmed", "cancelled"]
 ALLOWED_INVENTORY_CHANGE_TYPES = ["IN", "OUT", "ADJUSTMENT"]
 
+def _version_column():
+    """Row version, raised by every ORM or Core UPDATE; ETags are built from it.
+
+    Upserts do not apply ``onupdate``, so they must bump it in ``extra_set``.
+    """
+    return Column(Integer, nullable=False, default=1, server_default="1", onupdate=literal_column("version") + 1)
+
 class User(db.Model):
     __tablename__ = "users"
     id = Column(Integer, primary_key=True)
@@ -30,10 +37,10 @@ class User(db.Model):
     reservations = relationship("Reservation", back_populates="user", cascade="all, delete-orphan", lazy="dynamic")
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
 
     def __repr__(self):
         return f"<User {self.username}>"
@@ -47,6 +54,7 @@ class MenuCategory(db.Model):
     is_deleted = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    version = _version_column()
 
     menu_items = relationship("MenuItem", back_populates="category", cascade="all, delete-orphan", lazy="dynamic")
 
@@ -72,6 +80,7 @@ class MenuItem(db.Model):
     order_items = relationship("OrderItem", back_populates="menu_item", lazy="select")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    version = _version_column()
 
     __table_args__ = (
         CheckConstraint("price >= 0", name="check_menuitem_price_positive"),
@@ -103,6 +112,7 @@ class OrderItem(db.Model):
     price = Column(Numeric(10,2), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    version = _version_column()
     order = relationship("Order", back_populates="items")
     menu_item = relationship("MenuItem", back_populates="order_items")
 
@@ -132,6 +142,7 @@ class Order(db.Model):
     total_price = Column(Numeric(12,2), default=Decimal("0.00"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    version = _version_column()
     items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan", lazy="select")
     payments = relationship("Payment", back_populates="order", cascade="all, delete-orphan", lazy="select")
     user = relationship("User", back_populates="orders")
@@ -141,16 +152,89 @@ class Order(db.Model):
         CheckConstraint("discount >= 0", name="check_order_discount_positive"),
         CheckConstraint("total_price >= 0", name="check_order_total_positive"),
         CheckConstraint("discount <= subtotal", name="check_discount_not_exceed_subtotal"),
+        db.Index("ix_orders_created_at_id", "created_at", "id"),
+        db.Index("ix_orders_status_created_at", "status", "created_at"),
+        db.Index("ix_orders_payment_status_created_at", "payment_status", "created_at"),
+        db.Index("ix_orders_service_type_created_at", "service_type", "created_at"),
+        db.Index("ix_orders_user_id_created_at", "user_id", "created_at"),
+        db.Index("ix_orders_updated_at", "updated_at"),
     )
 
     def calculate_totals(self):
+        """Recompute ``subtotal`` from every line; loads ``items``."""
         self.subtotal = sum([item.line_total() for item in self.items]) or Decimal("0.00")
-        self.total_price = max(self.subtotal - self.discount, Decimal("0.00"))
+        self.refresh_total()
+
+    def apply_item_delta(self, delta):
+        """Move ``subtotal`` by the line total of items added (positive) or removed (negative)."""
+        self.subtotal = (self.subtotal or Decimal("0.00")) + delta
+
+    def refresh_total(self):
+        self.total_price = max((self.subtotal or Decimal("0.00")) - (self.discount or Decimal("0.00")), Decimal("0.00"))
+
+
+def _changed(obj, *keys):
+    state = inspect(obj)
+    return any(state.attrs[key].history.has_changes() for key in keys)
+
+
+@event.listens_for(Session, "before_flush")
+def maintain_order_totals(session, flush_context, instances):
+    """Keep order totals in step with ORM changes to their lines, by delta.
+
+    Lines added, removed or re-priced through the session move their
+    order's subtotal by the difference; total_price is only recomputed
+    for orders whose subtotal or discount changed, so a status update
+    never loads ``items``. Bulk statements (``insert(OrderItem)``) bypass
+    the session and apply their delta with ``Order.apply_item_delta``.
+    """
+    def order_of(item):
+        order = item.order or session.get(Order, item.order_id)
+        return None if order is None or order in session.deleted else order
+
+    for item in session.new:
+        if isinstance(item, OrderItem) and (order := order_of(item)) is not None:
+            order.apply_item_delta(item.line_total())
+    for item in session.deleted:
+        if isinstance(item, OrderItem) and (order := order_of(item)) is not None:
+            state = inspect(item).committed_state
+            order.apply_item_delta(-state.get("quantity", item.quantity) * state.get("price", item.price))
+    for item in session.dirty:
+        if isinstance(item, OrderItem) and _changed(item, "quantity", "price") and (order := order_of(item)):
+            state = inspect(item).committed_state
+            order.apply_item_delta(
+                item.line_total() - state.get("quantity", item.quantity) * state.get("price", item.price)
+            )
+    for order in list(session.new) + list(session.dirty):
+        if isinstance(order, Order) and (order.total_price is None or _changed(order, "subtotal", "discount")):
+            order.refresh_total()
+
+class OrderNumberSequence(db.Model):
+    __tablename__ = "order_number_sequences"
+    seq_date = Column(Date, primary_key=True)
+    last_value = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<OrderNumberSequence {self.seq_date} @ {self.last_value}>"
+
+class ReservationTableLock(db.Model):
+    __tablename__ = "reservation_table_locks"
+    table_number = Column(Integer, primary_key=True)
+    locked_at = Column(DateTime(timezone=True), server_default=func.now())
 
-@event.listens_for(Order, "before_insert")
-@event.listens_for(Order, "before_update")
-def update_order_totals(mapper, connection, target):
-    target.calculate_totals()
+    def __repr__(self):
+        return f"<ReservationTableLock {self.table_number}>"
+
+class OrderEvent(db.Model):
+    __tablename__ = "order_events"
+    id = Column(Integer, primary_key=True)
+    event_type = Column(String(50), nullable=False)
+    payload = Column(Text, nullable=False)
+    stations = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<OrderEvent {self.id} {self.event_type}>"
 
 class Payment(db.Model):
     __tablename__ = "payments"
@@ -160,13 +244,19 @@ class Payment(db.Model):
     amount = Column(Numeric(12,2), nullable=False)
     payment_method = Column(String(50), nullable=False)
     status = Column(Enum(*ALLOWED_PAYMENT_STATUSES, name="payment_status_enum"), default="unpaid", nullable=False)
+    external_reference = Column(String(100), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    version = _version_column()
     order = relationship("Order", back_populates="payments")
     user = relationship("User", back_populates="payments")
 
     __table_args__ = (
         CheckConstraint("amount >= 0", name="check_payment_amount_positive"),
+        db.UniqueConstraint("external_reference", name="uq_payments_external_reference"),
+        db.Index("ix_payments_created_at_id", "created_at", "id"),
+        db.Index("ix_payments_status_created_at", "status", "created_at"),
+        db.Index("ix_payments_user_id_created_at", "user_id", "created_at"),
     )
 
     def __repr__(self):
@@ -181,10 +271,14 @@ class Reservation(db.Model):
     status = Column(Enum(*ALLOWED_RESERVATION_STATUSES, name="reservation_status_enum"), default="pending", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    version = _version_column()
     user = relationship("User", back_populates="reservations")
 
     __table_args__ = (
         CheckConstraint("table_number > 0", name="check_reservation_table_positive"),
+        db.Index("ix_reservations_created_at_id", "created_at", "id"),
+        db.Index("ix_reservations_status_created_at", "status", "created_at"),
+        db.Index("ix_reservations_table_time", "table_number", "reservation_time"),
     )
 
     @validates("table_number")
@@ -217,14 +311,17 @@ class SalesReport(db.Model):
     total_orders = Column(Integer, nullable=False, default=0)
     total_items_sold = Column(Integer, nullable=False, default=0)
     generated_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    refreshed_at = Column(DateTime(timezone=True), nullable=True)
     user = relationship("User", back_populates="sales_reports")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    version = _version_column()
 
     __table_args__ = (
         CheckConstraint("total_sales >= 0", name="check_sales_total_sales_non_negative"),
         CheckConstraint("total_orders >= 0", name="check_sales_total_orders_non_negative"),
         CheckConstraint("total_items_sold >= 0", name="check_sales_total_items_non_negative"),
+        db.Index("ix_sales_reports_report_date_id", "report_date", "id"),
     )
 
     def __repr__(self):
@@ -241,16 +338,37 @@ class Inventory(db.Model):
     last_restock_date = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    version = _version_column()
     logs = relationship("InventoryLog", back_populates="inventory_item", cascade="all, delete-orphan", lazy="select")
 
     __table_args__ = (
         CheckConstraint("stock_quantity >= 0", name="check_inventory_stock_positive"),
         CheckConstraint("threshold >= 0", name="check_inventory_threshold_positive"),
+        db.Index("ix_inventory_created_at_id", "created_at", "id"),
     )
 
     def __repr__(self):
         return f"<Inventory {self.item_name} | Stock {self.stock_quantity}>"
 
+class RecipeItem(db.Model):
+    __tablename__ = "recipe_items"
+    id = Column(Integer, primary_key=True)
+    menu_item_id = Column(Integer, ForeignKey("menu_items.id", ondelete="CASCADE"), nullable=False)
+    inventory_id = Column(Integer, ForeignKey("inventory.id", ondelete="CASCADE"), nullable=False, index=True)
+    quantity = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    menu_item = relationship("MenuItem")
+    inventory_item = relationship("Inventory")
+
+    __table_args__ = (
+        CheckConstraint("quantity > 0", name="check_recipeitem_quantity_positive"),
+        db.UniqueConstraint("menu_item_id", "inventory_id", name="uq_recipeitem_menu_inventory"),
+    )
+
+    def __repr__(self):
+        return f"<RecipeItem MenuItem {self.menu_item_id} | Inventory {self.inventory_id} x{self.quantity}>"
+
 class InventoryLog(db.Model):
     __tablename__ = "inventory_logs"
     id = Column(Integer, primary_key=True)
@@ -270,17 +388,3 @@ class InventoryLog(db.Model):
         if value not in ALLOWED_INVENTORY_CHANGE_TYPES:
             raise ValueError(f"change_type must be one of {ALLOWED_INVENTORY_CHANGE_TYPES}")
         return value
-
-@event.listens_for(InventoryLog, "before_insert")
-@event.listens_for(InventoryLog, "before_update")
-def update_inventory_stock(mapper, connection, target):
-    inv = target.inventory_item
-    if target.change_type == "IN":
-        inv.stock_quantity += target.quantity_changed
-    elif target.change_type == "OUT":
-        if inv.stock_quantity - target.quantity_changed < 0:
-            raise ValueError(f"Not enough stock for {inv.item_name}")
-        inv.stock_quantity -= target.quantity_changed
-    elif target.change_type == "ADJUSTMENT":
-        inv.stock_quantity = max(inv.stock_quantity + target.quantity_changed, 0)
-    inv.last_restock_date = datetime.utcnow()
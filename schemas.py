@@ -1,4 +1,5 @@
 from database.db import ma
+from utils.serialization import compile_dumper, register_dumper, Nested
 from decimal import Decimal
 from models import (
     User,
@@ -11,6 +12,7 @@ from models import (
     SalesReport,
     Inventory,
     InventoryLog,
+    RecipeItem,
 )
 
 class UserSchema(ma.SQLAlchemySchema):
@@ -70,6 +72,7 @@ class OrderItemSchema(ma.SQLAlchemySchema):
     quantity = ma.auto_field()
     price = ma.Method("get_price", "set_price")
     line_total = ma.Method("get_line_total", dump_only=True)
+    menu_item_name = ma.Method("get_menu_item_name", dump_only=True)
 
     def get_price(self, obj):
         return float(obj.price)
@@ -80,6 +83,9 @@ class OrderItemSchema(ma.SQLAlchemySchema):
     def get_line_total(self, obj):
         return float(obj.line_total())
 
+    def get_menu_item_name(self, obj):
+        return obj.menu_item.name if obj.menu_item else None
+
 
 
 class OrderSchema(ma.SQLAlchemySchema):
@@ -149,6 +155,7 @@ class SalesReportSchema(ma.SQLAlchemySchema):
     total_orders = ma.auto_field()
     total_items_sold = ma.auto_field()
     generated_by = ma.auto_field()
+    refreshed_at = ma.auto_field(dump_only=True)
     created_at = ma.auto_field(dump_only=True)
 
     def get_total_sales(self, obj):
@@ -183,6 +190,17 @@ class InventoryLogSchema(ma.SQLAlchemySchema):
     created_at = ma.auto_field(dump_only=True)
 
 
+class RecipeItemSchema(ma.SQLAlchemySchema):
+    class Meta:
+        model = RecipeItem
+        load_instance = True
+
+    id = ma.auto_field(dump_only=True)
+    menu_item_id = ma.auto_field(dump_only=True)
+    inventory_id = ma.auto_field(required=True)
+    quantity = ma.auto_field(required=True)
+
+
 user_schema = UserSchema()
 users_schema = UserSchema(many=True)
 
@@ -212,3 +230,66 @@ inventories_schema = InventorySchema(many=True)
 
 inventory_log_schema = InventoryLogSchema()
 inventory_logs_schema = InventoryLogSchema(many=True)
+
+recipe_item_schema = RecipeItemSchema()
+recipe_items_schema = RecipeItemSchema(many=True)
+
+
+user_dumper = register_dumper(User, compile_dumper({
+    "id": None, "username": None, "email": None, "role": None, "is_active": None, "created_at": None,
+}))
+
+category_dumper = register_dumper(MenuCategory, compile_dumper({
+    "id": None, "name": None, "description": None, "is_active": None, "created_at": None, "updated_at": None,
+}))
+
+menu_item_dumper = register_dumper(MenuItem, compile_dumper({
+    "id": None, "name": None, "description": None, "price": "decimal", "is_available": None,
+    "category_id": None, "created_at": None,
+}))
+
+order_item_dumper = register_dumper(OrderItem, compile_dumper({
+    "id": None, "menu_item_id": None, "quantity": None, "price": "decimal",
+    "line_total": lambda obj: float(obj.line_total()),
+    "menu_item_name": lambda obj: obj.menu_item.name if obj.menu_item else None,
+}))
+
+payment_dumper = register_dumper(Payment, compile_dumper({
+    "id": None, "order_id": None, "user_id": None, "amount": "decimal", "payment_method": None,
+    "status": None, "external_reference": None, "created_at": None,
+}))
+
+_ORDER_FIELDS = {
+    "id": None, "order_number": None, "status": None, "payment_status": None,
+    "subtotal": "decimal", "total_price": "decimal", "created_at": None,
+}
+order_dumper = register_dumper(Order, compile_dumper(_ORDER_FIELDS))
+order_detail_dumper = compile_dumper({
+    **_ORDER_FIELDS,
+    "payment_method": None, "service_type": None, "notes": None, "discount": "decimal",
+    "items": Nested(order_item_dumper, many=True), "payments": Nested(payment_dumper, many=True),
+})
+
+reservation_dumper = register_dumper(Reservation, compile_dumper({
+    "id": None, "user_id": None, "table_number": None, "reservation_time": None, "status": None,
+    "created_at": None,
+}))
+
+sales_report_dumper = register_dumper(SalesReport, compile_dumper({
+    "id": None, "report_date": None, "total_sales": "decimal", "total_orders": None,
+    "total_items_sold": None, "generated_by": None, "refreshed_at": None, "created_at": None,
+}))
+
+inventory_dumper = register_dumper(Inventory, compile_dumper({
+    "id": None, "item_name": None, "stock_quantity": None, "unit": None, "threshold": None,
+    "supplier": None, "last_restock_date": None,
+}))
+
+inventory_log_dumper = register_dumper(InventoryLog, compile_dumper({
+    "id": None, "inventory_id": None, "change_type": None, "quantity_changed": None, "note": None,
+    "created_at": None,
+}))
+
+recipe_item_dumper = register_dumper(RecipeItem, compile_dumper({
+    "id": None, "menu_item_id": None, "inventory_id": None, "quantity": None,
+}))
@@ -1,14 +1,69 @@
 from models import (
-    User, MenuItem, MenuCategory, Order, OrderItem, Payment,
-    Reservation, SalesReport, Inventory, InventoryLog
+    ALLOWED_ORDER_STATUSES, User, MenuItem, MenuCategory, Order, OrderItem, Payment,
+    Reservation, ReservationTableLock, SalesReport, Inventory, InventoryLog, RecipeItem, OrderNumberSequence
 )
-from database.db import db
-from utils.response import success_response, error_response
+from database.db import db, upsert, read_only
+from schemas import category_dumper, menu_item_dumper, order_dumper
+from utils.cache import catalog_cache, user_access_cache, reservation_cache, login_failures, dashboard_cache
+from utils.events import order_events
+from utils.pagination import keyset_page
+from utils.passwords import password_hasher
+from utils.response import success_response, error_response, row_validators
+from validations import validate_menu_import_row, validate_payment_import_row
+from flask import current_app
 from flask_jwt_extended import create_access_token
-from datetime import timedelta, datetime
+from datetime import timedelta, datetime, date
 from decimal import Decimal
-import random, string
-from sqlalchemy.exc import SQLAlchemyError
+import os
+import re
+import threading
+import unicodedata
+from bisect import bisect_right
+from sqlalchemy import insert, delete, update, select, func, case, or_
+from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+
+def _apply_list_filters(query, model, params, sort_column=None):
+    sort_column = model.created_at if sort_column is None else sort_column
+    query = query.filter(*[getattr(model, field) == value for field, value in params["filters"].items()])
+    if params["date_from"]:
+        query = query.filter(sort_column >= params["date_from"])
+    if params["date_to"]:
+        query = query.filter(sort_column < params["date_to"])
+    return query
+
+def _list_page(model, params, sort_column=None, options=()):
+    sort_column = model.created_at if sort_column is None else sort_column
+    query = _apply_list_filters(model.query.options(*options), model, params, sort_column)
+    return keyset_page(query, sort_column, model.id, params["limit"], params["cursor"])
+
+def _collection_version(query, model):
+    """``(count, max(id), sum(version), max(updated_at))`` for ``query`` in one aggregate statement."""
+    return tuple(query.with_entities(
+        func.count(model.id), func.max(model.id), func.sum(model.version), func.max(model.updated_at)
+    ).order_by(None).one())
+
+def _cached_collection(key, query, dumper):
+    """``(items, etag, last_modified)`` for a catalog listing, loaded and cached as one entry.
+
+    The validators come from the versions of the rows that were dumped, so
+    a response can never pair one load's body with another load's ETag.
+    """
+    def load():
+        rows = query.all()
+        return ([dumper(row) for row in rows], *row_validators(*rows))
+
+    payload, _ = catalog_cache.get_or_load(
+        key, load, ttl=current_app.config.get("CATALOG_CACHE_TTL"), with_etag=False
+    )
+    return payload
+
+_UNIQUE_USER_KEY = re.compile(
+    r"^unique constraint failed: users\.(email|username)$"  # SQLite
+    r"|^duplicate key value violates unique constraint \"users_(email|username)_key\""  # PostgreSQL
+    r"|.*for key '(?:users\.)?(email|username)'",  # MySQL; greedy, so the last "for key"
+    re.DOTALL,
+)
 
 class AuthService:
 
@@ -19,11 +74,12 @@ class AuthService:
         password = (password or "").strip()
         role = (role or "user").strip()
 
-        if User.query.filter_by(email=email).first():
-            return None, error_response("Email already exists", 400)
-
-        if User.query.filter_by(username=username).first():
-            return None, error_response("Username already exists", 400)
+        if current_app.config.get("REGISTER_PRECHECK"):
+            taken = db.session.query(User.email, User.username).filter(
+                or_(User.email == email, User.username == username)
+            ).first()
+            if taken:
+                return None, AuthService._duplicate_user_error("email" if taken.email == email else "username")
 
         new_user = User(username=username, email=email, role=role, is_active=True)
         new_user.set_password(password)
@@ -32,26 +88,70 @@ class AuthService:
             db.session.add(new_user)
             db.session.commit()
             return new_user, None
+        except IntegrityError as e:
+            db.session.rollback()
+            # Match the key name, not the duplicated value: "users.email" (SQLite, MySQL 8),
+            # "key 'email'" (MySQL 5.7), "users_email_key" (PostgreSQL).
+            key = _UNIQUE_USER_KEY.search(str(e.orig).lower())
+            return None, AuthService._duplicate_user_error(key.group(key.lastindex) if key else None)
         except SQLAlchemyError as e:
             db.session.rollback()
             return None, error_response(f"Database error: {str(e)}", 500)
 
+    @staticmethod
+    def _duplicate_user_error(field):
+        """Map the unique key a signup collided with to its 400 message."""
+        if field == "email":
+            return error_response("Email already exists", 400)
+        if field == "username":
+            return error_response("Username already exists", 400)
+        return error_response("User already exists", 400)
+
     @staticmethod
     def authenticate_user(email, password):
+        throttle_key = email.strip().lower()
+        max_failures = current_app.config.get("LOGIN_MAX_FAILURES", 5)
+        if (login_failures.get(throttle_key) or 0) >= max_failures:
+            return None, error_response("Too many failed login attempts, try again later", 429)
+
         user = User.query.filter_by(email=email).first()
         if not user or not user.check_password(password):
+            login_failures.increment(throttle_key)
             return None, error_response("Invalid credentials", 401)
+        login_failures.delete(throttle_key)
+
+        if password_hasher.needs_rehash(user.password_hash):
+            user.set_password(password)
+            try:
+                db.session.commit()
+            except SQLAlchemyError as e:
+                db.session.rollback()
+                current_app.logger.warning(f"Password rehash failed for user {user.id}: {e}")
 
         access_token = create_access_token(identity=str(user.id), expires_delta=timedelta(hours=12))
         return {"access_token": access_token, "user": user}, None
 
     @staticmethod
+    @read_only
     def get_user_by_id(user_id):
         user = User.query.get(user_id)
         if not user:
             return None, error_response("User not found", 404)
         return user, None
 
+    @staticmethod
+    def get_user_access(user_id):
+        """Return a cached ``(role, is_active)`` snapshot for ``user_id``, or ``None``."""
+        access = user_access_cache.get(user_id)
+        if access is not None:
+            return access
+        row = db.session.query(User.role, User.is_active).filter(User.id == user_id).first()
+        if row is None:
+            return None
+        access = (row.role, row.is_active)
+        user_access_cache.set(user_id, access, ttl=current_app.config.get("USER_CACHE_TTL"))
+        return access
+
     @staticmethod
     def update_password(user_id, old_password, new_password):
         user = User.query.get(user_id)
@@ -77,6 +177,7 @@ class AuthService:
         user.role = new_role
         try:
             db.session.commit()
+            user_access_cache.delete(user.id)
             return user, None
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -90,6 +191,7 @@ class AuthService:
         user.is_active = False
         try:
             db.session.commit()
+            user_access_cache.delete(user.id)
             return user, None
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -103,6 +205,7 @@ class AuthService:
         user.is_active = True
         try:
             db.session.commit()
+            user_access_cache.delete(user.id)
             return user, None
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -117,29 +220,36 @@ class MenuCategoryService:
     @staticmethod
     def create_category(data):
         category = MenuCategory(
-            name=data["name"].strip(),
+            name=data["name"],
             description=data.get("description"),
             is_active=data.get("is_active", True)
         )
         try:
             db.session.add(category)
             db.session.commit()
+            catalog_cache.invalidate()
             return category, None
         except SQLAlchemyError as e:
             db.session.rollback()
             return None, error_response(str(e), 500)
 
     @staticmethod
+    @read_only
     def get_all_categories():
         return MenuCategoryService._active_query().all()
 
     @staticmethod
+    def get_all_categories_cached():
+        return _cached_collection("categories", MenuCategoryService._active_query(), category_dumper)
+
+    @staticmethod
+    @read_only
     def get_category_by_id(category_id):
         return MenuCategoryService._active_query().filter_by(id=category_id).first()
 
     @staticmethod
     def update_category(category_id, data):
-        category = MenuCategoryService.get_category_by_id(category_id)
+        category = MenuCategoryService._active_query().filter_by(id=category_id).first()
         if not category:
             return None, error_response("Category not found", 404)
         for key in ["name", "description", "is_active"]:
@@ -147,6 +257,7 @@ class MenuCategoryService:
                 setattr(category, key, data[key])
         try:
             db.session.commit()
+            catalog_cache.invalidate()
             return category, None
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -154,12 +265,13 @@ class MenuCategoryService:
 
     @staticmethod
     def delete_category(category_id):
-        category = MenuCategoryService.get_category_by_id(category_id)
+        category = MenuCategoryService._active_query().filter_by(id=category_id).first()
         if not category:
             return None, error_response("Category not found", 404)
         category.is_deleted = True
         try:
             db.session.commit()
+            catalog_cache.invalidate()
             return category, None
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -177,31 +289,38 @@ class MenuService:
         if not category:
             return None, error_response("Category not found", 404)
         menu_item = MenuItem(
-            name=data["name"].strip(),
+            name=data["name"],
             description=data.get("description"),
-            price=Decimal(data["price"]),
+            price=data["price"],
             is_available=data.get("is_available", True),
             category_id=data["category_id"]
         )
         try:
             db.session.add(menu_item)
             db.session.commit()
+            catalog_cache.invalidate()
             return menu_item, None
         except SQLAlchemyError as e:
             db.session.rollback()
             return None, error_response(str(e), 500)
 
     @staticmethod
+    @read_only
     def get_menu_by_id(menu_id):
         return MenuService._active_query().filter_by(id=menu_id).first()
 
     @staticmethod
+    @read_only
     def get_all_menus():
         return MenuService._active_query().all()
 
+    @staticmethod
+    def get_all_menus_cached():
+        return _cached_collection("menu", MenuService._active_query(), menu_item_dumper)
+
     @staticmethod
     def update_menu(menu_id, data):
-        menu_item = MenuService.get_menu_by_id(menu_id)
+        menu_item = MenuService._active_query().filter_by(id=menu_id).first()
         if not menu_item:
             return None, error_response("Menu item not found", 404)
         if "category_id" in data:
@@ -210,12 +329,10 @@ class MenuService:
                 return None, error_response("Category not found", 404)
         for key in ["name", "description", "price", "is_available", "category_id"]:
             if key in data:
-                if key == "price":
-                    setattr(menu_item, key, Decimal(data[key]))
-                else:
-                    setattr(menu_item, key, data[key])
+                setattr(menu_item, key, data[key])
         try:
             db.session.commit()
+            catalog_cache.invalidate()
             return menu_item, None
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -223,17 +340,186 @@ class MenuService:
 
     @staticmethod
     def delete_menu(menu_id):
-        menu_item = MenuService.get_menu_by_id(menu_id)
+        menu_item = MenuService._active_query().filter_by(id=menu_id).first()
         if not menu_item:
             return None, error_response("Menu item not found", 404)
         menu_item.is_deleted = True
         try:
             db.session.commit()
+            catalog_cache.invalidate()
             return menu_item, None
         except SQLAlchemyError as e:
             db.session.rollback()
             return None, error_response(str(e), 500)
 
+def _category_key(name):
+    """Fold ``name`` the way MySQL's default collation compares it: case, accents and trailing spaces ignored."""
+    text = unicodedata.normalize("NFKD", name.rstrip()).casefold()
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+class MenuImportService:
+
+    FIELDS = ["category", "category_description", "name", "description", "price", "is_available"]
+    MAX_REPORTED_ERRORS = 1000
+
+    @staticmethod
+    def _write_chunk(rows, category_ids, report):
+        """Upsert one chunk of validated ``(line_number, row)`` pairs; returns how many items were written.
+
+        The category lookup after the upsert can return a stored name that
+        differs from the file's in case or accents, since MySQL's default
+        collation matches them; such names resolve through
+        ``_category_key``.
+        """
+        new_categories = {}
+        for _, row in rows:
+            if row["category"] not in category_ids:
+                new_categories.setdefault(row["category"], row["category_description"])
+        if new_categories:
+            db.session.execute(upsert(
+                MenuCategory,
+                [
+                    {"name": name, "description": description, "is_active": True, "is_deleted": False}
+                    for name, description in new_categories.items()
+                ],
+                ["name"],
+                ["is_deleted"],
+                extra_set={"updated_at": func.now(), "version": MenuCategory.version + 1}
+            ))
+            found = db.session.query(MenuCategory.name, MenuCategory.id).filter(
+                MenuCategory.name.in_(list(new_categories))
+            ).all()
+            exact = dict(found)
+            folded = {_category_key(name): category_id for name, category_id in found}
+            for name in new_categories:
+                category_id = exact.get(name) or folded.get(_category_key(name))
+                if category_id is not None:
+                    category_ids[name] = category_id
+
+        menu_rows = {}
+        for line_number, row in rows:
+            category_id = category_ids.get(row["category"])
+            if category_id is None:
+                report(line_number, {"category": f"Category {row['category']!r} could not be matched"})
+                continue
+            menu_rows[(row["name"], category_id)] = {
+                "name": row["name"],
+                "description": row["description"],
+                "price": row["price"],
+                "is_available": row["is_available"],
+                "is_deleted": False,
+                "category_id": category_id
+            }
+        if menu_rows:
+            db.session.execute(upsert(
+                MenuItem,
+                list(menu_rows.values()),
+                ["name", "category_id"],
+                ["description", "price", "is_available", "is_deleted"],
+                extra_set={"updated_at": func.now(), "version": MenuItem.version + 1}
+            ))
+        db.session.commit()
+        return len(menu_rows)
+
+    @staticmethod
+    def import_rows(rows, chunk_size=1000):
+        """Validate and upsert ``(line_number, row)`` pairs in chunks.
+
+        Each chunk costs one category upsert, one category id lookup and
+        one menu item upsert against ``uq_menuitem_name_category``, then
+        commits. Invalid rows are skipped and reported by line number.
+        """
+        summary = {"processed": 0, "imported": 0, "failed": 0, "errors": []}
+        category_ids = {}
+        chunk = []
+
+        def report(line_number, errors):
+            summary["failed"] += 1
+            if len(summary["errors"]) < MenuImportService.MAX_REPORTED_ERRORS:
+                summary["errors"].append({"line": line_number, "errors": errors})
+
+        try:
+            for line_number, row in rows:
+                summary["processed"] += 1
+                if row is None:
+                    report(line_number, {"row": "Malformed row"})
+                    continue
+                clean, errors = validate_menu_import_row(row)
+                if errors:
+                    report(line_number, errors)
+                    continue
+                chunk.append((line_number, clean))
+                if len(chunk) >= chunk_size:
+                    summary["imported"] += MenuImportService._write_chunk(chunk, category_ids, report)
+                    chunk = []
+            if chunk:
+                summary["imported"] += MenuImportService._write_chunk(chunk, category_ids, report)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            return None, error_response(str(e), 500)
+        finally:
+            if summary["imported"]:
+                catalog_cache.invalidate()
+
+        summary["errors"].sort(key=lambda failure: failure["line"])
+        return summary, None
+
+    @staticmethod
+    def export_rows(batch_size=1000):
+        query = db.session.query(
+            MenuCategory.name, MenuCategory.description,
+            MenuItem.name, MenuItem.description, MenuItem.price, MenuItem.is_available
+        ).join(MenuItem.category).filter(
+            MenuItem.is_deleted.is_(False), MenuCategory.is_deleted.is_(False)
+        ).order_by(MenuItem.id).execution_options(yield_per=batch_size)
+        for row in query:
+            yield dict(zip(MenuImportService.FIELDS, row))
+
+class OrderNumberAllocator:
+    """Hands out per-day order numbers like ``261018-000042``.
+
+    Each process reserves a block of ``ORDER_NUMBER_BLOCK_SIZE`` values from
+    the day's row in ``order_number_sequences`` with a single upsert in its
+    own short transaction, then issues them from memory. Numbers never
+    repeat across workers and grow monotonically, so inserts land at the
+    right edge of the ``order_number`` index. Unused values of a block are
+    skipped when the process exits or the day rolls over.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._day = None
+        self._next = 0
+        self._end = 0
+
+    def _reserve_block(self, day, size):
+        stmt = upsert(
+            OrderNumberSequence, [{"seq_date": day, "last_value": size}], ["seq_date"], [],
+            extra_set={"last_value": OrderNumberSequence.last_value + size}
+        )
+        with db.engine.begin() as conn:
+            conn.execute(stmt)
+            last_value = conn.execute(
+                select(OrderNumberSequence.last_value).where(OrderNumberSequence.seq_date == day)
+            ).scalar_one()
+        return last_value - size + 1, last_value + 1
+
+    def next_number(self):
+        day = datetime.utcnow().date()
+        with self._lock:
+            if self._pid != os.getpid() or self._day != day or self._next >= self._end:
+                size = max(1, current_app.config.get("ORDER_NUMBER_BLOCK_SIZE", 20))
+                self._next, self._end = self._reserve_block(day, size)
+                self._pid, self._day = os.getpid(), day
+            value = self._next
+            self._next += 1
+        return f"{day:%y%m%d}-{value:06d}"
+
+
+order_number_allocator = OrderNumberAllocator()
+
+
 class OrderService:
 
     @staticmethod
@@ -241,35 +527,101 @@ class OrderService:
         return Order.query
 
     @staticmethod
-    def _generate_order_number(length=8):
-        return ''.join(random.choices(string.ascii_uppercase + string.digits, k=length))
+    def _generate_order_number():
+        return order_number_allocator.next_number()
+
+    @staticmethod
+    def _load_menu_items(items_data):
+        menu_item_ids = {item_data["menu_item_id"] for item_data in items_data}
+        if not menu_item_ids:
+            return {}, None
+        menu_items = MenuItem.query.filter(MenuItem.id.in_(menu_item_ids)).all()
+        menu_map = {menu_item.id: menu_item for menu_item in menu_items}
+        missing = sorted(menu_item_ids - menu_map.keys())
+        if missing:
+            return None, error_response(f"Menu item not found: {missing}", 404)
+        return menu_map, None
+
+    @staticmethod
+    def _order_item_rows(items_data, menu_map):
+        """Build the order_items rows for ``items_data`` and return them with their line total."""
+        rows = []
+        for item_data in items_data:
+            menu_item = menu_map[item_data["menu_item_id"]]
+            rows.append({
+                "menu_item_id": menu_item.id,
+                "quantity": item_data.get("quantity", 1),
+                "price": item_data.get("price", menu_item.price)
+            })
+        return rows, sum((row["quantity"] * row["price"] for row in rows), Decimal("0.00"))
+
+    @staticmethod
+    def _insert_order_items(order, rows):
+        if rows:
+            db.session.execute(insert(OrderItem), [dict(row, order_id=order.id) for row in rows])
+        db.session.expire(order, ["items"])
+
+    @staticmethod
+    def _order_stations(order_id):
+        rows = db.session.query(MenuItem.category_id).join(
+            OrderItem, OrderItem.menu_item_id == MenuItem.id
+        ).filter(OrderItem.order_id == order_id).distinct().all()
+        return {category_id for category_id, in rows}
+
+    @staticmethod
+    def _order_event(order, items_data=None, menu_map=None):
+        """``(payload, stations)`` for a kitchen feed event about ``order``, as plain values.
+
+        Publish it after the last flush and before ``commit()``: the event
+        is written in the order's transaction, and the commit expires
+        ``order`` and the menu items, so reading them afterwards would
+        reload each one. Stations are the menu category ids touched.
+        """
+        payload = order_dumper(order)
+        payload.update(service_type=order.service_type, notes=order.notes)
+        if menu_map is None:
+            return payload, OrderService._order_stations(order.id)
+        payload["items"] = []
+        for item_data in items_data:
+            menu_item = menu_map[item_data["menu_item_id"]]
+            payload["items"].append({
+                "menu_item_id": menu_item.id,
+                "name": menu_item.name,
+                "category_id": menu_item.category_id,
+                "quantity": item_data.get("quantity", 1)
+            })
+        return payload, {menu_item.category_id for menu_item in menu_map.values()}
 
     @staticmethod
     def create_order(data):
+        items_data = data.get("items", [])
+        menu_map, error = OrderService._load_menu_items(items_data)
+        if error:
+            return None, error
+        rows, lines_total = OrderService._order_item_rows(items_data, menu_map)
+        discount = data.get("discount") or Decimal("0.00")
+        if discount > lines_total:
+            return None, error_response("Discount cannot exceed the order subtotal", 400)
+        try:
+            order_number = OrderService._generate_order_number()
+        except SQLAlchemyError as e:
+            return None, error_response(str(e), 500)
         order = Order(
             user_id=data["user_id"],
-            order_number=OrderService._generate_order_number(),
+            order_number=order_number,
             status=data.get("status", "pending"),
             payment_status=data.get("payment_status", "unpaid"),
             payment_method=data.get("payment_method", "cash"),
             service_type=data.get("service_type", "dine_in"),
             notes=data.get("notes"),
-            discount=float(data.get("discount", 0.0))
+            subtotal=lines_total,
+            discount=discount
         )
         try:
             db.session.add(order)
             db.session.flush()
-            for item_data in data.get("items", []):
-                menu_item = MenuItem.query.get(item_data["menu_item_id"])
-                order_item = OrderItem(
-                    order_id=order.id,
-                    menu_item_id=menu_item.id,
-                    quantity=int(item_data.get("quantity", 1)),
-                    price=float(item_data.get("price", menu_item.price))
-                )
-                db.session.add(order_item)
-            db.session.flush()
-            order.calculate_totals()
+            OrderService._insert_order_items(order, rows)
+            order_events.publish("order.created", *OrderService._order_event(order, items_data, menu_map))
             db.session.commit()
             return order, None
         except SQLAlchemyError as e:
@@ -277,42 +629,132 @@ class OrderService:
             return None, error_response(str(e), 500)
 
     @staticmethod
+    @read_only
     def get_order_by_id(order_id):
         return Order.query.get(order_id)
 
     @staticmethod
+    @read_only
     def get_all_orders():
         return Order.query.all()
 
+    @staticmethod
+    @read_only
+    def list_orders(params):
+        return _list_page(Order, params)
+
+    EXPORT_FIELDS = [
+        "order_id", "order_number", "created_at", "user_id", "status", "payment_status",
+        "payment_method", "service_type", "subtotal", "discount", "total_price",
+        "order_item_id", "menu_item_id", "menu_item_name", "quantity", "price", "line_total"
+    ]
+
+    @staticmethod
+    def export_rows(params, batch_size=1000):
+        """Yield one dict per order line (orders without lines yield one row).
+
+        Rows are read with ``yield_per``, which streams through a server-side
+        cursor on MySQL, so memory stays flat however many orders match.
+        """
+        query = db.session.query(
+            Order.id, Order.order_number, Order.created_at, Order.user_id, Order.status,
+            Order.payment_status, Order.payment_method, Order.service_type,
+            Order.subtotal, Order.discount, Order.total_price,
+            OrderItem.id, OrderItem.menu_item_id, MenuItem.name, OrderItem.quantity, OrderItem.price,
+            (OrderItem.quantity * OrderItem.price)
+        ).outerjoin(OrderItem, OrderItem.order_id == Order.id).outerjoin(
+            MenuItem, MenuItem.id == OrderItem.menu_item_id
+        )
+        query = _apply_list_filters(query, Order, params)
+        query = query.order_by(Order.id, OrderItem.id).execution_options(yield_per=batch_size)
+        for row in query:
+            yield dict(zip(OrderService.EXPORT_FIELDS, row))
+
+    @staticmethod
+    def _detail_options():
+        return (
+            selectinload(Order.items).joinedload(OrderItem.menu_item),
+            selectinload(Order.payments),
+        )
+
+    @staticmethod
+    @read_only
+    def get_order_detail(order_id):
+        return Order.query.options(*OrderService._detail_options()).filter_by(id=order_id).first()
+
+    @staticmethod
+    @read_only
+    def list_order_details(params):
+        return _list_page(Order, params, options=OrderService._detail_options())
+
     @staticmethod
     def update_order(order_id, data):
         order = Order.query.get(order_id)
         if not order:
             return None, error_response("Order not found", 404)
-        for key in ["status", "payment_status", "payment_method", "service_type", "notes", "discount"]:
-            if key in data:
-                setattr(order, key, data[key])
-        if "items" in data:
-            order.items.clear()
-            db.session.flush()
-            for item_data in data["items"]:
-                menu_item = MenuItem.query.get(item_data["menu_item_id"])
-                order_item = OrderItem(
-                    order_id=order.id,
-                    menu_item_id=menu_item.id,
-                    quantity=int(item_data.get("quantity", 1)),
-                    price=float(item_data.get("price", menu_item.price))
-                )
-                db.session.add(order_item)
+        menu_map = None
+        if data.get("items") is not None:
+            menu_map, error = OrderService._load_menu_items(data["items"])
+            if error:
+                return None, error
+            rows, lines_total = OrderService._order_item_rows(data["items"], menu_map)
+        subtotal = lines_total if menu_map is not None else order.subtotal
+        discount = order.discount if data.get("discount") is None else data["discount"]
+        if discount > subtotal:
+            return None, error_response("Discount cannot exceed the order subtotal", 400)
         try:
+            if menu_map is not None:
+                db.session.execute(delete(OrderItem).where(OrderItem.order_id == order.id))
+                OrderService._insert_order_items(order, rows)
+                order.apply_item_delta(lines_total - order.subtotal)
+            previous_status = order.status
+            for key in ["status", "payment_status", "payment_method", "service_type", "notes"]:
+                if key in data:
+                    setattr(order, key, data[key])
+            if "discount" in data:
+                order.discount = discount
+            if order.status == "completed" and previous_status != "completed":
+                error = InventoryService.deplete_for_order(order)
+                if error:
+                    db.session.rollback()
+                    return None, error
             db.session.flush()
-            order.calculate_totals()
+            order_events.publish("order.updated", *OrderService._order_event(order, data.get("items"), menu_map))
             db.session.commit()
             return order, None
         except SQLAlchemyError as e:
             db.session.rollback()
             return None, error_response(str(e), 500)
 
+    @staticmethod
+    def repair_totals():
+        """Recompute every order's totals from its lines in one UPDATE; returns how many drifted.
+
+        Only rows whose stored subtotal or total differ from the aggregate
+        are written. A discount larger than the recomputed subtotal is
+        capped to it, as the CHECK constraint requires.
+        """
+        lines_total = func.coalesce(
+            select(func.sum(OrderItem.quantity * OrderItem.price))
+            .where(OrderItem.order_id == Order.id)
+            .scalar_subquery(),
+            0
+        )
+        discount = case((Order.discount > lines_total, lines_total), else_=Order.discount)
+        total = case((lines_total > discount, lines_total - discount), else_=0)
+        stmt = update(Order).where(
+            (Order.subtotal != lines_total) | (Order.total_price != total)
+        ).values(
+            subtotal=lines_total, discount=discount, total_price=total
+        ).execution_options(synchronize_session=False)
+        try:
+            repaired = db.session.execute(stmt).rowcount
+            db.session.commit()
+            return {"orders_repaired": repaired}, None
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            return None, error_response(str(e), 500)
+
     @staticmethod
     def delete_order(order_id):
         order = Order.query.get(order_id)
@@ -337,7 +779,7 @@ class PaymentService:
         payment = Payment(
             order_id=data["order_id"],
             user_id=data["user_id"],
-            amount=float(data.get("amount")),
+            amount=data.get("amount"),
             payment_method=data.get("payment_method", "cash"),
             status=data.get("status", "unpaid")
         )
@@ -345,6 +787,13 @@ class PaymentService:
             db.session.add(payment)
             order = Order.query.get(payment.order_id)
             order.payment_status = payment.status
+            db.session.flush()
+            order_events.publish("payment.created", {
+                "order_id": payment.order_id,
+                "payment_id": payment.id,
+                "status": payment.status,
+                "payment_status": order.payment_status
+            })
             db.session.commit()
             return payment, None
         except SQLAlchemyError as e:
@@ -352,13 +801,36 @@ class PaymentService:
             return None, error_response(str(e), 500)
 
     @staticmethod
+    @read_only
     def get_payment_by_id(payment_id):
         return Payment.query.get(payment_id)
 
     @staticmethod
+    @read_only
     def get_all_payments():
         return Payment.query.all()
 
+    @staticmethod
+    @read_only
+    def list_payments(params):
+        return _list_page(Payment, params)
+
+    EXPORT_FIELDS = [
+        "payment_id", "created_at", "order_id", "order_number", "order_total",
+        "user_id", "amount", "payment_method", "status"
+    ]
+
+    @staticmethod
+    def export_rows(params, batch_size=1000):
+        query = db.session.query(
+            Payment.id, Payment.created_at, Payment.order_id, Order.order_number, Order.total_price,
+            Payment.user_id, Payment.amount, Payment.payment_method, Payment.status
+        ).join(Order, Order.id == Payment.order_id)
+        query = _apply_list_filters(query, Payment, params)
+        query = query.order_by(Payment.id).execution_options(yield_per=batch_size)
+        for row in query:
+            yield dict(zip(PaymentService.EXPORT_FIELDS, row))
+
     @staticmethod
     def update_payment(payment_id, data):
         payment = Payment.query.get(payment_id)
@@ -386,41 +858,253 @@ class PaymentService:
         except SQLAlchemyError as e:
             db.session.rollback()
             return None, error_response(str(e), 500)
-        
+
+class PaymentImportService:
+
+    FIELDS = ["external_reference", "order_id", "amount", "payment_method", "status"]
+    MAX_REPORTED_ERRORS = 1000
+
+    @staticmethod
+    def _write_chunk(rows, report):
+        """Insert one chunk of validated lines; returns ``(imported, already_imported)``.
+
+        Two reads (known references, order owners) and one multi-row
+        INSERT for the whole chunk, then one UPDATE per payment status for the
+        orders it touches. The insert is an upsert on
+        ``uq_payments_external_reference`` that changes nothing, so a
+        concurrent run of the same file cannot duplicate a payment.
+        """
+        unique = {}
+        for line_number, row in rows:
+            if row["external_reference"] in unique:
+                report(line_number, {"external_reference": "Duplicate external reference in file"})
+            else:
+                unique[row["external_reference"]] = (line_number, row)
+
+        known = set(db.session.scalars(
+            select(Payment.external_reference).where(Payment.external_reference.in_(list(unique)))
+        ))
+        order_ids = {row["order_id"] for _, row in unique.values()}
+        order_users = dict(db.session.execute(
+            select(Order.id, Order.user_id).where(Order.id.in_(order_ids))
+        ).all())
+
+        payments, order_status = [], {}
+        for reference, (line_number, row) in unique.items():
+            if reference in known:
+                continue
+            user_id = order_users.get(row["order_id"])
+            if user_id is None:
+                report(line_number, {"order_id": f"Order {row['order_id']} not found"})
+                continue
+            payments.append(dict(row, user_id=user_id))
+            order_status[row["order_id"]] = row["status"]
+
+        if payments:
+            db.session.execute(upsert(Payment, payments, ["external_reference"], ["external_reference"]))
+            by_status = {}
+            for order_id, status in order_status.items():
+                by_status.setdefault(status, []).append(order_id)
+            for status, ids in by_status.items():
+                db.session.execute(
+                    update(Order).where(Order.id.in_(ids)).values(payment_status=status)
+                    .execution_options(synchronize_session=False)
+                )
+        db.session.commit()
+        return len(payments), len(known)
+
+    @staticmethod
+    def import_rows(rows, chunk_size=1000):
+        """Validate and insert settlement ``(line_number, row)`` pairs in chunks.
+
+        Lines whose ``external_reference`` is already stored are counted as
+        ``already_imported`` and skipped, so re-running a file is safe.
+        Invalid lines are skipped and reported by their 1-based line number
+        in the file, in line order.
+        """
+        summary = {"processed": 0, "imported": 0, "already_imported": 0, "failed": 0, "errors": []}
+        chunk = []
+
+        def report(line_number, errors):
+            summary["failed"] += 1
+            if len(summary["errors"]) < PaymentImportService.MAX_REPORTED_ERRORS:
+                summary["errors"].append({"line": line_number, "errors": errors})
+
+        def flush():
+            imported, known = PaymentImportService._write_chunk(chunk, report)
+            summary["imported"] += imported
+            summary["already_imported"] += known
+
+        try:
+            for line_number, row in rows:
+                summary["processed"] += 1
+                if row is None:
+                    report(line_number, {"row": "Malformed row"})
+                    continue
+                clean, errors = validate_payment_import_row(row)
+                if errors:
+                    report(line_number, errors)
+                    continue
+                chunk.append((line_number, clean))
+                if len(chunk) >= chunk_size:
+                    flush()
+                    chunk = []
+            if chunk:
+                flush()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            return None, error_response(str(e), 500)
+
+        summary["errors"].sort(key=lambda failure: failure["line"])
+        return summary, None
+
 class ReservationService:
 
     @staticmethod
     def _active_query():
         return Reservation.query
 
+    @staticmethod
+    def _seating_duration():
+        return timedelta(minutes=current_app.config.get("RESERVATION_SEATING_MINUTES", 90))
+
+    @staticmethod
+    def _tables():
+        """``{table_number: seats}``, parsed and checked from ``RESTAURANT_TABLES`` when the config loads."""
+        return current_app.config.get("RESTAURANT_TABLES", {})
+
+    @staticmethod
+    def _lock_table(table_number):
+        """Hold ``table_number`` for this transaction so its bookings are checked one at a time.
+
+        Upserting the table's guard row takes that row's lock (the write
+        lock on SQLite) until commit or rollback. A concurrent booking of
+        the same table waits here and then sees this one in its conflict
+        check, even when the window held no rows to lock beforehand.
+        """
+        db.session.execute(upsert(
+            ReservationTableLock, [{"table_number": table_number}], ["table_number"], [],
+            extra_set={"locked_at": func.now()}
+        ))
+
+    @staticmethod
+    def _find_conflict(table_number, reservation_time, exclude_id=None):
+        """First live booking of ``table_number`` within a seating of ``reservation_time``.
+
+        A locking read: on MySQL's REPEATABLE READ a plain SELECT would see
+        the snapshot taken by this transaction's first read, which may
+        predate a booking committed while it waited in ``_lock_table``.
+        """
+        duration = ReservationService._seating_duration()
+        query = Reservation.query.filter(
+            Reservation.table_number == table_number,
+            Reservation.reservation_time > reservation_time - duration,
+            Reservation.reservation_time < reservation_time + duration,
+            Reservation.status != "cancelled"
+        )
+        if exclude_id is not None:
+            query = query.filter(Reservation.id != exclude_id)
+        return query.with_for_update().first()
+
     @staticmethod
     def create_reservation(data):
-        reservation = Reservation(**data)
         try:
+            if data.get("status", "pending") != "cancelled":
+                ReservationService._lock_table(data["table_number"])
+                if ReservationService._find_conflict(data["table_number"], data["reservation_time"]):
+                    db.session.rollback()
+                    return None, error_response("Table is already booked at that time", 409)
+            reservation = Reservation(**data)
             db.session.add(reservation)
             db.session.commit()
+            reservation_cache.invalidate()
             return reservation, None
         except SQLAlchemyError as e:
             db.session.rollback()
             return None, error_response(str(e), 500)
 
     @staticmethod
+    def _day_schedule(day):
+        """Sorted reservation start times per table for one day, cached until the next write."""
+        def load():
+            start = datetime.combine(day, datetime.min.time())
+            rows = db.session.query(Reservation.table_number, Reservation.reservation_time).filter(
+                Reservation.reservation_time >= start,
+                Reservation.reservation_time < start + timedelta(days=1),
+                Reservation.status != "cancelled"
+            ).order_by(Reservation.table_number, Reservation.reservation_time).all()
+            schedule = {}
+            for table_number, reservation_time in rows:
+                schedule.setdefault(table_number, []).append(reservation_time.replace(tzinfo=None))
+            return schedule
+
+        schedule, _ = reservation_cache.get_or_load(day.isoformat(), load, with_etag=False)
+        return schedule
+
+    @staticmethod
+    def find_availability(start, end, party=1):
+        """Return the free tables seating ``party`` for each slot in ``[start, end)``.
+
+        A reservation holds its table for the configured seating duration,
+        so a slot at ``s`` is free when no booking starts in ``(s - d, s + d)``.
+        """
+        duration = ReservationService._seating_duration()
+        step = timedelta(minutes=current_app.config.get("RESERVATION_SLOT_MINUTES", 30))
+        tables = sorted(t for t, seats in ReservationService._tables().items() if seats >= party)
+
+        starts = {}
+        day = (start - duration).date()
+        while day <= (end + duration).date():
+            for table_number, times in ReservationService._day_schedule(day).items():
+                starts.setdefault(table_number, []).extend(times)
+            day += timedelta(days=1)
+
+        slots = []
+        slot = start
+        while slot < end:
+            free = []
+            for table_number in tables:
+                times = starts.get(table_number, ())
+                index = bisect_right(times, slot - duration)
+                if index == len(times) or times[index] >= slot + duration:
+                    free.append(table_number)
+            slots.append({"start": slot, "end": slot + duration, "free_tables": free})
+            slot += step
+        return slots
+
+    @staticmethod
+    @read_only
     def get_reservation_by_id(reservation_id):
         return Reservation.query.get(reservation_id)
 
     @staticmethod
+    @read_only
     def get_all_reservations():
         return Reservation.query.all()
 
+    @staticmethod
+    @read_only
+    def list_reservations(params):
+        return _list_page(Reservation, params)
+
     @staticmethod
     def update_reservation(reservation_id, data):
         reservation = Reservation.query.get(reservation_id)
         if not reservation:
             return None, error_response("Reservation not found", 404)
-        for key, value in data.items():
-            setattr(reservation, key, value)
+        table_number = data.get("table_number", reservation.table_number)
+        reservation_time = data.get("reservation_time", reservation.reservation_time)
+        status = data.get("status", reservation.status)
         try:
+            if status != "cancelled":
+                ReservationService._lock_table(table_number)
+                if ReservationService._find_conflict(table_number, reservation_time, exclude_id=reservation.id):
+                    db.session.rollback()
+                    return None, error_response("Table is already booked at that time", 409)
+            for key, value in data.items():
+                setattr(reservation, key, value)
             db.session.commit()
+            reservation_cache.invalidate()
             return reservation, None
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -434,17 +1118,127 @@ class ReservationService:
         try:
             db.session.delete(reservation)
             db.session.commit()
+            reservation_cache.invalidate()
             return reservation, None
         except SQLAlchemyError as e:
             db.session.rollback()
             return None, error_response(str(e), 500)
 
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+def _as_datetime(value):
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
 class SalesReportService:
 
+    SALES_EXCLUDED_ORDER_STATUSES = ["cancelled"]
+
     @staticmethod
     def _active_query():
         return SalesReport.query
 
+    @staticmethod
+    def _aggregate_daily_sales(start, end, days=None):
+        items_per_order = db.session.query(
+            OrderItem.order_id.label("order_id"),
+            func.sum(OrderItem.quantity).label("items_sold")
+        ).group_by(OrderItem.order_id).subquery()
+
+        day = func.date(Order.created_at)
+        query = db.session.query(
+            day.label("day"),
+            func.count(Order.id).label("total_orders"),
+            func.coalesce(func.sum(Order.total_price), 0).label("total_sales"),
+            func.coalesce(func.sum(items_per_order.c.items_sold), 0).label("total_items_sold")
+        ).outerjoin(
+            items_per_order, items_per_order.c.order_id == Order.id
+        ).filter(
+            Order.status.notin_(SalesReportService.SALES_EXCLUDED_ORDER_STATUSES),
+            Order.created_at >= start,
+            Order.created_at < end
+        )
+        if days is not None:
+            query = query.filter(day.in_([d.isoformat() for d in days]))
+        return {_as_date(row.day): row for row in query.group_by(day).all()}
+
+    @staticmethod
+    def _days_changed_since(since):
+        day = func.date(Order.created_at)
+        rows = db.session.query(day).filter(Order.updated_at >= since).distinct().all()
+        return sorted(_as_date(row[0]) for row in rows)
+
+    @staticmethod
+    def refresh_daily_reports(date_from=None, date_to=None, generated_by=None):
+        """Recompute one SalesReport per day from orders and order_items.
+
+        With an explicit ``date_from``/``date_to`` range (dates, ``date_to``
+        exclusive) every day in it is rebuilt. Without one, only the days
+        holding orders changed since the previous run are rebuilt; deleted
+        orders leave no trace, so run an explicit range to correct those.
+
+        ``refreshed_at`` is the incremental watermark: only incremental runs
+        stamp it, so a ranged run cannot move it past orders it never read.
+        """
+        run_started = _as_datetime(db.session.query(func.now()).scalar())
+        days = None
+        incremental = date_from is None and date_to is None
+        if incremental:
+            last_run = db.session.query(func.max(SalesReport.refreshed_at)).scalar()
+            if last_run is not None:
+                days = SalesReportService._days_changed_since(last_run)
+                if not days:
+                    return {"days_refreshed": 0, "reports": []}, None
+                date_from, date_to = days[0], days[-1] + timedelta(days=1)
+            else:
+                bounds = db.session.query(func.min(Order.created_at), func.max(Order.created_at)).one()
+                if bounds[0] is None:
+                    return {"days_refreshed": 0, "reports": []}, None
+                date_from = _as_date(bounds[0])
+                date_to = _as_date(bounds[1]) + timedelta(days=1)
+        elif date_from is None or date_to is None:
+            return None, error_response("Both from and to are required for a ranged refresh", 400)
+
+        start = datetime.combine(date_from, datetime.min.time())
+        end = datetime.combine(date_to, datetime.min.time())
+        if end <= start:
+            return None, error_response("to must be after from", 400)
+
+        totals = SalesReportService._aggregate_daily_sales(start, end, days)
+        existing = {}
+        for report in SalesReport.query.filter(SalesReport.report_date >= start, SalesReport.report_date < end):
+            existing.setdefault(_as_date(report.report_date), report)
+
+        wanted_days = set(totals) | (set(existing) if days is None else set(days) & set(existing))
+        reports = []
+        for day in sorted(wanted_days):
+            row = totals.get(day)
+            report = existing.get(day)
+            if report is None:
+                report = SalesReport(report_date=datetime.combine(day, datetime.min.time()))
+                db.session.add(report)
+            report.total_orders = int(row.total_orders) if row else 0
+            report.total_sales = Decimal(str(row.total_sales)) if row else Decimal("0.00")
+            report.total_items_sold = int(row.total_items_sold) if row else 0
+            if incremental:
+                report.refreshed_at = run_started
+            if generated_by is not None:
+                report.generated_by = generated_by
+            reports.append(report)
+
+        try:
+            db.session.commit()
+            return {"days_refreshed": len(reports), "reports": reports}, None
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            return None, error_response(str(e), 500)
+
     @staticmethod
     def create_report(data):
         report = SalesReport(**data)
@@ -457,13 +1251,20 @@ class SalesReportService:
             return None, error_response(str(e), 500)
 
     @staticmethod
+    @read_only
     def get_report_by_id(report_id):
         return SalesReport.query.get(report_id)
 
     @staticmethod
+    @read_only
     def get_all_reports():
         return SalesReport.query.all()
 
+    @staticmethod
+    @read_only
+    def list_reports(params):
+        return _list_page(SalesReport, params, SalesReport.report_date)
+
     @staticmethod
     def update_report(report_id, data):
         report = SalesReport.query.get(report_id)
@@ -509,86 +1310,227 @@ class InventoryService:
             return None, error_response(str(e), 500)
 
     @staticmethod
+    @read_only
     def get_item_by_id(item_id):
         return Inventory.query.get(item_id)
 
     @staticmethod
+    @read_only
     def get_all_items():
         return Inventory.query.all()
 
     @staticmethod
-    def increase_stock(item_id, quantity, note=None):
-        if quantity <= 0:
-            return None, error_response("Quantity must be greater than 0", 400)
-        item = Inventory.query.get(item_id)
-        if not item:
-            return None, error_response("Inventory item not found", 404)
-        item.stock_quantity += quantity
-        item.last_restock_date = datetime.utcnow()
-        log = InventoryLog(
-            inventory_id=item.id,
-            change_type="IN",
-            quantity_changed=quantity,
-            note=note
-        )
+    @read_only
+    def list_items(params):
+        return _list_page(Inventory, params)
+
+    @staticmethod
+    @read_only
+    def get_items_version(params):
+        return _collection_version(_apply_list_filters(Inventory.query, Inventory, params), Inventory)
+
+    @staticmethod
+    def _apply_stock_change(item_id, delta, change_type, note=None):
+        """Apply ``delta`` with one conditional UPDATE and log it in the same transaction.
+
+        The floor check happens inside the UPDATE's WHERE clause, so two
+        concurrent callers can never both pass it and no update is lost.
+        """
+        values = {"stock_quantity": Inventory.stock_quantity + delta}
+        if change_type == "IN":
+            values["last_restock_date"] = datetime.utcnow()
+        stmt = update(Inventory).where(Inventory.id == item_id)
+        if delta < 0:
+            stmt = stmt.where(Inventory.stock_quantity >= -delta)
         try:
-            db.session.add(log)
+            result = db.session.execute(stmt.values(**values).execution_options(synchronize_session=False))
+            if result.rowcount == 0:
+                exists = db.session.query(Inventory.id).filter(Inventory.id == item_id).first()
+                db.session.rollback()
+                if not exists:
+                    return None, error_response("Inventory item not found", 404)
+                if change_type == "OUT":
+                    return None, error_response("Insufficient stock", 400)
+                return None, error_response("Stock cannot go negative", 400)
+            db.session.add(InventoryLog(
+                inventory_id=item_id,
+                change_type=change_type,
+                quantity_changed=delta,
+                note=note
+            ))
             db.session.commit()
-            return item, None
+            return db.session.get(Inventory, item_id), None
         except SQLAlchemyError as e:
             db.session.rollback()
             return None, error_response(str(e), 500)
 
+    @staticmethod
+    def increase_stock(item_id, quantity, note=None):
+        if not isinstance(quantity, int) or isinstance(quantity, bool):
+            return None, error_response("Quantity must be an integer", 400)
+        if quantity <= 0:
+            return None, error_response("Quantity must be greater than 0", 400)
+        return InventoryService._apply_stock_change(item_id, quantity, "IN", note)
+
     @staticmethod
     def decrease_stock(item_id, quantity, note=None):
+        if not isinstance(quantity, int) or isinstance(quantity, bool):
+            return None, error_response("Quantity must be an integer", 400)
         if quantity <= 0:
             return None, error_response("Quantity must be greater than 0", 400)
-        item = Inventory.query.get(item_id)
-        if not item:
-            return None, error_response("Inventory item not found", 404)
-        if item.stock_quantity < quantity:
-            return None, error_response("Insufficient stock", 400)
-        item.stock_quantity -= quantity
-        log = InventoryLog(
-            inventory_id=item.id,
-            change_type="OUT",
-            quantity_changed=-quantity,
-            note=note
-        )
-        try:
-            db.session.add(log)
-            db.session.commit()
-            return item, None
-        except SQLAlchemyError as e:
-            db.session.rollback()
-            return None, error_response(str(e), 500)
+        return InventoryService._apply_stock_change(item_id, -quantity, "OUT", note)
 
     @staticmethod
     def adjust_stock(item_id, quantity, note=None):
+        if not isinstance(quantity, int) or isinstance(quantity, bool):
+            return None, error_response("Quantity must be an integer", 400)
         if quantity == 0:
             return None, error_response("Adjustment quantity cannot be zero", 400)
-        item = Inventory.query.get(item_id)
-        if not item:
-            return None, error_response("Inventory item not found", 404)
-        new_stock = item.stock_quantity + quantity
-        if new_stock < 0:
-            return None, error_response("Stock cannot go negative", 400)
-        item.stock_quantity = new_stock
-        log = InventoryLog(
-            inventory_id=item.id,
-            change_type="ADJUSTMENT",
-            quantity_changed=quantity,
-            note=note
+        return InventoryService._apply_stock_change(item_id, quantity, "ADJUSTMENT", note)
+
+    @staticmethod
+    def deplete_for_order(order):
+        """Draw every recipe ingredient of ``order`` from stock, without committing.
+
+        The whole draw is one GROUP BY, one CASE-based conditional UPDATE
+        across all touched inventory rows and one multi-row log INSERT.
+        Returns an error response when any ingredient is short; the caller
+        rolls back in that case.
+        """
+        draws = dict(db.session.query(
+            RecipeItem.inventory_id,
+            func.sum(RecipeItem.quantity * OrderItem.quantity)
+        ).join(
+            OrderItem, OrderItem.menu_item_id == RecipeItem.menu_item_id
+        ).filter(
+            OrderItem.order_id == order.id
+        ).group_by(RecipeItem.inventory_id).all())
+        if not draws:
+            return None
+
+        draws = {inventory_id: int(quantity) for inventory_id, quantity in draws.items()}
+        draw = case(draws, value=Inventory.id)
+        result = db.session.execute(
+            update(Inventory)
+            .where(Inventory.id.in_(list(draws)), Inventory.stock_quantity >= draw)
+            .values(stock_quantity=Inventory.stock_quantity - draw)
+            .execution_options(synchronize_session=False)
         )
+        if result.rowcount != len(draws):
+            short = db.session.query(Inventory.item_name).filter(
+                Inventory.id.in_(list(draws)), Inventory.stock_quantity < draw
+            ).all()
+            names = ", ".join(sorted(name for name, in short))
+            return error_response(f"Insufficient stock for: {names}", 400)
+
+        db.session.execute(insert(InventoryLog), [
+            {
+                "inventory_id": inventory_id,
+                "change_type": "OUT",
+                "quantity_changed": -quantity,
+                "note": f"Order {order.order_number}"
+            }
+            for inventory_id, quantity in draws.items()
+        ])
+        return None
+
+    @staticmethod
+    @read_only
+    def low_stock_items():
+        items = Inventory.query.filter(Inventory.stock_quantity <= Inventory.threshold).all()
+        return items
+
+class RecipeService:
+
+    @staticmethod
+    @read_only
+    def get_recipe(menu_item_id):
+        return RecipeItem.query.filter_by(menu_item_id=menu_item_id).order_by(RecipeItem.id).all()
+
+    @staticmethod
+    def set_recipe(menu_item_id, items):
+        # Checked on the primary: a replica may not have the menu item yet.
+        if not db.session.query(MenuItem.id).filter_by(id=menu_item_id).first():
+            return None, error_response("Menu item not found", 404)
+        inventory_ids = {item["inventory_id"] for item in items}
+        if inventory_ids:
+            found = {row[0] for row in db.session.query(Inventory.id).filter(Inventory.id.in_(inventory_ids))}
+            missing = sorted(inventory_ids - found)
+            if missing:
+                return None, error_response(f"Inventory item not found: {missing}", 404)
         try:
-            db.session.add(log)
+            db.session.execute(delete(RecipeItem).where(RecipeItem.menu_item_id == menu_item_id))
+            if items:
+                db.session.execute(insert(RecipeItem), [
+                    {"menu_item_id": menu_item_id, **item} for item in items
+                ])
             db.session.commit()
-            return item, None
+            return RecipeService.get_recipe(menu_item_id), None
         except SQLAlchemyError as e:
             db.session.rollback()
             return None, error_response(str(e), 500)
 
+
+class DashboardService:
+    """Today's figures for the manager dashboard.
+
+    "Today" is taken from the database clock, the one that stamps
+    ``created_at``. Counts come from two aggregate queries and are
+    memoized in ``dashboard_cache`` for ``DASHBOARD_CACHE_TTL`` seconds. Only one
+    request per process reloads an expired summary; the others wait for
+    it, so the number of open dashboards does not change database load.
+    """
+
+    OPEN_RESERVATION_STATUSES = ["pending", "confirmed"]
+    _load_lock = threading.Lock()
+
     @staticmethod
-    def low_stock_items():
-        items = Inventory.query.filter(Inventory.stock_quantity <= Inventory.threshold).all()
-        return items
+    def _load_summary():
+        now = _as_datetime(db.session.query(func.now()).scalar())
+        day = now.date()
+        start = datetime.combine(day, datetime.min.time())
+        end = start + timedelta(days=1)
+
+        by_status = dict.fromkeys(ALLOWED_ORDER_STATUSES, 0)
+        revenue = Decimal("0.00")
+        rows = db.session.query(
+            Order.status, func.count(Order.id), func.coalesce(func.sum(Order.total_price), 0)
+        ).filter(Order.created_at >= start, Order.created_at < end).group_by(Order.status).all()
+        for status, count, total in rows:
+            by_status[status] = count
+            if status not in SalesReportService.SALES_EXCLUDED_ORDER_STATUSES:
+                revenue += Decimal(str(total))
+
+        unpaid_orders = select(func.count(Order.id)).where(
+            Order.payment_status == "unpaid", Order.status != "cancelled"
+        ).scalar_subquery()
+        open_reservations = select(func.count(Reservation.id)).where(
+            Reservation.status.in_(DashboardService.OPEN_RESERVATION_STATUSES),
+            Reservation.reservation_time >= now,
+            Reservation.reservation_time < end
+        ).scalar_subquery()
+        low_stock_items = select(func.count(Inventory.id)).where(
+            Inventory.stock_quantity <= Inventory.threshold
+        ).scalar_subquery()
+        counts = db.session.execute(select(unpaid_orders, open_reservations, low_stock_items)).one()
+
+        return {
+            "date": day.isoformat(),
+            "orders": {"total": sum(by_status.values()), "by_status": by_status},
+            "revenue": float(revenue.quantize(Decimal("0.01"))),
+            "unpaid_orders": counts[0],
+            "open_reservations": counts[1],
+            "low_stock_items": counts[2],
+            "generated_at": now.replace(microsecond=0).isoformat(),
+        }
+
+    @staticmethod
+    def summary():
+        """Return ``(summary, etag)`` for the database's current day."""
+        key = "summary"
+        ttl = current_app.config.get("DASHBOARD_CACHE_TTL")
+        cached = dashboard_cache.get(key)
+        if cached is not None:
+            return cached
+        with DashboardService._load_lock:
+            return dashboard_cache.get_or_load(key, DashboardService._load_summary, ttl=ttl)
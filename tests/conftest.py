@@ -0,0 +1,4 @@
+import os
+
+# config.py requires a database URI at import time; tests default to in-memory SQLite.
+os.environ.setdefault("SQLALCHEMY_DATABASE_URI", "sqlite://")
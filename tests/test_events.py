@@ -0,0 +1,151 @@
+import time
+
+import pytest
+from sqlalchemy import insert
+
+from app import create_app
+from config import Config
+from database.db import db
+from models import User, MenuCategory, MenuItem, OrderEvent
+from services import OrderService
+from utils.events import LocalBroker, OutboxBroker, order_events
+from utils.streaming import iter_sse
+
+
+def _make_app(tmp_path, backend):
+    class TestConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'events.db'}"
+        ORDER_EVENTS_BACKEND = backend
+        ORDER_EVENTS_POLL_INTERVAL = 0.05
+
+    return create_app(TestConfig)
+
+
+@pytest.fixture(params=["local", "outbox"])
+def app(request, tmp_path):
+    app = _make_app(tmp_path, request.param)
+    with app.app_context():
+        db.create_all()
+        user = User(username="kitchen", email="kitchen@example.com", password_hash="x")
+        grill, bar = MenuCategory(name="Grill"), MenuCategory(name="Bar")
+        db.session.add_all([user, grill, bar])
+        db.session.flush()
+        db.session.add_all([
+            MenuItem(name="Burger", price=9, category_id=grill.id),
+            MenuItem(name="Lemonade", price=3, category_id=bar.id),
+        ])
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def _frames(body):
+    return [frame for frame in body if frame.startswith("id: ") and "event:" in frame]
+
+
+def test_local_broker_replays_after_last_event_id():
+    broker = LocalBroker(size=3)
+    for i in range(5):
+        broker.publish("order.created", {"i": i})
+
+    events, reset = broker.wait(3, 0)
+    assert [event.id for event in events] == [4, 5] and not reset
+    assert events[0].data == '{"i":3}'
+    assert broker.wait(5, 0) == ([], False)
+
+
+def test_local_broker_resets_on_evicted_or_unknown_id():
+    broker = LocalBroker(size=2)
+    for i in range(5):
+        broker.publish("order.created", {"i": i})
+
+    assert broker.wait(1, 0)[1] is True
+    assert broker.wait(9, 0)[1] is True
+
+
+def test_order_events_reach_matching_stations_only(app):
+    grill, bar = MenuCategory.query.order_by(MenuCategory.id).all()
+    burger = MenuItem.query.filter_by(name="Burger").one()
+    user = User.query.one()
+    start = order_events.latest_id()
+
+    order, error = OrderService.create_order({"user_id": user.id, "items": [{"menu_item_id": burger.id, "quantity": 2}]})
+    assert error is None
+    OrderService.update_order(order.id, {"status": "processing"})
+
+    grill_feed = _frames(iter_sse(order_events, start, {grill.id}, heartbeat=0.1, max_seconds=0.3))
+    bar_feed = _frames(iter_sse(order_events, start, {bar.id}, heartbeat=0.1, max_seconds=0.3))
+    assert [frame.split("\n")[1] for frame in grill_feed] == ["event: order.created", "event: order.updated"]
+    assert '"quantity":2' in grill_feed[0]
+    assert bar_feed == []
+
+
+def test_events_are_published_only_when_the_transaction_commits(app):
+    start = order_events.latest_id()
+    user = User.query.one()
+
+    order_events.publish("order.created", {"id": 0}, {1})
+    db.session.rollback()
+    assert order_events.wait(start, 0) == ([], False)
+
+    user.is_active = True
+    order_events.publish("order.created", {"id": 1}, {1})
+    db.session.commit()
+    events, _ = order_events.wait(start, 0)
+    assert [event.data for event in events] == ['{"id":1}']
+
+
+def test_outbox_is_shared_between_workers(tmp_path):
+    app = _make_app(tmp_path, "outbox")
+    with app.app_context():
+        db.create_all()
+        first = OutboxBroker(db, OrderEvent)
+        second = OutboxBroker(db, OrderEvent)
+        first.publish("order.created", {"id": 1}, {2})
+        db.session.commit()
+        second.publish("order.updated", {"id": 1})
+        db.session.commit()
+
+        events, reset = first.wait(0, 0)
+        assert [(event.id, event.type, event.stations) for event in events] == [
+            (1, "order.created", frozenset({2})), (2, "order.updated", None)
+        ]
+        assert not reset
+        assert second.latest_id() == 2
+        assert second.wait(1, 0)[0] == events[1:]
+
+
+def test_outbox_holds_at_an_id_gap_until_the_grace_expires(tmp_path):
+    app = _make_app(tmp_path, "outbox")
+    with app.app_context():
+        db.create_all()
+        broker = OutboxBroker(db, OrderEvent, poll_interval=0.05, gap_grace=0.3)
+        rows = [{"id": n, "event_type": "order.created", "payload": "{}"} for n in (1, 3)]
+        db.session.execute(insert(OrderEvent), rows)
+        db.session.commit()
+
+        assert [event.id for event in broker.wait(0, 0)[0]] == [1]
+        started = time.monotonic()
+        assert [event.id for event in broker.wait(1, 0)[0]] == [3]
+        assert time.monotonic() - started >= 0.3
+
+        db.session.execute(insert(OrderEvent), [{"id": 2, "event_type": "order.created", "payload": "{}"}])
+        db.session.commit()
+        assert [event.id for event in broker.wait(1, 0)[0]] == [2, 3]
+
+
+def test_outbox_reports_a_reset_for_pruned_ids(tmp_path):
+    app = _make_app(tmp_path, "outbox")
+    with app.app_context():
+        db.create_all()
+        broker = OutboxBroker(db, OrderEvent)
+        for i in range(5):
+            broker.publish("order.created", {"i": i})
+        db.session.commit()
+
+        assert broker.prune(2) == 3
+        assert broker.wait(1, 0) == ([], True)
+        assert [event.id for event in broker.wait(3, 0)[0]] == [4, 5]
+        assert broker.wait(9, 0) == ([], True)
@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+from app import create_app
+from config import Config
+from database.db import db
+from models import Inventory, InventoryLog
+from services import InventoryService
+
+THREADS = 8
+OPS = 40
+START_STOCK = 30
+
+
+@pytest.fixture
+def app(tmp_path):
+    # A file database, so each thread gets its own connection and transaction.
+    class TestConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'inventory.db'}"
+        SQLALCHEMY_ENGINE_OPTIONS = {"connect_args": {"timeout": 30}}
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_concurrent_stock_changes_lose_no_updates(app):
+    item = Inventory(item_name="Bun", stock_quantity=START_STOCK, threshold=0)
+    db.session.add(item)
+    db.session.commit()
+    item_id = item.id
+    results = [None] * THREADS
+    barrier = threading.Barrier(THREADS)
+
+    def worker(index):
+        applied = succeeded = 0
+        barrier.wait()
+        with app.app_context():
+            for op in range(OPS):
+                # Mostly sales, so the stock runs out and some decreases must be refused.
+                if op % 4 == 3:
+                    _, error = InventoryService.increase_stock(item_id, 1, "restock")
+                    delta = 1
+                else:
+                    _, error = InventoryService.decrease_stock(item_id, 1, "sale")
+                    delta = -1
+                if error:
+                    assert error[1] == 400
+                else:
+                    applied += delta
+                    succeeded += 1
+        results[index] = (applied, succeeded)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    applied = sum(result[0] for result in results)
+    succeeded = sum(result[1] for result in results)
+    db.session.expire_all()
+    item = db.session.get(Inventory, item_id)
+    logged = db.session.query(db.func.sum(InventoryLog.quantity_changed)).filter(
+        InventoryLog.inventory_id == item_id
+    ).scalar()
+
+    assert succeeded < THREADS * OPS
+    assert item.stock_quantity == START_STOCK + applied >= 0
+    assert logged == applied
+    assert InventoryLog.query.filter_by(inventory_id=item_id).count() == succeeded
+    assert item.version == 1 + succeeded
@@ -0,0 +1,88 @@
+from contextlib import contextmanager
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app
+from database.db import db
+from models import User, MenuCategory, MenuItem, Payment
+from schemas import order_detail_dumper
+from services import OrderService
+
+# Order, its lines with their dishes, and its payments: one statement each.
+DETAIL_QUERIES = 3
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.app_context():
+        db.create_all()
+        user = User(username="guest", email="guest@example.com", password_hash="x")
+        category = MenuCategory(name="Grill")
+        db.session.add_all([user, category])
+        db.session.flush()
+        db.session.add_all([
+            MenuItem(name=f"Dish {i}", price=Decimal("10.00") + i, category_id=category.id) for i in range(50)
+        ])
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@contextmanager
+def _count_queries():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+
+def _create_order(lines):
+    user = User.query.one()
+    menu_items = MenuItem.query.order_by(MenuItem.id).limit(lines).all()
+    order, error = OrderService.create_order({
+        "user_id": user.id,
+        "items": [{"menu_item_id": menu_item.id, "quantity": 1} for menu_item in menu_items]
+    })
+    assert error is None
+    db.session.add(Payment(order_id=order.id, user_id=user.id, amount=order.total_price,
+                           payment_method="cash", status="paid"))
+    db.session.commit()
+    return order.id
+
+
+@pytest.mark.parametrize("lines", [1, 10, 50])
+def test_order_detail_costs_a_fixed_number_of_queries(app, lines):
+    order_id = _create_order(lines)
+    db.session.expunge_all()
+
+    with _count_queries() as statements:
+        data = order_detail_dumper(OrderService.get_order_detail(order_id))
+
+    assert len(data["items"]) == lines and len(data["payments"]) == 1
+    assert all(item["menu_item_name"] for item in data["items"])
+    assert len(statements) == DETAIL_QUERIES, statements
+
+
+def test_order_detail_page_costs_a_fixed_number_of_queries(app):
+    for lines in (1, 10, 50):
+        _create_order(lines)
+    db.session.expunge_all()
+    params = {"limit": 50, "cursor": None, "date_from": None, "date_to": None, "filters": {}}
+
+    with _count_queries() as statements:
+        orders, _ = OrderService.list_order_details(params)
+        data = [order_detail_dumper(order) for order in orders]
+
+    assert sorted(len(order["items"]) for order in data) == [1, 10, 50]
+    assert len(statements) == DETAIL_QUERIES, statements
@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert
+
+from app import create_app
+from database.db import db
+from models import User, Order
+from services import OrderService
+from validations import validate_list_args
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def _insert_orders(user_id, numbers, created_at=None):
+    rows = [{"user_id": user_id, "order_number": number} for number in numbers]
+    if created_at is not None:
+        rows = [dict(row, created_at=created_at) for row in rows]
+    db.session.execute(insert(Order), rows)
+    db.session.commit()
+
+
+def _walk(limit):
+    ids, cursor = [], None
+    for _ in range(100):
+        params, error = validate_list_args({"limit": str(limit), **({"cursor": cursor} if cursor else {})})
+        assert error is None
+        rows, cursor = OrderService.list_orders(params)
+        ids += [row.id for row in rows]
+        if cursor is None:
+            return ids
+    pytest.fail(f"pagination did not terminate: {ids[:20]}")
+
+
+def test_orders_created_in_the_same_second_are_paged_once(app):
+    user = User(username="pager", email="pager@example.com", password_hash="x")
+    db.session.add(user)
+    db.session.commit()
+    # One multi-row INSERT: every row gets the same server-default now().
+    _insert_orders(user.id, [f"SRV-{i}" for i in range(5)])
+    # Values bound from Python are stored in SQLite's other text layout.
+    _insert_orders(user.id, [f"PY-{i}" for i in range(4)], datetime.utcnow().replace(microsecond=0))
+
+    ids = _walk(limit=2)
+
+    expected = [order.id for order in Order.query.all()]
+    assert sorted(ids) == sorted(expected)
+    assert len(ids) == len(set(ids))
@@ -0,0 +1,83 @@
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import create_app
+from config import Config
+from database.db import db
+from models import User, Reservation
+from services import ReservationService
+
+THREADS = 8
+
+
+@pytest.fixture
+def app(tmp_path):
+    # A file database, so each thread gets its own connection and transaction.
+    class TestConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'reservations.db'}"
+        SQLALCHEMY_ENGINE_OPTIONS = {"connect_args": {"timeout": 30}}
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(username="guest", email="guest@example.com", password_hash="x"))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def _slot():
+    return (datetime.utcnow() + timedelta(days=2)).replace(hour=18, minute=0, second=0, microsecond=0)
+
+
+def _race(app, book):
+    statuses = Counter()
+    barrier = threading.Barrier(THREADS)
+
+    def worker(index):
+        barrier.wait()
+        with app.app_context():
+            _, error = book(index)
+            statuses[error[1] if error else 200] += 1
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return statuses
+
+
+def test_concurrent_bookings_of_one_table_keep_one(app):
+    slot = _slot()
+
+    statuses = _race(app, lambda index: ReservationService.create_reservation(
+        {"user_id": 1, "table_number": 3, "reservation_time": slot + timedelta(minutes=10 * index)}
+    ))
+
+    assert statuses == {200: 1, 409: THREADS - 1}
+    assert Reservation.query.filter_by(table_number=3).count() == 1
+
+
+def test_concurrent_moves_onto_one_slot_keep_one(app):
+    slot = _slot()
+    ids = []
+    for index in range(THREADS):
+        reservation, error = ReservationService.create_reservation(
+            {"user_id": 1, "table_number": index + 1, "reservation_time": slot}
+        )
+        assert error is None
+        ids.append(reservation.id)
+    db.session.remove()
+
+    statuses = _race(app, lambda index: ReservationService.update_reservation(
+        ids[index], {"table_number": 20, "reservation_time": slot + timedelta(minutes=10 * index)}
+    ))
+
+    assert statuses == {200: 1, 409: THREADS - 1}
+    assert Reservation.query.filter_by(table_number=20).count() == 1
@@ -0,0 +1,64 @@
+import threading
+from collections import Counter
+
+import pytest
+from sqlalchemy import func
+
+from app import create_app
+from config import Config
+from database.db import db
+from models import User
+
+THREADS = 8
+ACCOUNTS = 10
+
+
+@pytest.fixture(params=[False, True], ids=["insert-only", "precheck"])
+def app(request, tmp_path):
+    # A file database, so each thread gets its own connection and transaction.
+    class TestConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'signup.db'}"
+        SQLALCHEMY_ENGINE_OPTIONS = {"connect_args": {"timeout": 30}}
+        # Cheap hashes keep the race about the database, not the KDF.
+        PASSWORD_HASH_METHOD = "pbkdf2:sha256:1000"
+        PASSWORD_HASH_POOL = "none"
+        REGISTER_PRECHECK = request.param
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_concurrent_duplicate_signups_create_each_account_once(app):
+    statuses = {}
+    barrier = threading.Barrier(THREADS)
+
+    def worker(index):
+        client = app.test_client()
+        seen = statuses.setdefault(index, Counter())
+        barrier.wait()
+        for i in range(ACCOUNTS):
+            account = (i + index) % ACCOUNTS
+            response = client.post("/api/auth/register", json={
+                "username": f"guest{account}", "email": f"guest{account}@example.com", "password": "secret123"
+            })
+            seen[(account, response.status_code)] += 1
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    total = sum(statuses.values(), Counter())
+    assert not [key for key in total if key[1] not in (201, 400)]
+    for account in range(ACCOUNTS):
+        assert total[(account, 201)] == 1
+        assert total[(account, 400)] == THREADS - 1
+
+    assert User.query.count() == ACCOUNTS
+    assert db.session.query(User.email).group_by(User.email).having(func.count() > 1).count() == 0
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class ReadCache:
+    """Versioned in-process read-through cache for serialized payloads.
+
+    Every entry is stored together with the cache version it was built
+    under and an ETag of its JSON form. ``invalidate()`` bumps the version,
+    so entries loaded before a write are never served afterwards; the TTL
+    bounds staleness caused by writes made in other processes.
+    """
+
+    def __init__(self, default_ttl=60):
+        self.default_ttl = default_ttl
+        self.version = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_etag(payload):
+        body = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.sha1(body.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        version, expires_at, payload, etag = entry
+        if version != self.version or expires_at < time.monotonic():
+            return None
+        return payload, etag
+
+    def get_or_load(self, key, loader, ttl=None, with_etag=True):
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        version = self.version
+        payload = loader()
+        etag = self.make_etag(payload) if with_etag else None
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            if version == self.version:
+                self._entries[key] = (version, time.monotonic() + ttl, payload, etag)
+        return payload, etag
+
+    def invalidate(self):
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+
+class TTLCache:
+    """Small thread-safe LRU cache whose entries also expire after a TTL."""
+
+    def __init__(self, maxsize=1024, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def increment(self, key, ttl=None):
+        """Add one to the counter at ``key`` and return it; a new counter expires after ``ttl``."""
+        ttl = self.ttl if ttl is None else ttl
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < now:
+                entry = (now + ttl, 0)
+            entry = (entry[0], entry[1] + 1)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return entry[1]
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+catalog_cache = ReadCache()
+reservation_cache = ReadCache()
+dashboard_cache = ReadCache(default_ttl=10)
+user_access_cache = TTLCache()
+login_failures = TTLCache(maxsize=10000, ttl=300)
@@ -0,0 +1,193 @@
+import threading
+import time
+from collections import deque, namedtuple
+from sqlalchemy import delete, event as sa_event, func, select
+from utils.serialization import dumps_bytes
+
+# ``data`` is the event payload already rendered as JSON text.
+Event = namedtuple("Event", ["id", "type", "data", "stations"])
+
+
+def _contiguous(last_id, events):
+    """The leading run of ``events`` whose ids follow ``last_id`` without a gap."""
+    ready = []
+    for event in events:
+        if event.id != last_id + len(ready) + 1:
+            break
+        ready.append(event)
+    return ready
+
+
+class LocalBroker:
+    """In-process publish/subscribe broker with a bounded replay buffer.
+
+    Events get consecutive integer ids and the last ``size`` of them are
+    kept in a ring buffer, so a subscriber that reconnects with its last
+    seen id receives exactly what it missed. If the id has already been
+    evicted, or comes from before a restart, ``wait`` reports a reset and
+    the client should reload its state. Subscribers only see events
+    published in the same process, so this is the stand-in for tests and
+    single-process runs; ``OutboxBroker`` serves multi-worker deployments.
+
+    Given a ``session``, an event published inside a transaction is held
+    until that transaction commits and dropped if it rolls back, as an
+    outbox row would be.
+    """
+
+    def __init__(self, size=1000, session=None):
+        self._events = deque(maxlen=size)
+        self._last_id = 0
+        self._condition = threading.Condition()
+        self._session = session
+        if session is not None:
+            sa_event.listen(session, "after_commit", self._release)
+            sa_event.listen(session, "after_soft_rollback", self._discard)
+
+    def publish(self, event_type, data, stations=None):
+        data = dumps_bytes(data).decode("utf-8")
+        stations = frozenset(stations) if stations else None
+        if self._session is not None:
+            self._session.info.setdefault(self, []).append((event_type, data, stations))
+            return None
+        return self._append(event_type, data, stations)
+
+    def _append(self, event_type, data, stations):
+        with self._condition:
+            self._last_id += 1
+            event = Event(self._last_id, event_type, data, stations)
+            self._events.append(event)
+            self._condition.notify_all()
+        return event
+
+    def _release(self, session):
+        for pending in session.info.pop(self, ()):
+            self._append(*pending)
+
+    def _discard(self, session, previous_transaction):
+        session.info.pop(self, None)
+
+    def latest_id(self):
+        return self._last_id
+
+    def _since(self, last_id):
+        if last_id > self._last_id:
+            return [], True
+        if not self._events or last_id == self._last_id:
+            return [], False
+        oldest = self._events[0].id
+        if last_id < oldest - 1:
+            return list(self._events), True
+        return list(self._events)[last_id - oldest + 1:], False
+
+    def wait(self, last_id, timeout):
+        """Return ``(events after last_id, reset)``, blocking up to ``timeout`` seconds for new ones."""
+        with self._condition:
+            if last_id == self._last_id:
+                self._condition.wait(timeout)
+            return self._since(last_id)
+
+
+class OutboxBroker:
+    """Event feed shared by every worker, stored in an outbox table.
+
+    ``publish`` adds a row to the caller's session, so the event commits
+    or rolls back with the change it describes, and its id orders events
+    across workers and restarts. ``wait`` polls the table by id on short
+    primary connections. Ids are allocated at INSERT but become visible
+    at COMMIT, so a lower id can appear after a higher one: the feed holds
+    at a gap for up to ``gap_grace`` seconds before moving past it (ids of
+    rolled-back inserts never appear). ``prune`` keeps the newest rows; a
+    client whose Last-Event-ID was pruned gets a reset.
+    """
+
+    def __init__(self, db, model, poll_interval=1.0, gap_grace=2.0, batch_size=500):
+        self.db = db
+        self.model = model
+        self.poll_interval = poll_interval
+        self.gap_grace = gap_grace
+        self.batch_size = batch_size
+
+    def publish(self, event_type, data, stations=None):
+        row = self.model(
+            event_type=event_type,
+            payload=dumps_bytes(data).decode("utf-8"),
+            stations=",".join(str(station) for station in sorted(stations)) if stations else None
+        )
+        self.db.session.add(row)
+        return row
+
+    def latest_id(self):
+        with self.db.engine.connect() as connection:
+            return connection.scalar(select(func.max(self.model.id))) or 0
+
+    def _read(self, last_id):
+        table = self.model.__table__
+        with self.db.engine.connect() as connection:
+            oldest, newest = connection.execute(select(func.min(table.c.id), func.max(table.c.id))).one()
+            if newest is None or last_id >= newest:
+                return [], last_id > (newest or 0)
+            if last_id < oldest - 1:
+                return [], True
+            rows = connection.execute(
+                select(table.c.id, table.c.event_type, table.c.payload, table.c.stations)
+                .where(table.c.id > last_id).order_by(table.c.id).limit(self.batch_size)
+            ).all()
+        return [
+            Event(row.id, row.event_type, row.payload,
+                  frozenset(int(station) for station in row.stations.split(",")) if row.stations else None)
+            for row in rows
+        ], False
+
+    def wait(self, last_id, timeout):
+        """Return ``(events after last_id, reset)``, polling up to ``timeout`` seconds for new ones.
+
+        While a gap is pending the wait runs past ``timeout`` until the
+        gap fills or ``gap_grace`` expires.
+        """
+        deadline = time.monotonic() + timeout
+        gap_seen = None
+        while True:
+            events, reset = self._read(last_id)
+            if reset:
+                return [], True
+            ready = _contiguous(last_id, events)
+            if ready:
+                return ready, False
+            now = time.monotonic()
+            if events:
+                gap_seen = gap_seen if gap_seen is not None else now
+                if now - gap_seen >= self.gap_grace:
+                    return events, False
+                deadline = max(deadline, gap_seen + self.gap_grace)
+            if now >= deadline:
+                return [], False
+            time.sleep(min(self.poll_interval, deadline - now))
+
+    def prune(self, keep):
+        """Delete all but the newest ``keep`` events; returns how many rows went."""
+        table = self.model.__table__
+        with self.db.engine.begin() as connection:
+            newest = connection.scalar(select(func.max(table.c.id)))
+            if newest is None:
+                return 0
+            return connection.execute(delete(table).where(table.c.id <= newest - keep)).rowcount
+
+
+class EventFeed:
+    """Stable handle on the configured broker.
+
+    Modules import ``order_events`` once; ``create_app`` picks the broker
+    with ``use`` and every call is forwarded to it.
+    """
+
+    def __init__(self, broker):
+        self.broker = broker
+
+    def use(self, broker):
+        self.broker = broker
+
+    def __getattr__(self, name):
+        return getattr(self.broker, name)
+
+
+order_events = EventFeed(LocalBroker())
@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import deque
+from flask import g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Summary:
+    """Running count/sum plus a sliding window of recent samples for quantiles."""
+
+    def __init__(self, window):
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=window)
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        self.samples.append(value)
+
+    def quantiles(self):
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {q: 0.0 for q in QUANTILES}
+        last = len(ordered) - 1
+        return {q: ordered[min(last, int(round(q * last)))] for q in QUANTILES}
+
+
+class RequestMetrics:
+    SERIES = (
+        ("http_request_duration_seconds", "Wall time spent handling the request."),
+        ("http_request_sql_queries", "SQL statements issued while handling the request."),
+        ("http_request_sql_duration_seconds", "Time spent executing SQL while handling the request."),
+    )
+
+    def __init__(self, window=1024):
+        self.window = window
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, method, endpoint, duration, sql_count, sql_time):
+        key = (method, endpoint)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = tuple(Summary(self.window) for _ in self.SERIES)
+            for summary, value in zip(series, (duration, sql_count, sql_time)):
+                summary.observe(value)
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def render_prometheus(self):
+        with self._lock:
+            snapshot = [
+                (key, [(s.count, s.total, s.quantiles()) for s in series])
+                for key, series in sorted(self._series.items())
+            ]
+
+        lines = []
+        for index, (name, help_text) in enumerate(self.SERIES):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} summary")
+            for (method, endpoint), values in snapshot:
+                count, total, quantiles = values[index]
+                labels = f'method="{method}",endpoint="{_escape_label(endpoint)}"'
+                for q, value in quantiles.items():
+                    lines.append(f'{name}{{{labels},quantile="{q}"}} {value:.6f}')
+                lines.append(f"{name}_sum{{{labels}}} {total:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+request_metrics = RequestMetrics()
+
+
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    g.sql_count = 0
+    g.sql_time = 0.0
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    if has_request_context() and "sql_count" in g:
+        g.sql_count += 1
+        g.sql_time += time.perf_counter() - started
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def install_sql_hooks():
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
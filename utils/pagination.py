@@ -0,0 +1,59 @@
+import base64
+from datetime import datetime
+from sqlalchemy import and_, or_, func
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 200
+
+
+def encode_cursor(sort_value, row_id):
+    raw = f"{sort_value.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """Return ``(datetime, id)`` for a cursor, or ``None`` when it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        sort_value, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, UnicodeError):
+        return None
+
+
+def _sort_key(query, sort_column):
+    """The expression rows are ordered and compared by.
+
+    SQLite keeps DateTime values as text: server-default ``now()`` writes
+    ``YYYY-MM-DD HH:MM:SS`` while bound values carry six fractional digits,
+    so comparing the raw column with a cursor value never sees rows of the
+    same second as equal. ``julianday()`` reads both layouts as one number.
+    """
+    if query.session.get_bind().dialect.name == "sqlite":
+        return func.julianday(sort_column), func.julianday
+    return sort_column, lambda value: value
+
+
+def keyset_page(query, sort_column, id_column, limit, cursor=None):
+    """Fetch one page ordered by ``(sort_column, id_column)`` descending.
+
+    ``cursor`` is the decoded ``(sort_value, id)`` of the last row of the
+    previous page. Returns ``(rows, next_cursor)``; ``next_cursor`` is
+    ``None`` on the last page.
+    """
+    sort_key, as_key = _sort_key(query, sort_column)
+    if cursor is not None:
+        sort_value, row_id = cursor
+        sort_value = as_key(sort_value)
+        query = query.filter(or_(
+            sort_key < sort_value,
+            and_(sort_key == sort_value, id_column < row_id)
+        ))
+
+    rows = query.order_by(sort_key.desc(), id_column.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
@@ -0,0 +1,67 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+def _gevent_threadpool():
+    """gevent's native-thread pool when the app runs under monkey-patched gevent, else ``None``."""
+    try:
+        from gevent import monkey, get_hub
+    except ImportError:
+        return None
+    return get_hub().threadpool if monkey.is_module_patched("threading") else None
+
+
+class PasswordHasher:
+    """Hash and verify passwords with configurable cost, off the request thread.
+
+    ``method`` is a werkzeug method string (``scrypt``, ``scrypt:32768:8:1``,
+    ``pbkdf2:sha256:600000``...). Hashes made with other parameters still
+    verify, and ``needs_rehash`` tells the caller to replace them.
+
+    ``pool`` bounds how many hashes run at once: ``thread`` (hashlib
+    releases the GIL while hashing), ``process``, or ``none`` to hash
+    inline. Under gevent, ``thread`` uses gevent's native thread pool so
+    the waiting greenlet yields instead of blocking the worker.
+    """
+
+    def __init__(self, method="scrypt", pool="thread", workers=None):
+        self._executor = None
+        self.configure(method, pool, workers)
+
+    def configure(self, method="scrypt", pool="thread", workers=None):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self.method = method
+        self.prefix = generate_password_hash("", method=method).split("$", 1)[0]
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = None
+        self._gevent_pool = None
+        if pool == "thread":
+            self._gevent_pool = _gevent_threadpool()
+            if self._gevent_pool is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="password-hash")
+        elif pool == "process":
+            self._executor = ProcessPoolExecutor(self.workers)
+        elif pool != "none":
+            raise ValueError(f"Unknown password hash pool: {pool!r}")
+
+    def _run(self, func, *args):
+        if self._gevent_pool is not None:
+            return self._gevent_pool.spawn(func, *args).get()
+        if self._executor is not None:
+            return self._executor.submit(func, *args).result()
+        return func(*args)
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        return password_hash.split("$", 1)[0] != self.prefix
+
+
+password_hasher = PasswordHasher(pool="none")
@@ -1,4 +1,6 @@
-from flask import jsonify
+import hashlib
+from datetime import timezone
+from flask import jsonify, request, current_app
 
 def success_response(message, data=None, status_code=200):
     payload = {"message": message}
@@ -8,3 +10,65 @@ def success_response(message, data=None, status_code=200):
 
 def error_response(message, status_code=400):
     return jsonify({"error": message}), status_code
+
+
+def _as_utc(moment):
+    if moment is None:
+        return None
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc, microsecond=0)
+    return moment.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def newest_update(*rows):
+    """The latest ``updated_at`` among ``rows`` in UTC, for Last-Modified."""
+    stamps = [row.updated_at for row in rows if row.updated_at is not None]
+    return _as_utc(max(stamps)) if stamps else None
+
+
+def _etag(parts):
+    return hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+
+def row_validators(*rows):
+    """ETag from each row's table, id and ``version``; Last-Modified from the newest ``updated_at``.
+
+    ``rows`` are the models the response is built from. ``version`` goes up
+    with every UPDATE, so two writes within one second still change the
+    ETag, and nothing is serialized to compute it.
+    """
+    return _etag(f"{row.__tablename__}:{row.id}:{row.version}" for row in rows), newest_update(*rows)
+
+
+def collection_validators(name, count, last_id, versions, last_modified):
+    """ETag and Last-Modified for a collection summarized by one aggregate query.
+
+    ``count``, ``max(id)`` and ``sum(version)`` together change on every
+    insert, update and delete of a matching row, as ids are not reused.
+    """
+    return _etag([name, count, last_id, versions]), _as_utc(last_modified)
+
+
+def not_modified(etag, last_modified=None):
+    """Return an empty 304 when the request's validators still match, else None.
+
+    If-None-Match wins over If-Modified-Since when both are sent.
+    """
+    if request.if_none_match:
+        matched = request.if_none_match.contains_weak(etag)
+    elif last_modified is not None and request.if_modified_since is not None:
+        matched = last_modified <= request.if_modified_since
+    else:
+        matched = False
+    if not matched:
+        return None
+    response = current_app.response_class(status=304)
+    return with_validators((response, 304), etag, last_modified)
+
+
+def with_validators(result, etag, last_modified=None):
+    response, status_code = result
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response, status_code
@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+import time
+from flask import Response, stream_with_context
+from utils.serialization import dumps_bytes
+
+STREAM_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def iter_csv(rows, fieldnames):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    yield buffer.getvalue()
+
+
+def iter_ndjson(rows):
+    """Encode each row like the JSON API does (amounts as numbers, ISO 8601 datetimes)."""
+    for row in rows:
+        yield dumps_bytes(row).decode("utf-8") + "\n"
+
+
+def streaming_response(rows, fmt, fieldnames, filename):
+    if fmt == "csv":
+        body = iter_csv(rows, fieldnames)
+    else:
+        body = iter_ndjson(rows)
+    response = Response(stream_with_context(body), mimetype=STREAM_FORMATS[fmt])
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    return response
+
+
+def read_rows(stream, fmt):
+    """Yield ``(line_number, row)`` pairs from a CSV or NDJSON text stream.
+
+    ``row`` is ``None`` for NDJSON lines that are not a JSON object.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_number, row if isinstance(row, dict) else None
+
+
+def iter_sse(broker, last_id, stations=None, heartbeat=15, max_seconds=300):
+    """Yield Server-Sent Events from ``broker`` after ``last_id``.
+
+    Events tagged with stations are only sent when they overlap
+    ``stations`` (all events when no filter is given). A ``reset`` event
+    tells the client its Last-Event-ID could not be replayed. The stream
+    ends after ``max_seconds`` and the client reconnects with
+    Last-Event-ID, so long-lived connections do not pin a worker forever.
+    """
+    cursor = broker.latest_id() if last_id is None else last_id
+    deadline = time.monotonic() + max_seconds
+    yield f"retry: 3000\nid: {cursor}\n\n"
+    while time.monotonic() < deadline:
+        events, reset = broker.wait(cursor, heartbeat)
+        if reset:
+            cursor = broker.latest_id()
+            yield f"id: {cursor}\nevent: reset\ndata: {{}}\n\n"
+            continue
+        if not events:
+            yield ": keep-alive\n\n"
+            continue
+        for event in events:
+            cursor = event.id
+            if stations and event.stations is not None and not (stations & event.stations):
+                continue
+            yield f"id: {event.id}\nevent: {event.type}\ndata: {event.data}\n\n"
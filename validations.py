@@ -1,6 +1,7 @@
 from utils.response import error_response
+from utils.pagination import decode_cursor, DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
 from decimal import Decimal, InvalidOperation
-from datetime import date, datetime
+from datetime import date, datetime, timezone
 import re
 
 EMAIL_REGEX = r"[^@]+@[^@]+\.[^@]+"
@@ -10,24 +11,239 @@ SERVICE_TYPES = ["dine_in", "take_away", "delivery"]
 PAYMENT_METHODS = ["cash", "card", "mobile"]
 RESERVATION_STATUS = ["pending", "confirmed", "cancelled"]
 
+ORDER_LIST_FILTERS = {
+    "status": ORDER_STATUS,
+    "payment_status": PAYMENT_STATUS,
+    "service_type": SERVICE_TYPES,
+    "user_id": int,
+}
+PAYMENT_LIST_FILTERS = {
+    "status": PAYMENT_STATUS,
+    "payment_method": PAYMENT_METHODS,
+    "order_id": int,
+    "user_id": int,
+}
+RESERVATION_LIST_FILTERS = {
+    "status": RESERVATION_STATUS,
+    "table_number": int,
+    "user_id": int,
+}
+SALES_REPORT_LIST_FILTERS = {
+    "generated_by": int,
+}
+INVENTORY_LIST_FILTERS = {
+    "supplier": str,
+}
+
 def _add_error(errors, field, message):
     if field not in errors:
         errors[field] = message
 
 
-def _validate_string(value, field, errors, required=False, max_length=None):
-    if value is None:
-        if required:
-            _add_error(errors, field, f"{field.replace('_',' ').title()} is required")
-        return
-
-    value = str(value).strip()
-    if not value:
-        _add_error(errors, field, f"{field.replace('_',' ').title()} cannot be empty")
-        return
+class Field:
+    """Declarative rule for one payload field, turned into a check by ``compile_validator``.
+
+    ``kind`` is one of string, email, integer, decimal, boolean, choice,
+    list, datetime or date. Values that pass are returned coerced (stripped
+    str, int, Decimal, naive-UTC datetime, date) so services use them as-is.
+    A list with an ``items`` spec must hold objects, each checked and
+    coerced in place against that spec.
+    """
+
+    def __init__(self, kind, required=False, max_length=None, min_length=None, min_value=None,
+                 choices=None, strip=True, no_past=False, no_future=False, items=None):
+        self.kind = kind
+        self.required = required
+        self.max_length = max_length
+        self.min_length = min_length
+        self.min_value = min_value
+        self.choices = choices
+        self.strip = strip
+        self.no_past = no_past
+        self.no_future = no_future
+        self.items = items
+
+
+def _field_source(name, field, required, namespace, passthrough=False, respond=False):
+    """Source lines checking one field of ``data`` inside the generated validator.
+
+    With ``passthrough`` ``clean`` is ``data`` itself, so kinds that keep
+    the value as given (choice, boolean, list) only check it. With
+    ``respond`` a failing check returns its 400 response straight away.
+    """
+    label = name.replace('_', ' ').title()
+    key = repr(name)
+    kind = field.kind
+
+    def const(value):
+        ref = f"_k{len(namespace)}"
+        namespace[ref] = value
+        return ref
+
+    def fail(message, indent):
+        if respond:
+            return f"{' ' * indent}return None, error_response({const(message)}, 400)"
+        return f"{' ' * indent}errors[{key}] = {const(message)}"
+
+    def keep(indent):
+        return f"{' ' * indent}pass" if passthrough else f"{' ' * indent}clean[{key}] = value"
+
+    lines = [f"    value = data.get({key})"]
+    if required:
+        missing = "Items must be a non-empty list" if kind == "list" else f"{label} is required"
+        lines += ["    if value is None:", fail(missing, 8), "    else:"]
+    else:
+        lines.append("    if value is not None:")
+
+    if kind in ("string", "email"):
+        lines += [
+            "        text = value if value.__class__ is str else str(value)",
+            "        stripped = text.strip()",
+            "        if not stripped:",
+            fail(f"{label} cannot be empty", 12),
+        ]
+        if field.max_length:
+            lines += [f"        elif len(stripped) > {int(field.max_length)}:",
+                      fail(f"{label} must not exceed {field.max_length} characters", 12)]
+        if kind == "email":
+            lines += [f"        elif not {const(re.compile(EMAIL_REGEX).match)}(stripped):",
+                      fail("Invalid email format", 12)]
+        if field.min_length:
+            lines += [f"        elif len(text) < {int(field.min_length)}:",
+                      fail(f"{label} must be at least {field.min_length} characters", 12)]
+        lines += ["        else:", f"            clean[{key}] = {'stripped' if field.strip else 'text'}"]
+
+    elif kind == "integer":
+        lines += [
+            "        try:",
+            "            value = value if value.__class__ is int else int(value)",
+            "        except (ValueError, TypeError):",
+            fail(f"{label} must be an integer", 12),
+            "        else:",
+        ]
+        if field.min_value is not None:
+            lines += [f"            if value < {int(field.min_value)}:",
+                      fail(f"{label} must be >= {field.min_value}", 16),
+                      "            else:",
+                      f"                clean[{key}] = value"]
+        else:
+            lines.append(f"            clean[{key}] = value")
+
+    elif kind == "decimal":
+        invalid = f"{label} must be a valid number"
+        # JSON numbers arrive as float; repr() keeps the digits the client sent.
+        lines += [
+            "        if value.__class__ is float:",
+            "            value = Decimal(repr(value))",
+            "        elif value.__class__ is bool:",
+            "            value = None",
+            "        else:",
+            "            try:",
+            "                value = Decimal(value if value.__class__ is str or value.__class__ is int else str(value))",
+            "            except (InvalidOperation, TypeError, ValueError):",
+            "                value = None",
+            "        if value is None or not value.is_finite():",
+            fail(invalid, 12),
+            f"        elif value < {const(Decimal(0))}:",
+            fail(f"{label} must be >= 0", 12),
+            "        else:",
+            f"            clean[{key}] = value",
+        ]
+
+    elif kind == "boolean":
+        lines += [
+            "        if value is not True and value is not False:",
+            fail(f"{label} must be true or false", 12),
+        ]
+        if not passthrough:
+            lines += ["        else:", keep(12)]
+
+    elif kind == "choice":
+        lines += [
+            f"        if value.__class__ is not str or value not in {const(frozenset(field.choices))}:",
+            fail(f"{label} must be one of {field.choices}", 12),
+        ]
+        if not passthrough:
+            lines += ["        else:", keep(12)]
+
+    elif kind == "list":
+        lines += [
+            "        if value.__class__ is not list or not value:",
+            fail("Items must be a non-empty list" if name == "items" else f"{label} must be a non-empty list", 12),
+        ]
+        if field.items is not None:
+            # Each item's checks are inlined into the loop and coerce the item
+            # in place; the first failure answers for the whole payload.
+            if not respond:
+                raise ValueError(f"{name}: item specs need respond=True")
+            lines += [
+                "        else:",
+                "            items = value",
+                "            for item in items:",
+                "                if item.__class__ is not dict:",
+                fail("Each item must be an object", 20),
+            ]
+            for item_name, item_field in field.items.items():
+                item_lines = _field_source(item_name, item_field, item_field.required, namespace, True, True)
+                lines += [" " * 12 + line.replace("data.get(", "item.get(").replace("clean[", "item[")
+                          for line in item_lines]
+            if not passthrough:
+                lines.append(f"            clean[{key}] = items")
+        elif not passthrough:
+            lines += ["        else:", keep(12)]
+
+    elif kind in ("datetime", "date"):
+        parser = "datetime.fromisoformat" if kind == "datetime" else "date.fromisoformat"
+        lines += [
+            "        try:",
+            f"            value = {parser}(value)",
+            "        except (ValueError, TypeError):",
+            fail(f"Invalid {kind} format", 12),
+            "        else:",
+        ]
+        if kind == "datetime":
+            lines += ["            if value.tzinfo is not None:",
+                      "                value = value.astimezone(timezone.utc).replace(tzinfo=None)"]
+        if field.no_past:
+            lines += ["            if value < datetime.utcnow():", fail(f"{label} cannot be in the past", 16),
+                      "            else:", f"                clean[{key}] = value"]
+        elif field.no_future:
+            lines += ["            if value > date.today():", fail(f"{label} cannot be in the future", 16),
+                      "            else:", f"                clean[{key}] = value"]
+        else:
+            lines.append(f"            clean[{key}] = value")
 
-    if max_length and len(value) > max_length:
-        _add_error(errors, field, f"{field.replace('_',' ').title()} must not exceed {max_length} characters")
+    else:
+        raise ValueError(f"Unknown field kind: {kind}")
+
+    return lines
+
+
+def compile_validator(spec, partial=False, passthrough=True, respond=False):
+    """Compile ``{name: Field}`` into ``validate(data) -> (clean, errors)``.
+
+    The spec is turned into the source of one flat function at import time,
+    so labels, messages and regexes are constants and each request pays only
+    for the checks themselves. With ``partial`` nothing is required (update
+    payloads); with ``passthrough`` values are coerced in ``data`` itself and
+    keys outside the spec stay as they are, so pass a dict you own (request
+    JSON is parsed fresh for each request).
+    With ``respond`` the function returns ``(clean, None)``, or ``(None,
+    error_response)`` as soon as a field fails, ready for a controller.
+    """
+    namespace = {
+        "Decimal": Decimal, "InvalidOperation": InvalidOperation,
+        "datetime": datetime, "date": date, "timezone": timezone,
+        "error_response": error_response
+    }
+    lines = ["def validate(data):", "    clean = data" if passthrough else "    clean = {}"]
+    if not respond:
+        lines.append("    errors = {}")
+    for name, field in spec.items():
+        lines += _field_source(name, field, field.required and not partial, namespace, passthrough, respond)
+    lines.append("    return clean, None" if respond else "    return clean, errors")
+    exec(compile("\n".join(lines), f"<validator {', '.join(spec)}>", "exec"), namespace)
+    return namespace["validate"]
 
 
 def _validate_integer(value, field, errors, required=False, min_value=None):
@@ -44,236 +260,317 @@ def _validate_integer(value, field, errors, required=False, min_value=None):
         _add_error(errors, field, f"{field.replace('_',' ').title()} must be an integer")
 
 
-def _validate_boolean(value, field, errors):
-    if value is not None and not isinstance(value, bool):
-        _add_error(errors, field, f"{field.replace('_',' ').title()} must be true or false")
-
-
-def _validate_price(value, field, errors, required=False):
-    if value is None:
-        if required:
-            _add_error(errors, field, f"{field.replace('_',' ').title()} is required")
-        return
-
-    try:
-        price = Decimal(value)
-        if price < 0:
-            _add_error(errors, field, f"{field.replace('_',' ').title()} must be >= 0")
-    except (InvalidOperation, TypeError):
-        _add_error(errors, field, f"{field.replace('_',' ').title()} must be a valid number")
+_REGISTER = compile_validator({
+    "username": Field("string", required=True, max_length=50),
+    "email": Field("email", required=True),
+    "password": Field("string", required=True, max_length=100, min_length=6, strip=False),
+}, passthrough=False, respond=True)
+
+_LOGIN = compile_validator({
+    "email": Field("string", required=True),
+    "password": Field("string", required=True, strip=False),
+}, passthrough=False, respond=True)
+
+_CATEGORY = {
+    "name": Field("string", required=True, max_length=100),
+    "description": Field("string", max_length=250),
+    "is_active": Field("boolean"),
+}
+_CATEGORY_CREATE = compile_validator(_CATEGORY, respond=True)
+_CATEGORY_UPDATE = compile_validator(_CATEGORY, partial=True, respond=True)
+
+_MENU = {
+    "name": Field("string", required=True, max_length=100),
+    "description": Field("string", max_length=250),
+    "price": Field("decimal", required=True),
+    "category_id": Field("integer", required=True, min_value=1),
+    "is_available": Field("boolean"),
+}
+_MENU_CREATE = compile_validator(_MENU, respond=True)
+_MENU_UPDATE = compile_validator(_MENU, partial=True, respond=True)
+
+_ORDER_ITEM = {
+    "menu_item_id": Field("integer", required=True, min_value=1),
+    "quantity": Field("integer", min_value=1),
+    "price": Field("decimal"),
+}
+
+_ORDER = compile_validator({
+    "user_id": Field("integer", required=True, min_value=1),
+    "items": Field("list", required=True, items=_ORDER_ITEM),
+    "status": Field("choice", choices=ORDER_STATUS),
+    "payment_status": Field("choice", choices=PAYMENT_STATUS),
+    "service_type": Field("choice", choices=SERVICE_TYPES),
+    "discount": Field("decimal"),
+}, respond=True)
+
+_ORDER_UPDATE = compile_validator({
+    "items": Field("list", items=_ORDER_ITEM),
+    "status": Field("choice", choices=ORDER_STATUS),
+    "payment_status": Field("choice", choices=PAYMENT_STATUS),
+    "payment_method": Field("choice", choices=PAYMENT_METHODS),
+    "service_type": Field("choice", choices=SERVICE_TYPES),
+    "discount": Field("decimal"),
+}, partial=True, respond=True)
+
+_PAYMENT = compile_validator({
+    "order_id": Field("integer", required=True, min_value=1),
+    "user_id": Field("integer", required=True, min_value=1),
+    "status": Field("choice", choices=PAYMENT_STATUS),
+    "payment_method": Field("choice", choices=PAYMENT_METHODS),
+    "amount": Field("decimal"),
+}, respond=True)
+
+_RESERVATION = {
+    "user_id": Field("integer", required=True, min_value=1),
+    "table_number": Field("integer", required=True, min_value=1),
+    "reservation_time": Field("datetime", required=True, no_past=True),
+    "status": Field("choice", choices=RESERVATION_STATUS),
+}
+_RESERVATION_CREATE = compile_validator(_RESERVATION, respond=True)
+_RESERVATION_UPDATE = compile_validator(_RESERVATION, partial=True, respond=True)
+
+_PAYMENT_IMPORT_ROW = compile_validator({
+    "external_reference": Field("string", required=True, max_length=100),
+    "order_id": Field("integer", required=True, min_value=1),
+    "amount": Field("decimal", required=True),
+    "payment_method": Field("choice", choices=PAYMENT_METHODS),
+    "status": Field("choice", choices=PAYMENT_STATUS),
+}, passthrough=False)
+
+_SALES_REPORT = compile_validator({
+    "report_date": Field("date", required=True, no_future=True),
+    "generated_by": Field("integer", min_value=1),
+}, respond=True)
+
+_INVENTORY = compile_validator({
+    "item_name": Field("string", required=True, max_length=100),
+    "stock_quantity": Field("integer", min_value=0),
+    "threshold": Field("integer", min_value=0),
+    "unit": Field("string"),
+    "supplier": Field("string"),
+}, respond=True)
+
+_MENU_IMPORT_ROW = compile_validator({
+    "category": Field("string", required=True, max_length=100),
+    "name": Field("string", required=True, max_length=100),
+    "description": Field("string", max_length=250),
+    "price": Field("decimal", required=True),
+    "is_available": Field("boolean"),
+}, passthrough=False)
 
 
 def validate_register_data(data):
-    errors = {}
-
-    _validate_string(data.get("username"), "username", errors, required=True, max_length=50)
-    _validate_string(data.get("email"), "email", errors, required=True)
-    _validate_string(data.get("password"), "password", errors, required=True, max_length=100)
-
-    if "email" in data and not re.match(EMAIL_REGEX, str(data["email"])):
-        _add_error(errors, "email", "Invalid email format")
-
-    if "password" in data and len(str(data["password"])) < 6:
-        _add_error(errors, "password", "Password must be at least 6 characters")
-
-    if errors:
-        return None, error_response("Validation error", errors, 400)
-
-    return {
-        "username": data["username"].strip(),
-        "email": data["email"].strip(),
-        "password": data["password"]
-    }, None
-
+    return _REGISTER(data)
 
 def validate_login_data(data):
-    errors = {}
-
-    _validate_string(data.get("email"), "email", errors, required=True)
-    _validate_string(data.get("password"), "password", errors, required=True)
-
-    if errors:
-        return None, error_response("Validation error", errors, 400)
-
-    return {
-        "email": data["email"].strip(),
-        "password": data["password"]
-    }, None
+    return _LOGIN(data)
 
 def validate_category_create(data):
-    errors = {}
-
-    _validate_string(data.get("name"), "name", errors, required=True, max_length=100)
-    _validate_string(data.get("description"), "description", errors, max_length=250)
-    _validate_boolean(data.get("is_active"), "is_active", errors)
-
-    if errors:
-        return None, error_response("Validation error", errors, 400)
-
-    return data, None
-
+    return _CATEGORY_CREATE(data)
 
 def validate_category_update(data):
-    errors = {}
-
-    if "name" in data:
-        _validate_string(data.get("name"), "name", errors, max_length=100)
-
-    if "description" in data:
-        _validate_string(data.get("description"), "description", errors, max_length=250)
-
-    if "is_active" in data:
-        _validate_boolean(data.get("is_active"), "is_active", errors)
-
-    if errors:
-        return None, error_response("Validation error", errors, 400)
-
-    return data, None
+    return _CATEGORY_UPDATE(data)
 
 def validate_menu_create(data):
-    errors = {}
-
-    _validate_string(data.get("name"), "name", errors, required=True, max_length=100)
-    _validate_string(data.get("description"), "description", errors, max_length=250)
-    _validate_price(data.get("price"), "price", errors, required=True)
-    _validate_integer(data.get("category_id"), "category_id", errors, required=True, min_value=1)
-    _validate_boolean(data.get("is_available"), "is_available", errors)
-
-    if errors:
-        return None, error_response("Validation error", errors, 400)
-
-    return data, None
-
+    return _MENU_CREATE(data)
 
 def validate_menu_update(data):
-    errors = {}
+    return _MENU_UPDATE(data)
 
-    if "name" in data:
-        _validate_string(data.get("name"), "name", errors, max_length=100)
-
-    if "description" in data:
-        _validate_string(data.get("description"), "description", errors, max_length=250)
-
-    if "price" in data:
-        _validate_price(data.get("price"), "price", errors)
+def validate_order_data(data):
+    return _ORDER(data)
 
-    if "category_id" in data:
-        _validate_integer(data.get("category_id"), "category_id", errors, min_value=1)
+def validate_order_update(data):
+    return _ORDER_UPDATE(data)
 
-    if "is_available" in data:
-        _validate_boolean(data.get("is_available"), "is_available", errors)
+def validate_payment_data(data):
+    return _PAYMENT(data)
 
+def validate_payment_import_row(data):
+    """Validate one settlement line; blank optional cells mean the defaults (card, paid)."""
+    row = {key: value for key, value in data.items() if value not in ("", None)}
+    clean, errors = _PAYMENT_IMPORT_ROW(row)
     if errors:
-        return None, error_response("Validation error", errors, 400)
+        return None, errors
+    clean.setdefault("payment_method", "card")
+    clean.setdefault("status", "paid")
+    return clean, None
 
-    return data, None
+def validate_reservation_data(data):
+    return _RESERVATION_CREATE(data)
 
+def validate_reservation_update(data):
+    return _RESERVATION_UPDATE(data)
 
-def validate_order_data(data):
+def validate_availability_args(args):
     errors = {}
+    parsed = {}
 
-    _validate_integer(data.get("user_id"), "user_id", errors, required=True, min_value=1)
-
-    if not isinstance(data.get("items"), list) or not data.get("items"):
-        _add_error(errors, "items", "Items must be a non-empty list")
-
-    if "status" in data and data["status"] not in ORDER_STATUS:
-        _add_error(errors, "status", f"Status must be one of {ORDER_STATUS}")
-
-    if "payment_status" in data and data["payment_status"] not in PAYMENT_STATUS:
-        _add_error(errors, "payment_status", f"Payment status must be one of {PAYMENT_STATUS}")
-
-    if "service_type" in data and data["service_type"] not in SERVICE_TYPES:
-        _add_error(errors, "service_type", f"Service type must be one of {SERVICE_TYPES}")
-
-    if "discount" in data:
+    for field in ["from", "to"]:
+        if not args.get(field):
+            _add_error(errors, field, f"{field.title()} is required")
+            continue
         try:
-            if float(data["discount"]) < 0:
-                _add_error(errors, "discount", "Discount must be >= 0")
-        except (ValueError, TypeError):
-            _add_error(errors, "discount", "Discount must be a number")
+            value = datetime.fromisoformat(args[field])
+        except ValueError:
+            _add_error(errors, field, f"{field.title()} must be an ISO 8601 datetime")
+            continue
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        parsed[field] = value
+
+    if not errors:
+        span = parsed["to"] - parsed["from"]
+        if span.total_seconds() <= 0:
+            _add_error(errors, "to", "To must be after from")
+        elif span.days > 7:
+            _add_error(errors, "to", "Availability window cannot exceed 7 days")
+
+    _validate_integer(args.get("party"), "party", errors, min_value=1)
 
     if errors:
-        return None, error_response("Validation error", errors, 400)
+        return None, error_response(next(iter(errors.values())), 400)
 
-    return data, None
+    return {
+        "start": parsed["from"],
+        "end": parsed["to"],
+        "party": int(args.get("party") or 1)
+    }, None
 
-def validate_payment_data(data):
-    errors = {}
 
-    _validate_integer(data.get("order_id"), "order_id", errors, required=True, min_value=1)
-    _validate_integer(data.get("user_id"), "user_id", errors, required=True, min_value=1)
+def validate_sales_report_data(data):
+    return _SALES_REPORT(data)
 
-    if "status" in data and data["status"] not in PAYMENT_STATUS:
-        _add_error(errors, "status", f"Status must be one of {PAYMENT_STATUS}")
+def _parse_boolean(value):
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in ("true", "1", "yes"):
+            return True
+        if lowered in ("false", "0", "no"):
+            return False
+    return value
 
-    if "payment_method" in data and data["payment_method"] not in PAYMENT_METHODS:
-        _add_error(errors, "payment_method", f"Payment method must be one of {PAYMENT_METHODS}")
 
-    if "amount" in data:
-        _validate_price(data.get("amount"), "amount", errors)
+def validate_menu_import_row(data):
+    row = dict(data)
+    row["description"] = row.get("description") or None
+    is_available = _parse_boolean(row.get("is_available", True))
+    row["is_available"] = True if is_available in (None, "") else is_available
 
+    clean, errors = _MENU_IMPORT_ROW(row)
     if errors:
-        return None, error_response("Validation error", errors, 400)
+        return None, errors
 
-    return data, None
+    clean["category_description"] = data.get("category_description") or None
+    clean.setdefault("description", None)
+    return clean, None
 
-def validate_reservation_data(data):
+def validate_recipe_data(data):
     errors = {}
 
-    _validate_integer(data.get("user_id"), "user_id", errors, required=True, min_value=1)
-    _validate_integer(data.get("table_number"), "table_number", errors, required=True, min_value=1)
-
-    if "reservation_time" not in data:
-        _add_error(errors, "reservation_time", "Reservation time is required")
-    else:
-        try:
-            reservation_time = datetime.fromisoformat(data["reservation_time"])
-            if reservation_time < datetime.utcnow():
-                _add_error(errors, "reservation_time", "Reservation time cannot be in the past")
-        except (ValueError, TypeError):
-            _add_error(errors, "reservation_time", "Invalid datetime format")
-
-    if "status" in data and data["status"] not in RESERVATION_STATUS:
-        _add_error(errors, "status", f"Status must be one of {RESERVATION_STATUS}")
+    items = data.get("items")
+    if not isinstance(items, list):
+        _add_error(errors, "items", "Items must be a list")
+        items = []
+
+    seen = set()
+    for index, item in enumerate(items):
+        field = f"items[{index}]"
+        if not isinstance(item, dict):
+            _add_error(errors, field, "Each item must be an object")
+            continue
+        _validate_integer(item.get("inventory_id"), f"{field}.inventory_id", errors, required=True, min_value=1)
+        _validate_integer(item.get("quantity"), f"{field}.quantity", errors, required=True, min_value=1)
+        if item.get("inventory_id") in seen:
+            _add_error(errors, field, "Duplicate inventory_id")
+        seen.add(item.get("inventory_id"))
 
     if errors:
-        return None, error_response("Validation error", errors, 400)
+        return None, error_response(next(iter(errors.values())), 400)
 
-    return data, None
+    return [
+        {"inventory_id": int(item["inventory_id"]), "quantity": int(item["quantity"])}
+        for item in items
+    ], None
 
 
-def validate_sales_report_data(data):
+def validate_sales_refresh_data(data):
     errors = {}
+    parsed = {}
 
-    if "report_date" not in data:
-        _add_error(errors, "report_date", "Report date is required")
-    else:
+    for field in ["from", "to"]:
+        if data.get(field) is None:
+            continue
         try:
-            report_date = date.fromisoformat(data["report_date"])
-            if report_date > date.today():
-                _add_error(errors, "report_date", "Report date cannot be in the future")
+            parsed[field] = date.fromisoformat(data[field])
         except (ValueError, TypeError):
-            _add_error(errors, "report_date", "Invalid date format")
+            _add_error(errors, field, f"{field.title()} must be an ISO date (YYYY-MM-DD)")
+
+    if ("from" in parsed) != ("to" in parsed) and not errors:
+        _add_error(errors, "to", "From and to must be given together")
 
     if "generated_by" in data:
         _validate_integer(data.get("generated_by"), "generated_by", errors, min_value=1)
 
     if errors:
-        return None, error_response("Validation error", errors, 400)
+        return None, error_response(next(iter(errors.values())), 400)
 
-    return data, None
+    return {
+        "date_from": parsed.get("from"),
+        "date_to": parsed.get("to"),
+        "generated_by": data.get("generated_by")
+    }, None
 
 def validate_inventory_data(data):
+    return _INVENTORY(data)
+
+def validate_list_args(args, allowed_filters=None):
     errors = {}
 
-    _validate_string(data.get("item_name"), "item_name", errors, required=True, max_length=100)
-    _validate_integer(data.get("stock_quantity"), "stock_quantity", errors, min_value=0)
-    _validate_integer(data.get("threshold"), "threshold", errors, min_value=0)
-    _validate_string(data.get("unit"), "unit", errors)
-    _validate_string(data.get("supplier"), "supplier", errors)
+    limit = DEFAULT_PAGE_LIMIT
+    if "limit" in args:
+        _validate_integer(args.get("limit"), "limit", errors, min_value=1)
+        if "limit" not in errors:
+            limit = min(int(args["limit"]), MAX_PAGE_LIMIT)
+
+    cursor = None
+    if args.get("cursor"):
+        cursor = decode_cursor(args["cursor"])
+        if cursor is None:
+            _add_error(errors, "cursor", "Invalid cursor")
+
+    date_range = {}
+    for field in ["from", "to"]:
+        if args.get(field):
+            try:
+                date_range[field] = datetime.fromisoformat(args[field])
+            except ValueError:
+                _add_error(errors, field, f"{field.title()} must be an ISO 8601 datetime")
+
+    filters = {}
+    for field, allowed in (allowed_filters or {}).items():
+        value = args.get(field)
+        if value is None or value == "":
+            continue
+        if allowed is int:
+            _validate_integer(value, field, errors, min_value=1)
+            if field not in errors:
+                filters[field] = int(value)
+        elif allowed is str:
+            filters[field] = value.strip()
+        elif value not in allowed:
+            _add_error(errors, field, f"{field.replace('_',' ').title()} must be one of {allowed}")
+        else:
+            filters[field] = value
 
     if errors:
-        return None, error_response("Validation error", errors, 400)
+        return None, error_response(next(iter(errors.values())), 400)
 
-    return data, None
+    return {
+        "limit": limit,
+        "cursor": cursor,
+        "date_from": date_range.get("from"),
+        "date_to": date_range.get("to"),
+        "filters": filters
+    }, None